@@ -0,0 +1,129 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Benchmark de Inicialização
+Mede o custo de importar a CLI e de uma execução --quiet completa,
+e lista os módulos pesados carregados em cada caminho
+
+Exemplos:
+
+    python benchmarks/bench_import.py
+    python benchmarks/bench_import.py --runs 20 --output import.json
+"""
+
+import argparse
+import json
+import os
+import re
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Módulos cuja presença indica que uma importação pesada não foi adiada:
+# dependências de terceiros e partes do analyzer usadas só por opções
+# (--nice, --memory-limit, --stat-backend, --file-index, --record)
+HEAVY_MODULES = [
+    'rich', 'humanize', 'plotly', 'pandas', 'psutil', 'flask', 'numpy',
+    'ctypes', 'mmap', 'sqlite3', 'concurrent.futures',
+    'analyzer.throttle', 'analyzer.scheduler', 'analyzer.spill', 'analyzer.statx',
+    'analyzer.fileindex', 'analyzer.history', 'analyzer.snapshot',
+]
+
+_MODULES_PROBE = (
+    "import sys; import json; "
+    "print(json.dumps(sorted(set(sys.modules) & set(%r))))"
+)
+
+
+def _run(code: str, env: Dict) -> float:
+    start = time.perf_counter()
+    subprocess.run([sys.executable, '-c', code], env=env, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def wall_time(code: str, runs: int, env: Dict) -> Dict:
+    """Tempo de parede de um interpretador novo executando code"""
+    timings = [_run(code, env) for _ in range(runs)]
+    return {'seconds_best': min(timings), 'seconds_median': statistics.median(timings)}
+
+
+def import_time_us(module: str, env: Dict) -> int:
+    """Tempo cumulativo de importação reportado por python -X importtime"""
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f"import {module}"],
+                            env=env, check=True, capture_output=True, text=True)
+    pattern = re.compile(r'import time:\s+\d+ \|\s+(\d+) \| ' + re.escape(module) + r'$')
+    for line in result.stderr.splitlines():
+        match = pattern.match(line)
+        if match:
+            return int(match.group(1))
+    return 0
+
+
+def loaded_heavy_modules(code: str, env: Dict) -> List[str]:
+    """Módulos pesados presentes em sys.modules depois de code"""
+    probe = f"{code}\n{_MODULES_PROBE % HEAVY_MODULES}"
+    result = subprocess.run([sys.executable, '-c', probe], env=env, check=True,
+                            capture_output=True, text=True)
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Disk Usage Analyzer - Benchmark de inicialização')
+    parser.add_argument('--runs', type=int, default=10, help='Execuções por medição')
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args()
+
+    env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+    target = tempfile.mkdtemp(prefix='dua-import-')
+    with open(os.path.join(target, 'file.txt'), 'w') as f:
+        f.write('x')
+
+    quiet_run = (
+        "import sys\n"
+        f"sys.argv = ['disk-analyzer', {target!r}, '--quiet']\n"
+        "from cli.main import analyze\n"
+        "try:\n"
+        "    analyze()\n"
+        "except SystemExit:\n"
+        "    pass"
+    )
+
+    report = {
+        'python': sys.version.split()[0],
+        'interpreter': wall_time('pass', args.runs, env),
+        'import_cli': wall_time('import cli.main', args.runs, env),
+        'quiet_run': wall_time(quiet_run, args.runs, env),
+        'importtime_us': {
+            module: import_time_us(module, env)
+            for module in ('analyzer.core', 'cli.main')
+        },
+        'heavy_modules': {
+            'import_cli': loaded_heavy_modules('import cli.main', env),
+            'quiet_run': loaded_heavy_modules(quiet_run, env),
+        },
+    }
+
+    os.unlink(os.path.join(target, 'file.txt'))
+    os.rmdir(target)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+    # O caminho silencioso não deve carregar nenhum módulo pesado
+    loaded = report['heavy_modules']['quiet_run']
+    if loaded:
+        print(f"❌ --quiet carregou {', '.join(loaded)}", file=sys.stderr)
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
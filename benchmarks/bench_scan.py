@@ -0,0 +1,345 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Benchmark de Varredura
+Mede analyze_directory, exportações e geradores de gráficos web
+sobre árvores sintéticas reproduzíveis, com saída JSON comparável em CI
+
+Exemplos:
+
+    python benchmarks/bench_scan.py --output bench.json
+    python benchmarks/bench_scan.py --compare bench.json --tolerance 0.2
+    python benchmarks/bench_scan.py --stat-backend statx threads --fast-listing
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import os
+import platform
+import resource
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+BENCH_DIR = Path(__file__).parent
+sys.path.insert(0, str(BENCH_DIR))
+sys.path.insert(0, str(BENCH_DIR.parent / "src"))
+
+from synthetic_tree import SHAPES, generate_tree  # noqa: E402
+
+# Variantes da varredura comparadas com a padrão (opções do analisador)
+SCAN_VARIANTS = {
+    'statx': {'stat_backend': 'statx'},
+    'uring': {'stat_backend': 'uring'},
+    'threads': {'stat_backend': 'threads'},
+    'fast-listing': {'fast_listing': True},
+}
+
+# Funções do módulo os contadas como syscalls
+COUNTED_CALLS = ['stat', 'lstat', 'listdir', 'scandir', 'open', 'access', 'readlink']
+
+
+@contextlib.contextmanager
+def count_syscalls():
+    """Conta chamadas às funções de sistema de arquivos do módulo os"""
+    import builtins
+    import pathlib
+
+    counts = {name: 0 for name in COUNTED_CALLS}
+    originals = {}
+
+    def wrap(name, func):
+        def counted(*args, **kwargs):
+            counts[name] += 1
+            return func(*args, **kwargs)
+        return counted
+
+    for name in COUNTED_CALLS:
+        originals[name] = getattr(os, name)
+        setattr(os, name, wrap(name, originals[name]))
+
+    # open() embutido (exportações e hashes) também conta como open
+    builtin_open = builtins.open
+    builtins.open = wrap('open', builtin_open)
+
+    # Python < 3.11: pathlib guarda referências próprias em _NormalAccessor
+    accessor = getattr(pathlib, '_NormalAccessor', None)
+    accessor_originals = {}
+    if accessor is not None:
+        for name in COUNTED_CALLS:
+            if name in vars(accessor):
+                accessor_originals[name] = vars(accessor)[name]
+                setattr(accessor, name, staticmethod(getattr(os, name)))
+
+    try:
+        yield counts
+    finally:
+        builtins.open = builtin_open
+        for name, func in originals.items():
+            setattr(os, name, func)
+        for name, func in accessor_originals.items():
+            setattr(accessor, name, func)
+
+
+def measure(func: Callable, repeat: int) -> Dict:
+    """Mede tempo, syscalls e alocações de uma função"""
+    timings = []
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        timings.append(time.perf_counter() - start)
+
+    rss_kb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    with count_syscalls() as counts:
+        func()
+
+    tracemalloc.start()
+    blocks_before = sys.getallocatedblocks()
+    func()
+    blocks_after = sys.getallocatedblocks()
+    _, alloc_peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    return {
+        'result': result,
+        'metrics': {
+            'seconds_best': min(timings),
+            'seconds_median': statistics.median(timings),
+            'syscalls': sum(counts.values()),
+            'syscalls_by_call': {k: v for k, v in counts.items() if v},
+            'peak_rss_kb': rss_kb,
+            'alloc_peak_bytes': alloc_peak,
+            'alloc_blocks_retained': max(0, blocks_after - blocks_before),
+        }
+    }
+
+
+def run_worker(root: str, entries: int, repeat: int, variants: List[str] = ()) -> Dict:
+    """Executa as medições de uma árvore (em processo isolado)"""
+    from analyzer.core import DiskUsageAnalyzer
+    from analyzer.serialization import serialize_stats
+
+    def scan(**options):
+        analyzer = DiskUsageAnalyzer(max_depth=1000, include_hidden=True, **options)
+        stats = analyzer.analyze_directory(root)
+        return analyzer, stats
+
+    results = {}
+
+    scan_run = measure(scan, repeat)
+    analyzer, stats = scan_run['result']
+    scan_metrics = scan_run['metrics']
+    scan_metrics['entries'] = entries
+    best = scan_metrics['seconds_best']
+    scan_metrics['entries_per_sec'] = entries / best if best else 0.0
+    results['scan'] = scan_metrics
+
+    # Variantes (stat em lote, fast_listing): mesma árvore de DirectoryStats que a padrão
+    expected = serialize_stats(stats)
+    for variant in variants:
+        variant_run = measure(lambda: scan(**SCAN_VARIANTS[variant]), repeat)
+        variant_analyzer, variant_stats = variant_run['result']
+        variant_metrics = variant_run['metrics']
+        best = variant_metrics['seconds_best']
+        variant_metrics['entries_per_sec'] = entries / best if best else 0.0
+        if variant_analyzer._stat_batch is not None:
+            variant_metrics['backend'] = variant_analyzer._stat_batch.name
+        variant_metrics['same_output'] = serialize_stats(variant_stats) == expected
+        results[f"scan_{variant}"] = variant_metrics
+
+    summary = analyzer.get_summary(stats)
+    out_dir = tempfile.mkdtemp(prefix='dua-bench-out-')
+
+    try:
+        from cli.main import export_results
+
+        for format_type in ('json', 'csv'):
+            output_file = os.path.join(out_dir, f"export.{format_type}")
+
+            def export(format_type=format_type, output_file=output_file):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    export_results(stats, summary, format_type, output_file)
+
+            results[f"export_{format_type}"] = measure(export, repeat)['metrics']
+    except ImportError as e:
+        results['export_skipped'] = str(e)
+    finally:
+        shutil.rmtree(out_dir, ignore_errors=True)
+
+    try:
+        from web.app import (prepare_tree_data, create_pie_chart_data,
+                             create_treemap_data, get_large_files_data)
+
+        builders = {
+            'web_tree_data': lambda: prepare_tree_data(stats),
+            'web_pie_chart': lambda: create_pie_chart_data(stats),
+            'web_treemap': lambda: create_treemap_data(stats),
+            'web_large_files': lambda: get_large_files_data(stats, 0),
+        }
+        for name, builder in builders.items():
+            results[name] = measure(builder, repeat)['metrics']
+    except ImportError as e:
+        results['web_skipped'] = str(e)
+
+    return results
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ['git', 'rev-parse', 'HEAD'], cwd=BENCH_DIR.parent,
+            stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmarks(shapes: List[str], scale: float, seed: int, repeat: int,
+                   tree_dir: Optional[str] = None, variants: List[str] = ()) -> Dict:
+    """Gera as árvores e mede cada uma em um subprocesso"""
+    report = {
+        'meta': {
+            'timestamp': datetime.now().isoformat(),
+            'commit': _git_commit(),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'scale': scale,
+            'seed': seed,
+            'repeat': repeat,
+            'variants': list(variants),
+        },
+        'shapes': {}
+    }
+
+    base_dir = tree_dir or tempfile.mkdtemp(prefix='dua-bench-')
+
+    try:
+        for shape in shapes:
+            root = os.path.join(base_dir, shape)
+            if os.path.exists(root):
+                shutil.rmtree(root)
+            manifest = generate_tree(shape, root, seed=seed, scale=scale)
+
+            with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as tmp:
+                result_file = tmp.name
+            try:
+                subprocess.run(
+                    [sys.executable, __file__, '--worker', root,
+                     '--entries', str(manifest.entries),
+                     '--repeat', str(repeat), '--output', result_file,
+                     '--variants', *variants],
+                    check=True
+                )
+                with open(result_file, encoding='utf-8') as f:
+                    results = json.load(f)
+            finally:
+                os.unlink(result_file)
+
+            report['shapes'][shape] = {
+                'tree': manifest.to_dict(),
+                'results': results
+            }
+            print(f"✅ {shape}: {results['scan']['entries_per_sec']:,.0f} entradas/s",
+                  file=sys.stderr)
+            for variant in variants:
+                measured = results[f"scan_{variant}"]
+                same = 'mesma saída' if measured['same_output'] else '❌ SAÍDA DIFERENTE'
+                backend = f" ({measured['backend']})" if 'backend' in measured else ''
+                print(f"   {variant}{backend}: "
+                      f"{measured['entries_per_sec']:,.0f} entradas/s, {same}", file=sys.stderr)
+    finally:
+        if not tree_dir:
+            shutil.rmtree(base_dir, ignore_errors=True)
+
+    return report
+
+
+def compare_reports(baseline: Dict, current: Dict, tolerance: float) -> List[str]:
+    """Compara dois relatórios e retorna as regressões encontradas"""
+    regressions = []
+
+    for shape, data in current['shapes'].items():
+        old_shape = baseline.get('shapes', {}).get(shape)
+        if not old_shape:
+            continue
+
+        for target, metrics in data['results'].items():
+            old_metrics = old_shape['results'].get(target)
+            if not isinstance(metrics, dict) or not isinstance(old_metrics, dict):
+                continue
+
+            old_time = old_metrics['seconds_best']
+            new_time = metrics['seconds_best']
+            ratio = new_time / old_time if old_time else 1.0
+            marker = '⚠️' if ratio > 1 + tolerance else '  '
+            print(f"{marker} {shape:24s} {target:18s} "
+                  f"{old_time * 1000:9.2f}ms -> {new_time * 1000:9.2f}ms ({ratio:5.2f}x) "
+                  f"syscalls {old_metrics['syscalls']} -> {metrics['syscalls']}")
+
+            if ratio > 1 + tolerance:
+                regressions.append(f"{shape}/{target}: {ratio:.2f}x mais lento")
+
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Disk Usage Analyzer - Benchmarks')
+    parser.add_argument('--shapes', nargs='+', choices=sorted(SHAPES), default=list(SHAPES),
+                        help='Formatos de árvore a medir')
+    parser.add_argument('--scale', type=float, default=1.0, help='Fator de escala das árvores')
+    parser.add_argument('--seed', type=int, default=42, help='Semente do gerador')
+    parser.add_argument('--repeat', type=int, default=3, help='Repetições por medição')
+    parser.add_argument('--tree-dir', help='Diretório para manter as árvores geradas')
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    parser.add_argument('--compare', help='Relatório JSON de referência para comparação')
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help='Regressão tolerada na comparação (0.25 = 25%%)')
+    parser.add_argument('--stat-backend', nargs='*', default=[],
+                        choices=['statx', 'uring', 'threads'],
+                        help='Medir também a varredura com esses backends de stat em lote')
+    parser.add_argument('--fast-listing', action='store_true',
+                        help='Medir também a varredura com fast_listing')
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    parser.add_argument('--variants', nargs='*', default=[], help=argparse.SUPPRESS)
+    parser.add_argument('--entries', type=int, default=0, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        results = run_worker(args.worker, args.entries, args.repeat, args.variants)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f)
+        return
+
+    variants = args.stat_backend + (['fast-listing'] if args.fast_listing else [])
+    report = run_benchmarks(args.shapes, args.scale, args.seed, args.repeat, args.tree_dir,
+                            variants)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare, encoding='utf-8') as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.tolerance)
+        if regressions:
+            print("\n❌ Regressões detectadas:", file=sys.stderr)
+            for regression in regressions:
+                print(f"  - {regression}", file=sys.stderr)
+            sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
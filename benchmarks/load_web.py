@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Teste de Carga da Interface Web
+Dispara requisições concorrentes contra /api/analyze e os endpoints de
+árvore e mede a latência (p50/p90/p99) de cada um
+
+Exemplos:
+
+    # Servidor já em execução
+    python benchmarks/load_web.py --url http://127.0.0.1:8080 --path /usr/share
+
+    # Sobe o servidor (dev ou produção) numa porta livre e compara
+    python benchmarks/load_web.py --start dev --concurrency 16
+    python benchmarks/load_web.py --start production --workers 4 --concurrency 16
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+
+def percentile(sorted_values: List[float], fraction: float) -> float:
+    """Percentil por vizinho mais próximo (valores já ordenados)"""
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, round(fraction * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+def request_once(url: str, body: Optional[bytes], timeout: float) -> Tuple[float, Optional[str]]:
+    """Latência de uma requisição em segundos e o erro, se houver"""
+    headers = {'Content-Type': 'application/json'} if body is not None else {}
+    req = urllib.request.Request(url, data=body, headers=headers)
+    start = time.perf_counter()
+    try:
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            response.read()
+        return time.perf_counter() - start, None
+    except urllib.error.HTTPError as e:
+        return time.perf_counter() - start, f"HTTP {e.code}"
+    except (urllib.error.URLError, OSError) as e:
+        return time.perf_counter() - start, type(e).__name__
+
+
+def load_endpoint(base_url: str, endpoint: Dict, concurrency: int, requests: int,
+                  timeout: float) -> Dict:
+    """Executa requests chamadas com concurrency threads e resume as latências"""
+    url = base_url.rstrip('/') + endpoint['path']
+    body = json.dumps(endpoint['json']).encode('utf-8') if 'json' in endpoint else None
+
+    started = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=concurrency) as pool:
+        results = list(pool.map(lambda _: request_once(url, body, timeout), range(requests)))
+    elapsed = time.perf_counter() - started
+
+    latencies = sorted(latency for latency, error in results if error is None)
+    errors: Dict[str, int] = {}
+    for _, error in results:
+        if error is not None:
+            errors[error] = errors.get(error, 0) + 1
+
+    return {
+        'endpoint': endpoint['name'],
+        'requests': requests,
+        'concurrency': concurrency,
+        'errors': errors,
+        'requests_per_second': round(requests / elapsed, 1) if elapsed else None,
+        'ms_p50': round(percentile(latencies, 0.50) * 1000, 2),
+        'ms_p90': round(percentile(latencies, 0.90) * 1000, 2),
+        'ms_p99': round(percentile(latencies, 0.99) * 1000, 2),
+        'ms_max': round(latencies[-1] * 1000, 2) if latencies else None,
+        'ms_mean': round(statistics.mean(latencies) * 1000, 2) if latencies else None,
+    }
+
+
+def _free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode: str, workers: int, state_db: str) -> Tuple[subprocess.Popen, str]:
+    """Sobe src/web/app.py numa porta livre e espera ele responder"""
+    port = _free_port()
+    command = [sys.executable, str(SRC_DIR / 'web' / 'app.py'), '--port', str(port),
+               '--state-db', state_db]
+    if mode == 'production':
+        command += ['--production', '--workers', str(workers)]
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    base_url = f"http://127.0.0.1:{port}"
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"Servidor terminou com código {process.returncode}")
+        try:
+            urllib.request.urlopen(base_url + '/api/fleet', timeout=1).read()
+            return process, base_url
+        except (urllib.error.URLError, OSError):
+            time.sleep(0.2)
+    process.terminate()
+    raise RuntimeError("Servidor não respondeu em 30s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Disk Usage Analyzer - Teste de carga web')
+    parser.add_argument('--url', help='URL de um servidor em execução')
+    parser.add_argument('--start', choices=['dev', 'production'],
+                        help='Subir o servidor nesse modo em vez de usar --url')
+    parser.add_argument('--workers', type=int, default=4,
+                        help='Workers do servidor com --start production')
+    parser.add_argument('--path', default=str(SRC_DIR), help='Diretório enviado a /api/analyze')
+    parser.add_argument('--max-depth', type=int, default=5, help='max_depth enviado a /api/analyze')
+    parser.add_argument('--concurrency', type=int, default=8, help='Requisições simultâneas')
+    parser.add_argument('--requests', type=int, default=200, help='Requisições por endpoint')
+    parser.add_argument('--timeout', type=float, default=120, help='Timeout de cada requisição')
+    parser.add_argument('--output', help='Arquivo JSON de saída')
+    args = parser.parse_args()
+
+    if not args.url and not args.start:
+        parser.error("informe --url ou --start")
+
+    process = None
+    state_dir = tempfile.mkdtemp(prefix='dua-load-')
+    base_url = args.url
+    if args.start:
+        process, base_url = start_server(args.start, args.workers,
+                                         os.path.join(state_dir, 'state.db'))
+
+    analyze = {'path': args.path, 'max_depth': args.max_depth}
+    endpoints = [
+        {'name': 'POST /api/analyze', 'path': '/api/analyze', 'json': analyze},
+        {'name': 'GET /api/directories', 'path': '/api/directories'},
+        {'name': 'GET /api/fleet', 'path': '/api/fleet'},
+    ]
+
+    try:
+        # A primeira análise popula o cache; a carga mede o caminho quente
+        request_once(base_url + '/api/analyze', json.dumps(analyze).encode('utf-8'), args.timeout)
+        report = {
+            'url': base_url,
+            'server': args.start or 'external',
+            'workers': args.workers if args.start == 'production' else None,
+            'results': [
+                load_endpoint(base_url, endpoint, args.concurrency, args.requests, args.timeout)
+                for endpoint in endpoints
+            ],
+        }
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait(timeout=10)
+        for name in os.listdir(state_dir):
+            os.unlink(os.path.join(state_dir, name))
+        os.rmdir(state_dir)
+
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(output)
+    print(output)
+
+
+if __name__ == '__main__':
+    main()
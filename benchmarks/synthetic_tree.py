@@ -0,0 +1,178 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Gerador de Árvores Sintéticas
+Cria árvores de arquivos reproduzíveis para benchmarks
+"""
+
+import os
+import random
+from dataclasses import dataclass, asdict
+from pathlib import Path
+from typing import Callable, Dict
+
+
+@dataclass
+class TreeManifest:
+    """Descrição de uma árvore sintética gerada"""
+    shape: str
+    root: str
+    seed: int
+    scale: float
+    files: int
+    dirs: int
+    links: int
+    apparent_bytes: int
+
+    @property
+    def entries(self) -> int:
+        return self.files + self.dirs + self.links
+
+    def to_dict(self) -> Dict:
+        data = asdict(self)
+        data['entries'] = self.entries
+        return data
+
+
+class _Builder:
+    """Acumula contadores enquanto cria a árvore"""
+
+    def __init__(self, root: Path, seed: int):
+        self.root = root
+        self.rng = random.Random(seed)
+        self.files = 0
+        self.dirs = 0
+        self.links = 0
+        self.apparent_bytes = 0
+
+    def mkdir(self, path: Path) -> Path:
+        path.mkdir(parents=True, exist_ok=True)
+        self.dirs += 1
+        return path
+
+    def write(self, path: Path, size: int) -> Path:
+        # Conteúdo determinístico sem custo de gerar bytes aleatórios
+        with open(path, 'wb') as f:
+            if size:
+                f.write(b'x' * size)
+        self.files += 1
+        self.apparent_bytes += size
+        return path
+
+    def sparse(self, path: Path, size: int, data: int) -> Path:
+        with open(path, 'wb') as f:
+            f.write(b'd' * data)
+            f.truncate(size)
+        self.files += 1
+        self.apparent_bytes += size
+        return path
+
+    def link(self, source: Path, target: Path) -> Path:
+        os.link(source, target)
+        self.links += 1
+        return target
+
+    def extension(self) -> str:
+        return self.rng.choice(['.txt', '.log', '.py', '.json', '.bin', '.csv', ''])
+
+
+def _wide_shallow(b: _Builder, scale: float):
+    for d in range(max(1, int(200 * scale))):
+        directory = b.mkdir(b.root / f"dir{d:05d}")
+        for f in range(20):
+            b.write(directory / f"file{f:03d}{b.extension()}", b.rng.randint(0, 8192))
+
+
+def _deep_narrow(b: _Builder, scale: float):
+    for branch in range(max(1, int(4 * scale))):
+        current = b.root / f"branch{branch}"
+        for depth in range(40):
+            current = b.mkdir(current / f"level{depth:02d}")
+            for f in range(3):
+                b.write(current / f"file{f}{b.extension()}", b.rng.randint(0, 4096))
+
+
+def _many_small_files(b: _Builder, scale: float):
+    total = max(1, int(20000 * scale))
+    per_dir = 1000
+    for d in range((total + per_dir - 1) // per_dir):
+        directory = b.mkdir(b.root / f"bucket{d:04d}")
+        for f in range(min(per_dir, total - d * per_dir)):
+            b.write(directory / f"f{f:05d}{b.extension()}", b.rng.randint(0, 512))
+
+
+def _few_huge_sparse_files(b: _Builder, scale: float):
+    directory = b.mkdir(b.root / "images")
+    for f in range(max(1, int(8 * scale))):
+        # Tamanho aparente de 1-64 GiB ocupando apenas alguns KiB
+        size = b.rng.randint(1, 64) * 1024 ** 3
+        b.sparse(directory / f"disk{f:02d}.img", size, b.rng.randint(1, 16) * 1024)
+
+
+def _hard_link_heavy(b: _Builder, scale: float):
+    originals = b.mkdir(b.root / "originals")
+    sources = [
+        b.write(originals / f"blob{f:04d}.bin", b.rng.randint(1024, 65536))
+        for f in range(max(1, int(200 * scale)))
+    ]
+    for d in range(10):
+        directory = b.mkdir(b.root / f"snapshot{d:02d}")
+        for source in sources:
+            b.link(source, directory / source.name)
+
+
+SHAPES: Dict[str, Callable[[_Builder, float], None]] = {
+    'wide-shallow': _wide_shallow,
+    'deep-narrow': _deep_narrow,
+    'many-small-files': _many_small_files,
+    'few-huge-sparse-files': _few_huge_sparse_files,
+    'hard-link-heavy': _hard_link_heavy,
+}
+
+
+def generate_tree(shape: str, root: str, seed: int = 42, scale: float = 1.0) -> TreeManifest:
+    """
+    Gera uma árvore sintética reproduzível
+
+    Args:
+        shape: Formato da árvore (ver SHAPES)
+        root: Diretório onde a árvore será criada
+        seed: Semente para tamanhos e extensões
+        scale: Fator multiplicador do número de entradas
+
+    Returns:
+        TreeManifest com a contagem de entradas criadas
+    """
+    if shape not in SHAPES:
+        raise ValueError(f"Formato desconhecido: {shape}")
+
+    root_path = Path(root)
+    root_path.mkdir(parents=True, exist_ok=True)
+
+    builder = _Builder(root_path, seed)
+    SHAPES[shape](builder, scale)
+
+    return TreeManifest(
+        shape=shape,
+        root=str(root_path),
+        seed=seed,
+        scale=scale,
+        files=builder.files,
+        dirs=builder.dirs,
+        links=builder.links,
+        apparent_bytes=builder.apparent_bytes
+    )
+
+
+if __name__ == '__main__':
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(description='Gera árvores sintéticas para benchmark')
+    parser.add_argument('shape', choices=sorted(SHAPES))
+    parser.add_argument('root', help='Diretório de destino')
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--scale', type=float, default=1.0)
+    args = parser.parse_args()
+
+    manifest = generate_tree(args.shape, args.root, args.seed, args.scale)
+    print(json.dumps(manifest.to_dict(), indent=2))
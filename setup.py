@@ -59,12 +59,22 @@ setup(
         "web": [
             "gunicorn>=20.1.0",
             "waitress>=2.1.0",
+            "orjson>=3.9.0",
+            "brotli>=1.0.9",
+        ],
+        # Consultas vetorizadas do disk-analyzer-query (sem numpy: Python puro)
+        "query": [
+            "numpy",
         ]
     },
     entry_points={
         "console_scripts": [
             "disk-analyzer=cli.main:analyze",
             "disk-analyzer-web=web.app:main",
+            "disk-analyzer-history=cli.history:history",
+            "disk-analyzer-diff=cli.diff:diff",
+            "disk-analyzer-agent=cli.agent:agent",
+            "disk-analyzer-query=cli.query:query",
         ],
     },
     include_package_data=True,
@@ -3,7 +3,9 @@ Disk Usage Analyzer - Core Module
 Módulo principal para análise de uso de disco
 """
 
-from .core import DiskUsageAnalyzer, DirectoryStats, FileInfo
+from .core import DiskUsageAnalyzer, DirectoryStats, FileInfo, ScanProgress, ScanCancelled
+from .errors import ErrorLog, ScanError
+from .metrics import ScanMetrics
 
 __version__ = "1.0.0"
 __author__ = "Thomas"
@@ -11,5 +13,10 @@ __author__ = "Thomas"
 __all__ = [
     "DiskUsageAnalyzer",
     "DirectoryStats", 
-    "FileInfo"
+    "FileInfo",
+    "ScanProgress",
+    "ScanCancelled",
+    "ErrorLog",
+    "ScanError",
+    "ScanMetrics"
 ]
@@ -0,0 +1,137 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Async Module
+API asyncio para embutir o analisador em serviços assíncronos
+"""
+
+import asyncio
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Optional
+
+from .core import DiskUsageAnalyzer, DirectoryStats
+
+
+async def iter_directory_async(analyzer: DiskUsageAnalyzer, path: str,
+                               max_in_flight: int = 4,
+                               executor: Optional[Executor] = None
+                               ) -> AsyncIterator[DirectoryStats]:
+    """
+    Analisa um diretório sem bloquear o event loop
+
+    As chamadas bloqueantes (listagem e stat) rodam em um executor. Cada
+    subdiretório de primeiro nível é analisado por um analisador filho,
+    com no máximo max_in_flight subárvores simultâneas; as subárvores são
+    emitidas à medida que terminam e o último item emitido é a raiz
+    completa. Cancelar a task interrompe as subárvores em andamento.
+
+    Args:
+        analyzer: Analisador com a configuração da varredura
+        path: Diretório raiz
+        max_in_flight: Máximo de subárvores analisadas ao mesmo tempo
+        executor: Executor para as chamadas bloqueantes (padrão: um
+            ThreadPoolExecutor próprio com max_in_flight threads)
+    """
+    loop = asyncio.get_running_loop()
+    own_executor = executor is None
+    if own_executor:
+        executor = ThreadPoolExecutor(max_workers=max_in_flight,
+                                      thread_name_prefix='disk-analyzer')
+
+    dir_path = Path(path)
+    cancel_event = threading.Event()
+    pending = set()
+
+    try:
+        if not await loop.run_in_executor(executor, dir_path.exists):
+            raise FileNotFoundError(f"Diretório não encontrado: {path}")
+        if not await loop.run_in_executor(executor, dir_path.is_dir):
+            raise NotADirectoryError(f"Não é um diretório: {path}")
+
+        device = None
+        if analyzer._check_mounts or analyzer._visited is not None:
+            root_stat = await loop.run_in_executor(executor, dir_path.stat)
+            device = root_stat.st_dev
+            if analyzer._visited is not None:
+                analyzer._visited.add((device, root_stat.st_ino))
+
+        analyzer.errors.set_root(str(dir_path))
+        progress = analyzer.progress_callback is not None
+        if progress:
+            analyzer._start_progress()
+        stats = analyzer._new_stats(str(dir_path))
+
+        try:
+            entries = await loop.run_in_executor(executor, analyzer._read_directory,
+                                                 dir_path, 0, stats)
+        except PermissionError as e:
+            analyzer._record_error('listdir', dir_path, e)
+            entries = []
+
+        semaphore = asyncio.Semaphore(max_in_flight)
+        results = {}
+
+        async def scan_subtree(index: int, item: Path, device: int) -> DirectoryStats:
+            async with semaphore:
+                child = analyzer._spawn()
+                child._cancel_event = cancel_event
+                child_stats = await loop.run_in_executor(executor, child.analyze_directory,
+                                                         str(item), 1, device)
+                analyzer._absorb(child)
+                results[index] = child_stats
+                return child_stats
+
+        substitutes = {}
+        if analyzer.max_depth > 0:
+            for index, (item, file_info) in enumerate(entries):
+                if not file_info.is_dir:
+                    continue
+                if progress:
+                    analyzer._count_progress(queued=-1)
+                descend, substitutes[index] = analyzer._visit_subdirectory(file_info, device)
+                if descend:
+                    pending.add(asyncio.ensure_future(scan_subtree(index, item, file_info.device)))
+
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                yield task.result()
+
+        # Agregar na ordem da listagem, como na análise síncrona
+        for index, (item, file_info) in enumerate(entries):
+            if file_info.is_dir:
+                stats.dir_count += 1
+                if index in results:
+                    analyzer._merge_child(stats, results[index])
+                elif substitutes.get(index) is not None:
+                    analyzer._merge_child(stats, substitutes[index])
+            else:
+                analyzer._add_file(stats, file_info)
+
+        if progress:
+            analyzer._report_progress(stats.path, done=1, force=True)
+        yield stats
+
+    finally:
+        if pending:
+            # Cancelamento ou erro: sinalizar as threads e descartar o que falta
+            cancel_event.set()
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+        else:
+            # Com subárvores canceladas as threads ainda podem usar o backend
+            analyzer.close()
+        if own_executor:
+            executor.shutdown(wait=False)
+
+
+async def analyze_directory_async(analyzer: DiskUsageAnalyzer, path: str,
+                                  max_in_flight: int = 4,
+                                  executor: Optional[Executor] = None) -> DirectoryStats:
+    """Versão assíncrona de analyze_directory; retorna a raiz completa"""
+    stats = None
+    async for stats in iter_directory_async(analyzer, path, max_in_flight, executor):
+        pass
+    return stats
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - File Attributes
+Faixas de idade (última modificação) e nomes de donos, compartilhados
+pelo índice de arquivos e pelos relatórios
+"""
+
+import bisect
+from functools import lru_cache
+from typing import Optional
+
+try:
+    import grp
+    import pwd
+except ImportError:  # Windows
+    grp = pwd = None
+
+
+DAY = 86400
+
+# Limites superiores (em dias) das faixas de idade; a última faixa é aberta
+AGE_LIMITS_DAYS = (30, 90, 180, 365, 730)
+AGE_EDGES = tuple(days * DAY for days in AGE_LIMITS_DAYS)
+AGE_LABELS = (
+    '< 30 dias',
+    '30-90 dias',
+    '90-180 dias',
+    '180 dias-1 ano',
+    '1-2 anos',
+    '> 2 anos',
+)
+
+
+def age_bucket(age_seconds: float) -> int:
+    """Índice em AGE_LABELS de um arquivo com essa idade"""
+    return bisect.bisect_right(AGE_EDGES, age_seconds)
+
+
+@lru_cache(maxsize=4096)
+def owner_name(uid: int) -> str:
+    """Nome do usuário de um uid (o próprio número se não existir)"""
+    if pwd is not None:
+        try:
+            return pwd.getpwuid(uid).pw_name
+        except KeyError:
+            pass
+    return str(uid)
+
+
+@lru_cache(maxsize=4096)
+def group_name(gid: int) -> str:
+    """Nome do grupo de um gid (o próprio número se não existir)"""
+    if grp is not None:
+        try:
+            return grp.getgrgid(gid).gr_name
+        except KeyError:
+            pass
+    return str(gid)
+
+
+def resolve_owner(owner: str) -> Optional[int]:
+    """uid de um nome de usuário ou número; None se não existir"""
+    if owner.isdigit():
+        return int(owner)
+    if pwd is not None:
+        try:
+            return pwd.getpwnam(owner).pw_uid
+        except KeyError:
+            pass
+    return None
@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Batch Module
+Análise de várias raízes em um único pool de threads
+"""
+
+import os
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from .core import DiskUsageAnalyzer, DirectoryStats, merge_breakdowns, merge_file_types
+from .scheduler import DeviceScheduler
+
+
+RootKey = Tuple[int, int]
+
+
+def root_key(path: str) -> RootKey:
+    """Identidade de um diretório no sistema de arquivos (st_dev, st_ino)"""
+    st = os.stat(path)
+    return (st.st_dev, st.st_ino)
+
+
+def _add_totals(analyzer: DiskUsageAnalyzer, stats: DirectoryStats, other: DirectoryStats):
+    """Soma os totais de other em stats (sem tocar em children)"""
+    stats.total_size += other.total_size
+    stats.file_count += other.file_count
+    stats.dir_count += other.dir_count
+    stats.symlink_count += other.symlink_count
+    stats.allocated_size += other.allocated_size
+    stats.sparse_count += other.sparse_count
+
+    merge_file_types(stats, other)
+
+    merge_breakdowns(stats, other)
+
+    if other.largest_file and analyzer._larger(other.largest_file, stats.largest_file):
+        stats.largest_file = other.largest_file
+
+
+class _Grafter:
+    """Substitui os marcadores de raízes aninhadas pelas raízes analisadas"""
+
+    def __init__(self, analyzer: DiskUsageAnalyzer, results: Dict[RootKey, DirectoryStats]):
+        self.analyzer = analyzer
+        self.results = results
+        self.placeholders = analyzer._placeholders
+        self._done = set()
+        self._active = set()
+
+    def resolve(self, key: RootKey) -> Optional[DirectoryStats]:
+        """Raiz com as raízes aninhadas já enxertadas (None em ciclos)"""
+        if key in self._active:
+            # Bind mount de um ancestral dentro da própria árvore
+            return None
+
+        stats = self.results[key]
+        if key not in self._done:
+            self._active.add(key)
+            self._graft(stats)
+            self._active.discard(key)
+            self._done.add(key)
+        return stats
+
+    def _graft(self, stats: DirectoryStats) -> Optional[DirectoryStats]:
+        """Enxerta as raízes abaixo de stats e devolve o acréscimo nos totais"""
+        delta = None
+        for index, child in enumerate(stats.children):
+            key = self.placeholders.get(id(child))
+            if key is not None:
+                nested = self.resolve(key)
+                if nested is None:
+                    continue
+                stats.children[index] = nested
+                child_delta = nested
+            else:
+                child_delta = self._graft(child)
+                if child_delta is None:
+                    continue
+
+            if delta is None:
+                delta = self.analyzer._new_stats(stats.path)
+            _add_totals(self.analyzer, delta, child_delta)
+
+        if delta is not None:
+            _add_totals(self.analyzer, stats, delta)
+        return delta
+
+
+def analyze_roots(analyzer: DiskUsageAnalyzer, paths: List[str],
+                  max_workers: int = 4) -> Dict[str, DirectoryStats]:
+    """
+    Analisa várias raízes compartilhando um pool de threads
+
+    Cada raiz é listada e seus subdiretórios de primeiro nível viram
+    tarefas do mesmo pool, então uma raiz grande não deixa as demais
+    esperando. As tarefas são agrupadas por st_dev (DeviceScheduler): cada
+    dispositivo tem a própria concorrência, ajustada pela latência de
+    leitura dos diretórios. Raízes repetidas ou aninhadas, comparadas por (st_dev,
+    st_ino) para cobrir também bind mounts, são analisadas uma única vez:
+    a raiz externa recebe um marcador no lugar da aninhada, que é
+    enxertada (mesmo objeto DirectoryStats) ao final.
+
+    Args:
+        analyzer: Analisador com a configuração da varredura
+        paths: Diretórios raiz
+        max_workers: Threads do pool compartilhado
+
+    Returns:
+        Dict caminho -> DirectoryStats, na ordem de paths
+    """
+    aliases: Dict[str, RootKey] = {}
+    roots: Dict[RootKey, str] = {}
+    for path in paths:
+        dir_path = Path(path)
+        if not dir_path.exists():
+            raise FileNotFoundError(f"Diretório não encontrado: {path}")
+        if not dir_path.is_dir():
+            raise NotADirectoryError(f"Não é um diretório: {path}")
+
+        key = root_key(str(dir_path))
+        aliases[str(dir_path)] = key
+        roots.setdefault(key, str(dir_path))
+        if analyzer._visited is not None:
+            analyzer._visited.add(key)
+
+    if analyzer.progress_callback is not None:
+        analyzer._start_progress()
+
+    # Um analisador por raiz; cada um conhece as demais raízes
+    scanners: Dict[RootKey, DiskUsageAnalyzer] = {}
+    for key, path in roots.items():
+        scanner = analyzer._spawn()
+        scanner.errors.set_root(path)
+        scanner._root_keys = {other: p for other, p in roots.items() if other != key}
+        scanners[key] = scanner
+
+    def read_root(scanner: DiskUsageAnalyzer, path: str):
+        try:
+            return scanner._read_directory(Path(path), 0)
+        except PermissionError as e:
+            scanner._record_error('listdir', path, e)
+            return []
+
+    children: List[Tuple[RootKey, DiskUsageAnalyzer]] = []
+    results: Dict[RootKey, DirectoryStats] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='disk-analyzer') as pool:
+        scheduler = DeviceScheduler(pool, max_workers)
+
+        # Fase 1: listar todas as raízes
+        listings = {key: scheduler.submit(key[0], read_root, scanners[key], path)
+                    for key, path in roots.items()}
+        entries = {key: future.result() for key, future in listings.items()}
+
+        # Fase 2: subárvores de primeiro nível de todas as raízes no mesmo pool
+        subtrees = {}
+        if analyzer.max_depth > 0:
+            for key, items in entries.items():
+                scanner = scanners[key]
+                for index, (item, file_info) in enumerate(items):
+                    if not file_info.is_dir:
+                        continue
+                    if scanner.progress_callback is not None:
+                        scanner._count_progress(queued=-1)
+                    descend, substitute = scanner._visit_subdirectory(file_info, key[0])
+                    if not descend:
+                        subtrees[key, index] = substitute
+                        continue
+                    child = scanner._spawn()
+                    child._io_observer = scheduler.observer(file_info.device)
+                    children.append((key, child))
+                    subtrees[key, index] = scheduler.submit(file_info.device,
+                                                            child.analyze_directory,
+                                                            str(item), 1, file_info.device)
+
+        # Fase 3: agregar cada raiz na ordem da listagem
+        for key, items in entries.items():
+            scanner = scanners[key]
+            stats = scanner._new_stats(roots[key])
+            for index, (item, file_info) in enumerate(items):
+                if file_info.is_dir:
+                    stats.dir_count += 1
+                    subtree = subtrees.get((key, index))
+                    if isinstance(subtree, DirectoryStats):
+                        # Marcador de raiz aninhada ou montagem via statvfs
+                        scanner._merge_child(stats, subtree)
+                    elif subtree is not None:
+                        scanner._merge_child(stats, subtree.result())
+                else:
+                    scanner._add_file(stats, file_info)
+            results[key] = stats
+
+    # Filhos primeiro na raiz: cada raiz fica com os próprios erros
+    for key, child in children:
+        scanners[key]._absorb(child)
+    analyzer.root_errors = {}
+    for key, scanner in scanners.items():
+        analyzer._absorb(scanner)
+        analyzer.root_errors[roots[key]] = scanner.errors
+
+    grafter = _Grafter(analyzer, results)
+    for key in results:
+        grafter.resolve(key)
+    analyzer._placeholders.clear()
+    if analyzer.progress_callback is not None:
+        analyzer._report_progress(paths[-1], done=len(roots), force=True)
+
+    return {path: results[key] for path, key in aliases.items()}
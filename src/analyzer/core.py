@@ -4,14 +4,36 @@ Disk Usage Analyzer - Core Module
 Análise principal de uso de disco
 """
 
+import errno
 import os
 import stat
+import sys
+import time
+from array import array
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
-from dataclasses import dataclass
+from time import monotonic, perf_counter
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Tuple
+from dataclasses import dataclass, field
 from datetime import datetime
-import humanize
-import hashlib
+
+from .attributes import AGE_LABELS, age_bucket, owner_name
+from .errors import ErrorLog
+from .metrics import ScanMetrics
+from .mounts import PSEUDO_FILESYSTEMS, filesystem_usage, read_mount_table
+
+if TYPE_CHECKING:
+    from .fileindex import FileIndex
+    from .throttle import Throttle
+
+
+# Diferença mínima entre tamanho aparente e alocado para considerar esparso
+SPARSE_SLACK = 4096
+
+# lstat relativo a um diretório aberto (sem resolver o caminho inteiro)
+_STAT_DIR_FD = os.stat in os.supports_dir_fd and hasattr(os, 'O_DIRECTORY')
+
+# Inicializador das faixas de idade zeradas (array('q') de len(AGE_LABELS))
+_EMPTY_AGES = bytes(8 * len(AGE_LABELS))
 
 
 @dataclass
@@ -27,6 +49,16 @@ class FileInfo:
     group: str
     file_type: str
     hash_md5: Optional[str] = None
+    device: int = 0
+    inode: int = 0
+    is_symlink: bool = False
+    allocated: int = 0
+    data_size: Optional[int] = None
+    
+    @property
+    def is_sparse(self) -> bool:
+        """Ocupa ao menos um bloco a menos do que o tamanho aparente"""
+        return not self.is_dir and self.size - self.allocated >= SPARSE_SLACK
 
 
 @dataclass
@@ -39,6 +71,93 @@ class DirectoryStats:
     largest_file: Optional[FileInfo]
     file_types: Dict[str, int]
     children: List['DirectoryStats']
+    symlink_count: int = 0
+    allocated_size: int = 0
+    sparse_count: int = 0
+    # Com breakdowns: bytes por faixa de idade (AGE_LABELS) e por uid
+    age_sizes: Optional[array] = None
+    owner_sizes: Optional[Dict[int, int]] = None
+    # Bytes por extensão (mesmas chaves de file_types)
+    file_type_sizes: Dict[str, int] = field(default_factory=dict)
+
+
+def file_type_of(name: str) -> str:
+    """Tipo de arquivo pela extensão, como Path(name).suffix.lower()"""
+    index = name.rfind('.')
+    if 0 < index < len(name) - 1:
+        # Internada: a busca em file_types acerta pela identidade da chave
+        return sys.intern(name[index:].lower())
+    return 'no_extension'
+
+
+def merge_file_types(stats: DirectoryStats, other: DirectoryStats):
+    """Soma quantidade e bytes por extensão de other em stats"""
+    counts, sizes = stats.file_types, stats.file_type_sizes
+    other_counts, other_sizes = other.file_types, other.file_type_sizes
+    if not counts:
+        # Primeiro filho com arquivos: update() copia em C, sem laço
+        counts.update(other_counts)
+        sizes.update(other_sizes)
+        return
+    # Um único laço para as duas contas; as chaves são internadas
+    for file_type, count in other_counts.items():
+        if file_type in counts:
+            counts[file_type] += count
+            sizes[file_type] += other_sizes[file_type]
+        else:
+            counts[file_type] = count
+            sizes[file_type] = other_sizes[file_type]
+
+
+def merge_breakdowns(stats: DirectoryStats, other: DirectoryStats):
+    """Soma as faixas de idade e os bytes por dono de other em stats"""
+    if other.age_sizes is None:
+        return
+    if stats.age_sizes is None:
+        stats.age_sizes = array('q', _EMPTY_AGES)
+        stats.owner_sizes = {}
+    ages = stats.age_sizes
+    for bucket, size in enumerate(other.age_sizes):
+        ages[bucket] += size
+    owners = stats.owner_sizes
+    for uid, size in other.owner_sizes.items():
+        owners[uid] = owners.get(uid, 0) + size
+
+
+@dataclass
+class ScanProgress:
+    """Estado de uma varredura em andamento"""
+    entries: int
+    bytes: int
+    dirs_done: int
+    dirs_queued: int
+    current_path: str
+    elapsed: float
+
+
+class _ProgressState:
+    """
+    Contadores de progresso de uma varredura
+    
+    Compartilhado pelo analisador e pelos filhos das varreduras
+    concorrentes (com lock), para que o callback veja a varredura inteira.
+    """
+    
+    def __init__(self, callback: Callable[[ScanProgress], None], interval: float):
+        import threading
+        self.callback = callback
+        self.interval = interval
+        self.entries = 0
+        self.bytes = 0
+        self.dirs_done = 0
+        self.dirs_queued = 0
+        self.started = monotonic()
+        self.next_report = 0.0
+        self.lock = threading.Lock()
+
+
+class ScanCancelled(Exception):
+    """Varredura interrompida por cancel()"""
 
 
 class DiskUsageAnalyzer:
@@ -49,7 +168,26 @@ class DiskUsageAnalyzer:
                  max_depth: int = 10,
                  exclude_patterns: List[str] = None,
                  include_hidden: bool = False,
-                 calculate_hashes: bool = False):
+                 calculate_hashes: bool = False,
+                 metrics: Optional[ScanMetrics] = None,
+                 progress_callback: Optional[Callable[[ScanProgress], None]] = None,
+                 progress_interval_ms: int = 200,
+                 max_error_samples: int = 100,
+                 one_file_system: bool = False,
+                 skip_fs_types: Optional[Iterable[str]] = None,
+                 mount_usage: bool = False,
+                 follow_symlinks: bool = False,
+                 use_allocated_size: bool = False,
+                 memory_limit: Optional[int] = None,
+                 chunk_size: int = 1000,
+                 spill_dir: Optional[str] = None,
+                 file_index: bool = False,
+                 breakdowns: bool = False,
+                 reference_time: Optional[float] = None,
+                 stat_backend: str = 'lstat',
+                 fast_listing: bool = False,
+                 inode_order: bool = False,
+                 throttle: Optional['Throttle'] = None):
         """
         Inicializa o analisador
         
@@ -59,15 +197,221 @@ class DiskUsageAnalyzer:
             exclude_patterns: Padrões para excluir
             include_hidden: Incluir arquivos ocultos
             calculate_hashes: Calcular hashes MD5 para detecção de duplicatas
+            metrics: Coletor opcional de métricas de instrumentação
+            progress_callback: Função chamada com ScanProgress durante a varredura
+            progress_interval_ms: Intervalo mínimo entre chamadas de progresso
+            max_error_samples: Quantidade de erros guardados como exemplo
+            one_file_system: Não descer em diretórios de outro st_dev
+            skip_fs_types: Tipos de sistema de arquivos nunca percorridos
+                (padrão: PSEUDO_FILESYSTEMS, como proc e sysfs)
+            mount_usage: Reportar montagens via statvfs em vez de percorrê-las
+            follow_symlinks: Seguir links simbólicos (cada diretório é
+                percorrido uma única vez, mesmo com ciclos)
+            use_allocated_size: Usar o espaço alocado (st_blocks) em vez do
+                tamanho aparente em min_size, maior arquivo e find_large_files
+            memory_limit: Memória (bytes, estimada) para a árvore de resultados
+                e o FileIndex; acima disso subárvores concluídas vão para um
+                SQLite temporário (o FileIndex continua em memória)
+            chunk_size: Diretórios gravados por lote ao descarregar
+            spill_dir: Diretório do arquivo temporário (padrão: TMPDIR)
+            file_index: Guardar tamanho, mtime, dono e extensão de cada
+                arquivo em um FileIndex colunar (self.file_index)
+            breakdowns: Somar, em cada diretório, os bytes por faixa de
+                idade e por dono (age_sizes e owner_sizes)
+            reference_time: Instante das idades (padrão: agora)
+            stat_backend: 'lstat' (um lstat por item) ou statx em lote por
+                diretório: 'statx' (threads), 'uring' (io_uring) ou
+                'threads' (ver analyzer.statx)
+            fast_listing: Listar com os.scandir (nome e inode) e somar os
+                arquivos direto nas estatísticas, sem Path nem FileInfo por
+                arquivo; o resultado é o mesmo da listagem com iterdir
+            inode_order: Fazer os stat de cada diretório em ordem de inode
+                (menos seeks em discos rotacionais); implica fast_listing,
+                que traz o inode da listagem
+            throttle: Limites de stat e hash por segundo, com recuo quando
+                a latência sobe (analyzer.throttle); compartilhado pelas
+                varreduras concorrentes
         """
         self.min_size = min_size
         self.max_depth = max_depth
         self.exclude_patterns = exclude_patterns or []
         self.include_hidden = include_hidden
         self.calculate_hashes = calculate_hashes
+        self.max_error_samples = max_error_samples
+        self.one_file_system = one_file_system
+        self.skip_fs_types = frozenset(PSEUDO_FILESYSTEMS if skip_fs_types is None
+                                       else skip_fs_types)
+        self.mount_usage = mount_usage
+        self.follow_symlinks = follow_symlinks
+        self.use_allocated_size = use_allocated_size
+        self.memory_limit = memory_limit
+        self.chunk_size = chunk_size
+        self.spill_dir = spill_dir
+        self.skipped_mounts: List[str] = []
         self.total_files_scanned = 0
         self.total_size_scanned = 0
-        self.errors = []
+        self.errors = ErrorLog(sample_size=max_error_samples)
+        # Erros de cada raiz do último analyze_roots (self.errors soma todas)
+        self.root_errors: Dict[str, ErrorLog] = {}
+        self.metrics = metrics
+        self.progress_callback = progress_callback
+        self.progress_interval = progress_interval_ms / 1000.0
+        self._progress: Optional[_ProgressState] = None
+        # Bytes deste analisador já somados no progresso
+        self._reported_bytes = 0
+        self._cancel_event = None
+        self._root_keys = None
+        self._placeholders = {}
+        self._check_mounts = one_file_system or mount_usage or bool(self.skip_fs_types)
+        self._mount_table = None
+        # (st_dev, st_ino) dos diretórios já percorridos ao seguir links
+        self._visited = set() if follow_symlinks else None
+        self._spill = None
+        if memory_limit:
+            from .spill import SpillStore
+            self._spill = SpillStore(memory_limit, spill_dir, chunk_size)
+        self.file_index: Optional['FileIndex'] = None
+        if file_index:
+            from . import fileindex
+            self.file_index = fileindex.FileIndex()
+        self.breakdowns = breakdowns
+        self.reference_time = time.time() if reference_time is None else reference_time
+        self.fast_listing = fast_listing or inode_order
+        self.inode_order = inode_order
+        # Chamado com (segundos, operações) a cada diretório lido (ver analyzer.scheduler)
+        self._io_observer = None
+        # Listagens e stat feitos até agora (operações das amostras de latência)
+        self._io_operations = 0
+        self.stat_backend = stat_backend
+        self._stat_batch = None
+        if stat_backend != 'lstat':
+            from .statx import create_stat_backend
+            self._stat_batch = create_stat_backend(stat_backend)
+        
+        if metrics is not None:
+            self._instrument(metrics)
+        
+        # Sem os tokens: stat individual dentro de um lote já cobrado
+        self._get_file_info = self.get_file_info
+        
+        # Depois das métricas: as esperas do throttle não entram nas fases
+        self.throttle = throttle
+        if throttle is not None:
+            self._apply_throttle(throttle)
+    
+    def _spawn(self) -> 'DiskUsageAnalyzer':
+        """
+        Cria um analisador com a mesma configuração e estado próprio
+        
+        Usado pelas varreduras concorrentes: cada subárvore é analisada
+        por um filho e o resultado é incorporado com _absorb().
+        Novas opções do construtor precisam ser repassadas aqui.
+        """
+        child = DiskUsageAnalyzer(
+            min_size=self.min_size,
+            max_depth=self.max_depth,
+            exclude_patterns=self.exclude_patterns,
+            include_hidden=self.include_hidden,
+            calculate_hashes=self.calculate_hashes,
+            metrics=ScanMetrics(self.metrics.slowest_limit) if self.metrics is not None else None,
+            max_error_samples=self.max_error_samples,
+            one_file_system=self.one_file_system,
+            skip_fs_types=self.skip_fs_types,
+            mount_usage=self.mount_usage,
+            follow_symlinks=self.follow_symlinks,
+            use_allocated_size=self.use_allocated_size,
+            chunk_size=self.chunk_size,
+            spill_dir=self.spill_dir,
+            file_index=self.file_index is not None,
+            breakdowns=self.breakdowns,
+            reference_time=self.reference_time,
+            fast_listing=self.fast_listing,
+            inode_order=self.inode_order,
+            throttle=self.throttle
+        )
+        # Um único orçamento de memória para toda a varredura
+        child.memory_limit = self.memory_limit
+        child._spill = self._spill
+        child._mount_table = self._mount_table
+        child._visited = self._visited
+        child.errors.set_root(self.errors.root)
+        child._cancel_event = self._cancel_event
+        child._root_keys = self._root_keys
+        child._io_observer = self._io_observer
+        # O backend de stat em lote é compartilhado (um anel por thread)
+        child.stat_backend = self.stat_backend
+        child._stat_batch = self._stat_batch
+        # Progresso somado no estado do pai
+        child.progress_callback = self.progress_callback
+        child._progress = self._progress
+        return child
+    
+    def _absorb(self, child: 'DiskUsageAnalyzer'):
+        """Incorpora contadores, erros e métricas de um analisador filho"""
+        self.total_files_scanned += child.total_files_scanned
+        self.total_size_scanned += child.total_size_scanned
+        self._reported_bytes += child._reported_bytes
+        self.errors.merge(child.errors)
+        self._placeholders.update(child._placeholders)
+        self.skipped_mounts.extend(child.skipped_mounts)
+        if self.file_index is not None and child.file_index is not None:
+            self.file_index.extend(child.file_index)
+        if self.metrics is not None and child.metrics is not None:
+            self.metrics.merge(child.metrics)
+    
+    def close(self):
+        """
+        Libera o backend de stat em lote (anéis do io_uring, pool de threads)
+        
+        Chamado ao fim de cada varredura; o analisador continua utilizável
+        e o backend é recriado no próximo lote.
+        """
+        if self._stat_batch is not None:
+            self._stat_batch.close()
+    
+    def __enter__(self) -> 'DiskUsageAnalyzer':
+        return self
+    
+    def __exit__(self, *exc_info):
+        self.close()
+    
+    def cancel(self):
+        """Interrompe a varredura em andamento (seguro entre threads)"""
+        if self._cancel_event is None:
+            import threading
+            self._cancel_event = threading.Event()
+        self._cancel_event.set()
+    
+    def _instrument(self, metrics: ScanMetrics):
+        """Substitui os métodos do caminho crítico por versões medidas"""
+        self.should_exclude = metrics.timed(self.should_exclude, 'exclude')
+        self.get_file_info = metrics.timed(self.get_file_info, 'stat', syscalls=1)
+        self._stat_entries = metrics.timed(self._stat_entries, 'stat')
+        self._calculate_md5 = metrics.timed(self._calculate_md5, 'hash', syscalls=1)
+        self._list_directory = metrics.timed(self._list_directory, 'listdir', syscalls=1)
+        self._list_entries = metrics.timed(self._list_entries, 'listdir', syscalls=1)
+        self._stat_names = metrics.timed(self._stat_names, 'stat')
+        self._merge_child = metrics.timed(self._merge_child, 'aggregate')
+    
+    def _apply_throttle(self, throttle: 'Throttle'):
+        """Envolve listagens e stat com os tokens e a medição de latência"""
+        self.get_file_info = throttle.wrap(self.get_file_info)
+        self._list_directory = throttle.wrap(self._list_directory)
+        self._list_entries = throttle.wrap(self._list_entries)
+        self._stat_entries = throttle.wrap_batch(self._stat_entries)
+        self._stat_names = throttle.wrap_batch(self._stat_names)
+    
+    def _io_clock(self) -> float:
+        """perf_counter sem as esperas do throttle nesta thread"""
+        if self.throttle is None:
+            return perf_counter()
+        return perf_counter() - self.throttle.thread_waited()
+    
+    def _record_error(self, operation: str, path, exc: BaseException):
+        """Registra uma falha no ErrorLog e nas métricas"""
+        self.errors.record(operation, str(path), exc)
+        if self.metrics is not None:
+            self.metrics.incr('permission_errors' if isinstance(exc, PermissionError) else 'errors')
     
     def should_exclude(self, path: Path) -> bool:
         """Verifica se um path deve ser excluído"""
@@ -81,51 +425,521 @@ class DiskUsageAnalyzer:
         return False
     
     def get_file_info(self, path: Path) -> Optional[FileInfo]:
-        """Obtém informações detalhadas de um arquivo"""
+        """
+        Obtém informações detalhadas de um arquivo
+        
+        Usa lstat: links simbólicos viram entradas próprias, a não ser
+        com follow_symlinks, quando o alvo é usado (links quebrados
+        continuam como links).
+        """
         try:
-            stat_info = path.stat()
-            
-            # Informações básicas
-            file_info = FileInfo(
-                path=str(path),
-                name=path.name,
-                size=stat_info.st_size,
-                is_dir=path.is_dir(),
-                modified=datetime.fromtimestamp(stat_info.st_mtime),
-                permissions=stat.filemode(stat_info.st_mode),
-                owner=str(stat_info.st_uid),
-                group=str(stat_info.st_gid),
-                file_type=path.suffix.lower() if path.suffix else 'no_extension'
-            )
-            
-            # Calcular hash se solicitado e for arquivo
-            if self.calculate_hashes and not file_info.is_dir and file_info.size > 0:
+            stat_info = path.lstat()
+            is_symlink = stat.S_ISLNK(stat_info.st_mode)
+            if is_symlink and self.follow_symlinks:
                 try:
-                    file_info.hash_md5 = self._calculate_md5(path)
-                except Exception as e:
-                    self.errors.append(f"Erro calculando hash para {path}: {e}")
+                    stat_info = path.stat()
+                    is_symlink = False
+                except OSError:
+                    pass
             
-            return file_info
+            return self._make_file_info(path, stat_info, is_symlink)
             
         except (OSError, PermissionError) as e:
-            self.errors.append(f"Erro acessando {path}: {e}")
+            self._record_error('stat', path, e)
             return None
     
+    def _make_file_info(self, path: Path, stat_info, is_symlink: bool) -> FileInfo:
+        """Monta o FileInfo de um os.stat_result (ou StatxResult)"""
+        # Informações básicas
+        file_info = FileInfo(
+            path=str(path),
+            name=path.name,
+            size=stat_info.st_size,
+            is_dir=stat.S_ISDIR(stat_info.st_mode),
+            modified=datetime.fromtimestamp(stat_info.st_mtime),
+            permissions=stat.filemode(stat_info.st_mode),
+            owner=str(stat_info.st_uid),
+            group=str(stat_info.st_gid),
+            file_type='symlink' if is_symlink else file_type_of(path.name),
+            device=stat_info.st_dev,
+            inode=stat_info.st_ino,
+            is_symlink=is_symlink,
+            allocated=stat_info.st_blocks * 512
+        )
+        
+        # Calcular hash se solicitado e for arquivo regular
+        if self.calculate_hashes and stat.S_ISREG(stat_info.st_mode) and file_info.size > 0:
+            try:
+                file_info.hash_md5 = self._calculate_md5(path)
+                if self.metrics is not None:
+                    self.metrics.incr('hashed_bytes', file_info.size)
+            except Exception as e:
+                self._record_error('hash', path, e)
+        
+        return file_info
+    
+    def _stat_entries(self, dir_path: Path, items: List[Path]) -> List[Optional[FileInfo]]:
+        """FileInfo dos itens de um diretório com o backend de stat em lote"""
+        try:
+            results = self._stat_batch.stat_many(str(dir_path), [item.name for item in items])
+        except OSError:
+            # Diretório removido ou anel indisponível: um lstat por item
+            return [self._get_file_info(item) for item in items]
+        if self.metrics is not None:
+            self.metrics.incr('syscalls', self._stat_batch.syscalls(len(items)))
+        
+        infos = []
+        for item, stat_info in zip(items, results):
+            if isinstance(stat_info, OSError):
+                stat_info.filename = str(item)
+                self._record_error('stat', item, stat_info)
+                infos.append(None)
+                continue
+            is_symlink = stat.S_ISLNK(stat_info.st_mode)
+            if is_symlink and self.follow_symlinks:
+                # Raro: o alvo do link é resolvido pelo caminho normal
+                infos.append(self._get_file_info(item))
+                continue
+            infos.append(self._make_file_info(item, stat_info, is_symlink))
+        return infos
+    
     def _calculate_md5(self, path: Path) -> str:
         """Calcula hash MD5 de um arquivo"""
+        import hashlib
+        
         hash_md5 = hashlib.md5()
+        throttle = self.throttle
         with open(path, "rb") as f:
             for chunk in iter(lambda: f.read(4096), b""):
                 hash_md5.update(chunk)
+                if throttle is not None:
+                    throttle.hashed(len(chunk))
         return hash_md5.hexdigest()
     
-    def analyze_directory(self, path: str, current_depth: int = 0) -> DirectoryStats:
+    def _list_directory(self, dir_path: Path) -> List[Path]:
+        """Lista o conteúdo de um diretório"""
+        return list(dir_path.iterdir())
+    
+    def _list_entries(self, dir_path: str) -> List[Tuple[str, int]]:
+        """Lista (nome, inode) dos itens de um diretório, sem criar Path"""
+        with os.scandir(dir_path) as iterator:
+            return [(entry.name, entry.inode()) for entry in iterator]
+    
+    def _stat_names(self, dir_path: str, names: List[str]) -> list:
+        """lstat de cada nome relativo ao diretório (resultado ou OSError)"""
+        if self._stat_batch is not None and len(names) >= self._stat_batch.min_batch:
+            try:
+                results = self._stat_batch.stat_many(dir_path, names)
+                if self.metrics is not None:
+                    self.metrics.incr('syscalls', self._stat_batch.syscalls(len(names)))
+                return results
+            except OSError:
+                pass
+        
+        if self.metrics is not None:
+            self.metrics.incr('syscalls', len(names) + 2)
+        results = []
+        if not _STAT_DIR_FD:
+            for name in names:
+                try:
+                    results.append(os.lstat(os.path.join(dir_path, name)))
+                except OSError as e:
+                    results.append(e)
+            return results
+        
+        dir_fd = os.open(dir_path, os.O_RDONLY | os.O_DIRECTORY)
+        try:
+            for name in names:
+                try:
+                    results.append(os.stat(name, dir_fd=dir_fd, follow_symlinks=False))
+                except OSError as e:
+                    results.append(e)
+        finally:
+            os.close(dir_fd)
+        return results
+    
+    def _merge_child(self, stats: DirectoryStats, child_stats: DirectoryStats):
+        """Agrega as estatísticas de um subdiretório no diretório pai"""
+        stats.children.append(child_stats)
+        stats.total_size += child_stats.total_size
+        stats.file_count += child_stats.file_count
+        stats.dir_count += child_stats.dir_count
+        stats.symlink_count += child_stats.symlink_count
+        stats.allocated_size += child_stats.allocated_size
+        stats.sparse_count += child_stats.sparse_count
+        
+        # Atualizar tipos de arquivo
+        if child_stats.file_types:
+            merge_file_types(stats, child_stats)
+        
+        if child_stats.age_sizes is not None:
+            merge_breakdowns(stats, child_stats)
+        
+        # Verificar se tem o maior arquivo
+        if child_stats.largest_file and self._larger(child_stats.largest_file, stats.largest_file):
+            stats.largest_file = child_stats.largest_file
+    
+    def _size_of(self, file_info: FileInfo) -> int:
+        """Tamanho usado para filtrar e ordenar (aparente ou alocado)"""
+        return file_info.allocated if self.use_allocated_size else file_info.size
+    
+    def _larger(self, file_info: FileInfo, other: Optional[FileInfo]) -> bool:
+        """Verifica se file_info é maior que other (None conta como vazio)"""
+        return other is None or self._size_of(file_info) > self._size_of(other)
+    
+    def _start_progress(self):
+        """Zera os contadores de progresso no início de uma varredura"""
+        self._progress = _ProgressState(self.progress_callback, self.progress_interval)
+        self._reported_bytes = self.total_size_scanned
+    
+    def _report_progress(self, current_path: str, entries: int = 0, queued: int = 0,
+                         done: int = 0, force: bool = False):
+        """Soma os contadores e chama o callback respeitando o intervalo mínimo"""
+        state = self._progress
+        now = monotonic()
+        # O callback também roda com o lock: relatórios em ordem, um por vez
+        with state.lock:
+            state.entries += entries
+            state.dirs_queued += queued
+            state.dirs_done += done
+            state.bytes += self.total_size_scanned - self._reported_bytes
+            self._reported_bytes = self.total_size_scanned
+            if not force and now < state.next_report:
+                return
+            
+            state.next_report = now + state.interval
+            state.callback(ScanProgress(
+                entries=state.entries,
+                bytes=state.bytes,
+                dirs_done=state.dirs_done,
+                dirs_queued=state.dirs_queued,
+                current_path=current_path,
+                elapsed=now - state.started
+            ))
+    
+    def _count_progress(self, queued: int = 0, done: int = 0):
+        """Soma diretórios na fila e concluídos, sem chamar o callback"""
+        state = self._progress
+        with state.lock:
+            state.dirs_queued += queued
+            state.dirs_done += done
+    
+    def _new_stats(self, path: str) -> DirectoryStats:
+        """Cria estatísticas vazias para um diretório"""
+        stats = DirectoryStats(
+            path=path,
+            total_size=0,
+            file_count=0,
+            dir_count=0,
+            largest_file=None,
+            file_types={},
+            children=[]
+        )
+        if self.breakdowns:
+            stats.age_sizes = array('q', _EMPTY_AGES)
+            stats.owner_sizes = {}
+        return stats
+    
+    def _add_file(self, stats: DirectoryStats, file_info: FileInfo):
+        """Agrega um arquivo nas estatísticas do diretório"""
+        stats.total_size += file_info.size
+        stats.allocated_size += file_info.allocated
+        
+        # Links simbólicos são contados à parte (tamanho do próprio link)
+        if file_info.is_symlink:
+            stats.symlink_count += 1
+            return
+        
+        stats.file_count += 1
+        if file_info.is_sparse:
+            stats.sparse_count += 1
+        if self.file_index is not None:
+            self.file_index.add(stats.path, file_info)
+        if self.breakdowns:
+            size = file_info.size
+            age = self.reference_time - file_info.modified.timestamp()
+            stats.age_sizes[age_bucket(age)] += size
+            uid = int(file_info.owner)
+            stats.owner_sizes[uid] = stats.owner_sizes.get(uid, 0) + size
+        
+        # Atualizar tipos de arquivo
+        file_type = file_info.file_type
+        file_types = stats.file_types
+        if file_type in file_types:
+            file_types[file_type] += 1
+            stats.file_type_sizes[file_type] += file_info.size
+        else:
+            file_types[file_type] = 1
+            stats.file_type_sizes[file_type] = file_info.size
+        
+        # Verificar se é o maior arquivo
+        if self._larger(file_info, stats.largest_file):
+            stats.largest_file = file_info
+    
+    def _root_placeholder(self, file_info: FileInfo) -> Optional[DirectoryStats]:
+        """
+        Estatísticas vazias se o diretório for outra raiz da análise em lote
+        
+        A raiz aninhada é analisada uma única vez e enxertada depois no
+        lugar do marcador (ver analyzer.batch).
+        """
+        key = (file_info.device, file_info.inode)
+        if key not in self._root_keys:
+            return None
+        
+        placeholder = self._new_stats(file_info.path)
+        self._placeholders[id(placeholder)] = key
+        return placeholder
+    
+    def _mount_boundary(self, file_info: FileInfo) -> Tuple[bool, Optional[DirectoryStats]]:
+        """Decide o que fazer com um diretório de outro sistema de arquivos"""
+        if self._mount_table is None:
+            self._mount_table = read_mount_table()
+        
+        # A tabela usa caminhos canônicos; só resolvemos nas fronteiras
+        real_path = os.path.realpath(file_info.path)
+        mount = self._mount_table.get(real_path)
+        
+        if mount is not None and mount.fs_type in self.skip_fs_types:
+            self.skipped_mounts.append(file_info.path)
+            return False, None
+        
+        if mount is not None and self.mount_usage:
+            stats = self._new_stats(file_info.path)
+            try:
+                stats.total_size, stats.file_count = filesystem_usage(real_path)
+                stats.allocated_size = stats.total_size
+            except OSError as e:
+                self._record_error('stat', file_info.path, e)
+            self.skipped_mounts.append(file_info.path)
+            return False, stats
+        
+        if self.one_file_system:
+            self.skipped_mounts.append(file_info.path)
+            return False, None
+        
+        return True, None
+    
+    def _visit_subdirectory(self, file_info: FileInfo,
+                            device: int) -> Tuple[bool, Optional[DirectoryStats]]:
+        """
+        Decide como tratar um subdiretório antes de descer nele
+        
+        Retorna (descer, substituto). O substituto, quando existe, é
+        agregado no lugar da subárvore: o marcador de uma raiz aninhada
+        da análise em lote ou o uso de uma montagem obtido via statvfs.
+        """
+        if self._root_keys:
+            placeholder = self._root_placeholder(file_info)
+            if placeholder is not None:
+                return False, placeholder
+        
+        # Seguindo links: não percorrer o mesmo diretório duas vezes
+        if self._visited is not None:
+            key = (file_info.device, file_info.inode)
+            if key in self._visited:
+                return False, None
+            self._visited.add(key)
+        
+        if self._check_mounts and file_info.device != device:
+            return self._mount_boundary(file_info)
+        
+        return True, None
+    
+    def _read_directory(self, dir_path: Path, current_depth: int,
+                        stats: Optional[DirectoryStats] = None) -> List[Tuple[Path, FileInfo]]:
+        """
+        Lista um diretório e obtém informações dos itens incluídos
+        
+        Primeira passada da análise de um diretório: aplica exclusões e
+        tamanho mínimo. PermissionError na listagem é propagado.
+        Com fast_listing e stats, os arquivos podem já ser somados em stats
+        (ver _read_directory_fast).
+        """
+        if self.fast_listing:
+            return self._read_directory_fast(dir_path, current_depth, stats)
+        
+        metrics = self.metrics
+        items = self._list_directory(dir_path)
+        if metrics is not None:
+            metrics.incr('entries', len(items))
+        
+        included = []
+        for item in items:
+            # Verificar se deve excluir
+            if self.should_exclude(item):
+                if metrics is not None:
+                    metrics.incr('excluded')
+                continue
+            included.append(item)
+        self._io_operations += len(included) + 1
+        
+        # Obter informações dos itens (um lstat por item ou statx em lote)
+        if self._stat_batch is not None and len(included) >= self._stat_batch.min_batch:
+            infos = self._stat_entries(dir_path, included)
+        else:
+            infos = map(self.get_file_info, included)
+        
+        entries = []
+        for item, file_info in zip(included, infos):
+            if not file_info:
+                continue
+            
+            # Filtrar por tamanho mínimo
+            if self._size_of(file_info) < self.min_size:
+                continue
+            
+            self.total_files_scanned += 1
+            self.total_size_scanned += file_info.size
+            entries.append((item, file_info))
+        
+        if self.progress_callback is not None:
+            queued = 0
+            if current_depth < self.max_depth:
+                queued = sum(1 for _, info in entries if info.is_dir)
+            self._report_progress(str(dir_path), len(items), queued)
+        
+        return entries
+    
+    def _read_directory_fast(self, dir_path: Path, current_depth: int,
+                             stats: Optional[DirectoryStats]) -> List[Tuple[Path, FileInfo]]:
+        """
+        _read_directory sobre os.scandir e lstat relativo ao diretório
+        
+        Só diretórios e links viram Path e FileInfo. Com stats, os demais
+        arquivos são somados direto nele por _add_stat, exceto o maior até
+        agora, que segue como entrada: largest_file fica igual ao da
+        passada normal, em que o primeiro item de maior tamanho vence.
+        """
+        metrics = self.metrics
+        dir_str = str(dir_path)
+        items = self._list_entries(dir_str)
+        if metrics is not None:
+            metrics.incr('entries', len(items))
+        
+        skip_hidden = not self.include_hidden
+        exclude = self.should_exclude if self.exclude_patterns else None
+        names = []
+        for name, _ in items:
+            if (skip_hidden and name[0] == '.') or \
+                    (exclude is not None and exclude(dir_path / name)):
+                if metrics is not None:
+                    metrics.incr('excluded')
+                continue
+            names.append(name)
+        self._io_operations += len(names) + 1
+        
+        bulk = stats is not None and self.file_index is None and not self.calculate_hashes
+        follow_symlinks = self.follow_symlinks
+        use_allocated = self.use_allocated_size
+        min_size = self.min_size
+        entries = []
+        # Maior arquivo até agora: posição reservada em entries, nome e lstat
+        champion, champion_name, champion_stat, champion_size = None, None, None, 0
+        dethroned = False
+        
+        if self.inode_order and len(names) > 1:
+            # stat em ordem de inode, resultados de volta na ordem da listagem
+            inodes = dict(items)
+            by_inode = sorted(range(len(names)), key=lambda index: inodes[names[index]])
+            results = [None] * len(names)
+            ordered = self._stat_names(dir_str, [names[index] for index in by_inode])
+            for index, result in zip(by_inode, ordered):
+                results[index] = result
+        else:
+            results = self._stat_names(dir_str, names)
+        
+        for name, stat_info in zip(names, results):
+            if isinstance(stat_info, OSError):
+                self._record_error('stat', os.path.join(dir_str, name), stat_info)
+                continue
+            
+            mode = stat_info.st_mode
+            if bulk and not stat.S_ISDIR(mode) and not stat.S_ISLNK(mode):
+                size = stat_info.st_blocks * 512 if use_allocated else stat_info.st_size
+                if size < min_size:
+                    continue
+                self.total_files_scanned += 1
+                self.total_size_scanned += stat_info.st_size
+                if champion is not None and size <= champion_size:
+                    self._add_stat(stats, name, stat_info)
+                    continue
+                # Novo maior arquivo: o anterior é somado agora
+                if champion is not None:
+                    self._add_stat(stats, champion_name, champion_stat)
+                    entries[champion] = None
+                    dethroned = True
+                champion, champion_name = len(entries), name
+                champion_stat, champion_size = stat_info, size
+                entries.append(None)
+                continue
+            
+            item = dir_path / name
+            is_symlink = stat.S_ISLNK(mode)
+            if is_symlink and follow_symlinks:
+                file_info = self._get_file_info(item)
+                if not file_info:
+                    continue
+            else:
+                file_info = self._make_file_info(item, stat_info, is_symlink)
+            
+            # Filtrar por tamanho mínimo
+            if self._size_of(file_info) < min_size:
+                continue
+            
+            self.total_files_scanned += 1
+            self.total_size_scanned += file_info.size
+            entries.append((item, file_info))
+        
+        # Só o maior arquivo do diretório vira FileInfo
+        if champion is not None:
+            item = dir_path / champion_name
+            entries[champion] = (item, self._make_file_info(item, champion_stat, False))
+        if dethroned:
+            entries = [entry for entry in entries if entry is not None]
+        
+        if self.progress_callback is not None:
+            queued = 0
+            if current_depth < self.max_depth:
+                queued = sum(1 for _, info in entries if info.is_dir)
+            self._report_progress(dir_str, len(items), queued)
+        
+        return entries
+    
+    def _add_stat(self, stats: DirectoryStats, name: str, stat_info):
+        """_add_file de um arquivo comum direto do resultado do lstat"""
+        size = stat_info.st_size
+        allocated = stat_info.st_blocks * 512
+        stats.total_size += size
+        stats.allocated_size += allocated
+        stats.file_count += 1
+        if size - allocated >= SPARSE_SLACK:
+            stats.sparse_count += 1
+        if self.breakdowns:
+            # Mesmo arredondamento de FileInfo.modified
+            modified = datetime.fromtimestamp(stat_info.st_mtime).timestamp()
+            stats.age_sizes[age_bucket(self.reference_time - modified)] += size
+            uid = stat_info.st_uid
+            stats.owner_sizes[uid] = stats.owner_sizes.get(uid, 0) + size
+        
+        file_type = file_type_of(name)
+        file_types = stats.file_types
+        if file_type in file_types:
+            file_types[file_type] += 1
+            stats.file_type_sizes[file_type] += size
+        else:
+            file_types[file_type] = 1
+            stats.file_type_sizes[file_type] = size
+    
+    def analyze_directory(self, path: str, current_depth: int = 0,
+                          device: Optional[int] = None) -> DirectoryStats:
         """
         Analisa um diretório recursivamente
         
         Args:
             path: Caminho do diretório
             current_depth: Profundidade atual
+            device: st_dev do diretório, se já conhecido
             
         Returns:
             DirectoryStats com informações do diretório
@@ -138,89 +952,155 @@ class DiskUsageAnalyzer:
         if not dir_path.is_dir():
             raise NotADirectoryError(f"Não é um diretório: {path}")
         
+        if self._cancel_event is not None and self._cancel_event.is_set():
+            raise ScanCancelled(f"Análise cancelada em: {path}")
+        
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.incr('syscalls', 2)
+            metrics.enter_directory()
+        
+        spill = self._spill
+        
+        if current_depth == 0:
+            self.errors.set_root(str(dir_path))
+        
+        check_subdirectories = self._check_mounts or self._root_keys or self.follow_symlinks
+        if check_subdirectories and device is None:
+            root_stat = dir_path.stat()
+            device = root_stat.st_dev
+            if self._visited is not None:
+                self._visited.add((device, root_stat.st_ino))
+        
+        progress = self.progress_callback
+        if progress is not None and current_depth == 0:
+            self._start_progress()
+        
         # Inicializar estatísticas
-        stats = DirectoryStats(
-            path=str(dir_path),
-            total_size=0,
-            file_count=0,
-            dir_count=0,
-            largest_file=None,
-            file_types={},
-            children=[]
-        )
+        stats = self._new_stats(str(dir_path))
         
         try:
-            # Listar conteúdo do diretório
-            items = list(dir_path.iterdir())
+            # Primeira passada: listar, filtrar e obter informações dos itens
+            observer = self._io_observer
+            if observer is not None:
+                started, operations = self._io_clock(), self._io_operations
+            entries = self._read_directory(dir_path, current_depth, stats)
+            if observer is not None:
+                observer(self._io_clock() - started, self._io_operations - operations)
             
-            for item in items:
-                # Verificar se deve excluir
-                if self.should_exclude(item):
-                    continue
-                
-                # Obter informações do item
-                file_info = self.get_file_info(item)
-                if not file_info:
-                    continue
-                
-                # Filtrar por tamanho mínimo
-                if file_info.size < self.min_size:
-                    continue
-                
-                self.total_files_scanned += 1
-                self.total_size_scanned += file_info.size
-                
+            # Segunda passada: agregar arquivos e descer nos subdiretórios
+            for item, file_info in entries:
                 if file_info.is_dir:
                     # Diretório - analisar recursivamente se não excedeu profundidade
                     stats.dir_count += 1
                     
                     if current_depth < self.max_depth:
-                        child_stats = self.analyze_directory(str(item), current_depth + 1)
-                        stats.children.append(child_stats)
-                        stats.total_size += child_stats.total_size
-                        stats.file_count += child_stats.file_count
-                        stats.dir_count += child_stats.dir_count
+                        if progress is not None:
+                            self._count_progress(queued=-1)
+                        
+                        # Fronteiras de sistema de arquivos e raízes aninhadas
+                        if check_subdirectories and (self._root_keys or self._visited is not None
+                                                     or file_info.device != device):
+                            descend, substitute = self._visit_subdirectory(file_info, device)
+                            if substitute is not None:
+                                self._merge_child(stats, substitute)
+                            if not descend:
+                                continue
                         
-                        # Atualizar tipos de arquivo
-                        for file_type, count in child_stats.file_types.items():
-                            stats.file_types[file_type] = stats.file_types.get(file_type, 0) + count
+                        child_stats = self.analyze_directory(str(item), current_depth + 1,
+                                                             file_info.device)
+                        self._merge_child(stats, child_stats)
                         
-                        # Verificar se tem o maior arquivo
-                        if child_stats.largest_file:
-                            if not stats.largest_file or child_stats.largest_file.size > stats.largest_file.size:
-                                stats.largest_file = child_stats.largest_file
+                        # Acima do limite: os filhos concluídos vão para o disco
+                        if spill is not None and spill.over_budget():
+                            spill.spill_children(stats, self._placeholders)
                 
                 else:
-                    # Arquivo
-                    stats.file_count += 1
-                    stats.total_size += file_info.size
-                    
-                    # Atualizar tipos de arquivo
-                    file_type = file_info.file_type
-                    stats.file_types[file_type] = stats.file_types.get(file_type, 0) + 1
-                    
-                    # Verificar se é o maior arquivo
-                    if not stats.largest_file or file_info.size > stats.largest_file.size:
-                        stats.largest_file = file_info
+                    self._add_file(stats, file_info)
         
         except PermissionError as e:
-            self.errors.append(f"Sem permissão para acessar {dir_path}: {e}")
+            self._record_error('listdir', dir_path, e)
+        
+        finally:
+            if spill is not None:
+                spill.charge(stats, self.file_index is not None)
+            if metrics is not None:
+                metrics.exit_directory(stats.path)
+            if progress is not None:
+                if current_depth == 0:
+                    self._report_progress(stats.path, done=1, force=True)
+                else:
+                    self._count_progress(done=1)
+            if current_depth == 0:
+                self.close()
         
         return stats
     
+    def analyze_directory_async(self, path: str, max_in_flight: int = 4, executor=None):
+        """
+        Versão assíncrona de analyze_directory (coroutine)
+        
+        As chamadas bloqueantes rodam em um executor limitado a
+        max_in_flight subárvores simultâneas. Ver analyzer.aio.
+        """
+        from .aio import analyze_directory_async
+        return analyze_directory_async(self, path, max_in_flight, executor)
+    
+    def iter_directory_async(self, path: str, max_in_flight: int = 4, executor=None):
+        """Iterador assíncrono das subárvores concluídas; o último item é a raiz"""
+        from .aio import iter_directory_async
+        return iter_directory_async(self, path, max_in_flight, executor)
+    
+    def analyze_roots(self, paths: List[str], max_workers: int = 4) -> Dict[str, DirectoryStats]:
+        """
+        Analisa várias raízes em um único pool de threads
+        
+        Raízes repetidas ou aninhadas (comparadas por st_dev/st_ino, o que
+        cobre bind mounts) são analisadas uma única vez. Ver analyzer.batch.
+        """
+        from .batch import analyze_roots
+        try:
+            return analyze_roots(self, paths, max_workers)
+        finally:
+            self.close()
+    
     def find_large_files(self, stats: DirectoryStats, threshold: int) -> List[FileInfo]:
-        """Encontra arquivos maiores que o threshold"""
-        large_files = []
+        """
+        Encontra arquivos maiores que o threshold
+        
+        Com use_allocated_size, compara e ordena pelo espaço alocado.
+        """
+        large_files = {}
         
         def collect_large_files(directory_stats: DirectoryStats):
-            if directory_stats.largest_file and directory_stats.largest_file.size >= threshold:
-                large_files.append(directory_stats.largest_file)
+            largest = directory_stats.largest_file
+            # O maior arquivo de um diretório se repete nos ancestrais
+            if largest and self._size_of(largest) >= threshold:
+                large_files[largest.path] = largest
             
             for child in directory_stats.children:
                 collect_large_files(child)
         
         collect_large_files(stats)
-        return sorted(large_files, key=lambda x: x.size, reverse=True)
+        return sorted(large_files.values(), key=self._size_of, reverse=True)
+    
+    def measure_data_extents(self, files: List[FileInfo]) -> List[FileInfo]:
+        """
+        Mede os dados reais de arquivos esparsos com SEEK_DATA/SEEK_HOLE
+        
+        Preenche data_size dos arquivos esparsos da lista (os demais são
+        ignorados). Pensado para os maiores candidatos, não para a
+        varredura inteira: cada arquivo custa um open e dois lseek por
+        extent.
+        """
+        for file_info in files:
+            if not file_info.is_sparse:
+                continue
+            try:
+                file_info.data_size = measure_data_size(file_info.path)
+            except OSError as e:
+                self._record_error('stat', file_info.path, e)
+        return files
     
     def find_duplicates(self, stats: DirectoryStats) -> Dict[str, List[FileInfo]]:
         """Encontra arquivos duplicados baseado no hash MD5"""
@@ -239,26 +1119,92 @@ class DiskUsageAnalyzer:
         # Retornar apenas hashes com múltiplos arquivos
         return {h: files for h, files in hash_map.items() if len(files) > 1}
     
+    def errors_of(self, stats: DirectoryStats) -> ErrorLog:
+        """Erros da raiz stats (em analyze_roots) ou os da varredura inteira"""
+        return self.root_errors.get(stats.path, self.errors)
+    
     def get_summary(self, stats: DirectoryStats) -> Dict:
         """Gera resumo da análise"""
+        import humanize
+        
+        errors = self.errors_of(stats)
         return {
             'path': stats.path,
             'total_size': stats.total_size,
             'total_size_human': humanize.naturalsize(stats.total_size),
             'file_count': stats.file_count,
             'dir_count': stats.dir_count,
+            'allocated_size': stats.allocated_size,
+            'allocated_size_human': humanize.naturalsize(stats.allocated_size),
+            'sparse_count': stats.sparse_count,
             'largest_file': {
                 'path': stats.largest_file.path,
                 'size': stats.largest_file.size,
-                'size_human': humanize.naturalsize(stats.largest_file.size)
+                'size_human': humanize.naturalsize(stats.largest_file.size),
+                'allocated': stats.largest_file.allocated
             } if stats.largest_file else None,
             'file_types': stats.file_types,
+            'file_type_sizes': stats.file_type_sizes,
+            'symlink_count': stats.symlink_count,
             'files_scanned': self.total_files_scanned,
             'total_scanned_size': humanize.naturalsize(self.total_size_scanned),
-            'errors_count': len(self.errors)
+            'errors_count': len(errors),
+            'errors_by_errno': dict(errors.top_errnos()),
+            'errors_by_subtree': dict(errors.top_subtrees()),
+            'skipped_mounts': self.skipped_mounts,
+            'spilled_directories': self._spill.spilled_nodes if self._spill is not None else 0,
+            'age_breakdown': age_breakdown(stats),
+            'owner_breakdown': owner_breakdown(stats),
+            'throttle': self.throttle.to_dict() if self.throttle is not None else None,
+            'metrics': self.metrics.to_dict() if self.metrics is not None else None
         }
 
 
+def age_breakdown(stats: DirectoryStats) -> Optional[List[Dict]]:
+    """Bytes por faixa de idade de um diretório (None sem breakdowns)"""
+    if stats.age_sizes is None:
+        return None
+    return [{'label': label, 'bytes': size} for label, size in zip(AGE_LABELS, stats.age_sizes)]
+
+
+def owner_breakdown(stats: DirectoryStats, limit: Optional[int] = None) -> Optional[List[Dict]]:
+    """Bytes por dono de um diretório, do maior para o menor (None sem breakdowns)"""
+    if stats.owner_sizes is None:
+        return None
+    owners = sorted(stats.owner_sizes.items(), key=lambda item: item[1], reverse=True)[:limit]
+    return [{'owner': owner_name(uid), 'uid': uid, 'bytes': size} for uid, size in owners]
+
+
+def measure_data_size(path: str) -> int:
+    """
+    Bytes de dados de um arquivo, excluindo os buracos
+    
+    Percorre os extents com lseek(SEEK_DATA/SEEK_HOLE). Sem suporte no
+    sistema de arquivos, usa o espaço alocado (st_blocks).
+    """
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        end = os.fstat(fd).st_size
+        offset = 0
+        data = 0
+        while offset < end:
+            try:
+                start = os.lseek(fd, offset, os.SEEK_DATA)
+            except OSError as e:
+                if e.errno == errno.ENXIO:
+                    # Só buracos até o fim do arquivo
+                    break
+                if e.errno in (errno.EINVAL, errno.EOPNOTSUPP):
+                    return os.fstat(fd).st_blocks * 512
+                raise
+            hole = os.lseek(fd, start, os.SEEK_HOLE)
+            data += hole - start
+            offset = hole
+        return data
+    finally:
+        os.close(fd)
+
+
 def main():
     """Função principal para teste"""
     analyzer = DiskUsageAnalyzer(
@@ -278,14 +1224,15 @@ def main():
         print(f"Diretórios: {summary['dir_count']}")
         
         if summary['largest_file']:
-            print(f"Maior arquivo: {summary['largest_file']['path']} ({summary['largest_file']['size_human']})")
+            largest = summary['largest_file']
+            print(f"Maior arquivo: {largest['path']} ({largest['size_human']})")
         
         print(f"Arquivos escaneados: {summary['files_scanned']}")
         print(f"Erros: {summary['errors_count']}")
         
         if analyzer.errors:
             print("\n=== Erros ===")
-            for error in analyzer.errors[:5]:  # Mostrar apenas os primeiros 5
+            for error in analyzer.errors[:5]:  # Mostrar apenas 5 exemplos
                 print(f"- {error}")
     
     except Exception as e:
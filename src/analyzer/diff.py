@@ -0,0 +1,285 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Diff Module
+Comparação em fluxo entre duas varreduras
+"""
+
+import heapq
+import json
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Iterator, List, Optional, Tuple
+
+from .serialization import JSONL_FORMAT
+
+
+@dataclass
+class DiffNode:
+    """Um diretório de uma das varreduras comparadas"""
+    path: str
+    parts: Tuple[str, ...]
+    total_size: int
+    file_count: int
+    dir_count: int
+    descendants: Optional[int] = None
+
+
+@dataclass
+class DiffEntry:
+    """Mudança em um diretório entre as duas varreduras"""
+    path: str
+    status: str  # added, removed, grown, shrunk
+    old_size: int
+    new_size: int
+
+    @property
+    def delta(self) -> int:
+        return self.new_size - self.old_size
+
+    def to_dict(self) -> dict:
+        return {
+            'path': self.path,
+            'status': self.status,
+            'old_size': self.old_size,
+            'new_size': self.new_size,
+            'delta': self.delta,
+        }
+
+
+def _parts(path: str, root: str) -> Tuple[str, ...]:
+    relative = path[len(root):].strip('/')
+    return tuple(relative.split('/')) if relative else ()
+
+
+class TreeReader:
+    """
+    Fonte de diretórios em pré-ordem, filhos ordenados por nome
+
+    Subclasses implementam _read() e, se puderem, _skip_raw(n) para
+    descartar n linhas sem decodificá-las.
+    """
+
+    root = ''
+
+    def __init__(self):
+        self._peeked: Optional[DiffNode] = None
+
+    def _read(self) -> Optional[DiffNode]:
+        raise NotImplementedError
+
+    def _skip_raw(self, count: int) -> bool:
+        return False
+
+    def next(self) -> Optional[DiffNode]:
+        if self._peeked is not None:
+            node, self._peeked = self._peeked, None
+            return node
+        return self._read()
+
+    def peek(self) -> Optional[DiffNode]:
+        if self._peeked is None:
+            self._peeked = self._read()
+        return self._peeked
+
+    def skip_subtree(self, node: DiffNode):
+        """Descarta os descendentes de node"""
+        if node.descendants is not None and self._peeked is None \
+                and self._skip_raw(node.descendants):
+            return
+
+        depth = len(node.parts)
+        while True:
+            following = self.peek()
+            if following is None or following.parts[:depth] != node.parts \
+                    or len(following.parts) == depth:
+                return
+            self._peeked = None
+
+    def close(self):
+        pass
+
+
+class JsonlReader(TreeReader):
+    """
+    Lê o export em JSON Lines (analyzer.serialization.write_jsonl)
+
+    Em um export com várias raízes (agente, CLI com várias raízes), root
+    escolhe qual comparar; as anteriores são puladas sem decodificar as
+    linhas. Sem root, chegar a uma segunda raiz levanta ValueError.
+    """
+
+    def __init__(self, f: IO[str], root: Optional[str] = None):
+        super().__init__()
+        self.f = f
+        header = json.loads(f.readline() or '{}')
+        if header.get('format') != JSONL_FORMAT:
+            raise ValueError("Arquivo não é um export JSON Lines do disk-analyzer")
+        while root is not None and header['root'] != root:
+            # Linha da raiz: 'descendants' diz quantas linhas pular até o próximo cabeçalho
+            line = f.readline()
+            self._skip_raw(json.loads(line)['descendants'] if line else 0)
+            header = json.loads(f.readline() or '{}')
+            if 'root' not in header:
+                raise ValueError(f"Raiz não encontrada no export: {root}")
+        self.root = header['root']
+        self._selected = root is not None
+        self._done = False
+
+    def _read(self) -> Optional[DiffNode]:
+        line = '' if self._done else self.f.readline()
+        if not line:
+            return None
+        data = json.loads(line)
+        if 'format' in data:
+            # Cabeçalho da próxima raiz de um export com várias raízes
+            if self._selected:
+                self._done = True
+                return None
+            raise ValueError(f"Export com várias raízes ({self.root}, {data['root']}): "
+                             f"escolha uma com root")
+        return DiffNode(data['path'], _parts(data['path'], self.root), data['total_size'],
+                        data['file_count'], data['dir_count'], data['descendants'])
+
+    def _skip_raw(self, count: int) -> bool:
+        readline = self.f.readline
+        for _ in range(count):
+            readline()
+        return True
+
+    def close(self):
+        self.f.close()
+
+
+class JsonTreeReader(TreeReader):
+    """
+    Lê o export JSON aninhado de export_results
+
+    O formato aninhado precisa ser carregado inteiro; para árvores
+    grandes use o export jsonl, que é lido em fluxo.
+    """
+
+    def __init__(self, f: IO[str], root: Optional[str] = None):
+        super().__init__()
+        data = json.load(f)
+        f.close()
+        if 'roots' in data:
+            trees = [entry['directory_tree'] for entry in data['roots']]
+            if root is None:
+                raise ValueError("Export com várias raízes: escolha uma com root")
+        else:
+            trees = [data['directory_tree']]
+        if root is not None:
+            trees = [tree for tree in trees if tree['path'] == root]
+            if not trees:
+                raise ValueError(f"Raiz não encontrada no export: {root}")
+        tree = trees[0]
+        self.root = tree['path']
+        self._stack = [tree]
+
+    def _read(self) -> Optional[DiffNode]:
+        if not self._stack:
+            return None
+        data = self._stack.pop()
+        self._stack.extend(sorted(data['children'], key=lambda c: Path(c['path']).name,
+                                  reverse=True))
+        return DiffNode(data['path'], _parts(data['path'], self.root), data['total_size'],
+                        data['file_count'], data['dir_count'])
+
+
+class HistoryReader(TreeReader):
+    """Lê uma varredura gravada no histórico (analyzer.history); close() fecha o store"""
+
+    def __init__(self, store, scan_id: int):
+        super().__init__()
+        self.store = store
+        row = store.conn.execute(
+            "SELECT p.path FROM scans s JOIN paths p ON p.id = s.root_id WHERE s.id = ?",
+            (scan_id,)).fetchone()
+        if row is None:
+            raise ValueError(f"Varredura não encontrada: {scan_id}")
+        self.root = row[0]
+        # Trocar '/' por char(1) faz a ordem de texto coincidir com a pré-ordem por nome
+        self._rows = store.conn.execute(
+            "SELECT p.path, m.total_size, m.file_count, m.dir_count "
+            "FROM samples m JOIN paths p ON p.id = m.path_id "
+            "WHERE m.scan_id = ? ORDER BY replace(p.path, '/', char(1))", (scan_id,))
+
+    def _read(self) -> Optional[DiffNode]:
+        row = self._rows.fetchone()
+        if row is None:
+            return None
+        path, total_size, file_count, dir_count = row
+        return DiffNode(path, _parts(path, self.root), total_size, file_count, dir_count)
+
+    def close(self):
+        self._rows.close()
+        self.store.close()
+
+
+def open_tree(source: str, history_db: Optional[str] = None,
+              root: Optional[str] = None) -> TreeReader:
+    """
+    Abre uma varredura para comparação
+
+    source é um export (.json ou .jsonl) ou 'scan:ID' para uma
+    varredura gravada no histórico; root escolhe a raiz de um export
+    com várias raízes.
+    """
+    if source.startswith('scan:'):
+        from .history import ScanHistory
+        store = ScanHistory(history_db)
+        try:
+            return HistoryReader(store, int(source[5:]))
+        except ValueError:
+            store.close()
+            raise
+
+    f = open(source, encoding='utf-8')
+    first = f.readline()
+    f.seek(0)
+    if first.lstrip().startswith('{') and JSONL_FORMAT in first:
+        return JsonlReader(f, root)
+    return JsonTreeReader(f, root)
+
+
+def diff_trees(old: TreeReader, new: TreeReader, threshold: int = 0) -> Iterator[DiffEntry]:
+    """
+    Compara duas varreduras percorrendo as duas em paralelo
+
+    Os caminhos são comparados relativos às raízes, então duas raízes
+    diferentes (ex: um backup) também podem ser comparadas. Subárvores
+    com os mesmos totais nos dois lados são puladas sem descer nelas;
+    diretórios adicionados ou removidos são reportados só no topo.
+    Mudanças menores que threshold são omitidas (mas a descida continua),
+    assim como as que só mudam contagens, sem mudar o tamanho.
+    """
+    a = old.next()
+    b = new.next()
+    while a is not None or b is not None:
+        if a is not None and b is not None and a.parts == b.parts:
+            if (a.total_size == b.total_size and a.file_count == b.file_count
+                    and a.dir_count == b.dir_count):
+                old.skip_subtree(a)
+                new.skip_subtree(b)
+            elif b.total_size != a.total_size and abs(b.total_size - a.total_size) >= threshold:
+                status = 'grown' if b.total_size >= a.total_size else 'shrunk'
+                yield DiffEntry(b.path, status, a.total_size, b.total_size)
+            a = old.next()
+            b = new.next()
+
+        elif b is None or (a is not None and a.parts < b.parts):
+            if a.total_size >= threshold:
+                yield DiffEntry(a.path, 'removed', a.total_size, 0)
+            old.skip_subtree(a)
+            a = old.next()
+
+        else:
+            if b.total_size >= threshold:
+                yield DiffEntry(b.path, 'added', 0, b.total_size)
+            new.skip_subtree(b)
+            b = new.next()
+
+
+def top_changes(entries: Iterator[DiffEntry], limit: int = 50) -> List[DiffEntry]:
+    """As limit maiores mudanças em valor absoluto, sem guardar as demais"""
+    return heapq.nlargest(limit, entries, key=lambda entry: abs(entry.delta))
@@ -0,0 +1,152 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Errors Module
+Coleta limitada de erros da varredura, agregada por errno e subárvore
+"""
+
+import errno as errno_module
+import os
+from dataclasses import dataclass
+from typing import Dict, Iterator, List, Optional
+
+
+# Prefixos das mensagens por operação
+_MESSAGES = {
+    'stat': "Erro acessando",
+    'listdir': "Sem permissão para acessar",
+    'hash': "Erro calculando hash para",
+}
+
+
+@dataclass
+class ScanError:
+    """Registro estruturado de um erro (formatado apenas sob demanda)"""
+    operation: str
+    path: str
+    errno: int
+    strerror: str
+
+    def format(self) -> str:
+        prefix = _MESSAGES.get(self.operation, "Erro em")
+        if self.errno:
+            return f"{prefix} {self.path}: [Errno {self.errno}] {self.strerror}"
+        return f"{prefix} {self.path}: {self.strerror}"
+
+    def __str__(self) -> str:
+        return self.format()
+
+
+def errno_name(code: int) -> str:
+    """Nome simbólico de um errno (ex: 13 -> EACCES)"""
+    return errno_module.errorcode.get(code, 'OTHER' if not code else str(code))
+
+
+class ErrorLog:
+    """
+    Contabiliza erros sem guardar um registro por falha
+
+    Mantém contagens por errno e por subdiretório de primeiro nível
+    abaixo da raiz, e uma amostra de tamanho fixo (reservoir sampling)
+    com exemplos. Iterar ou fatiar devolve as mensagens da amostra.
+    """
+
+    def __init__(self, sample_size: int = 100, seed: Optional[int] = None):
+        self.sample_size = sample_size
+        self.total = 0
+        self.by_errno: Dict[int, int] = {}
+        self.by_subtree: Dict[str, int] = {}
+        self.sample: List[ScanError] = []
+        self._root = ''
+        self._root_prefix = ''
+        self._seed = seed
+        self._rng = None
+
+    @property
+    def root(self) -> str:
+        return self._root
+
+    def set_root(self, root: str):
+        """Define a raiz usada para agrupar erros por subárvore"""
+        self._root = root
+        self._root_prefix = root.rstrip(os.sep) + os.sep
+
+    def _randrange(self, stop: int) -> int:
+        # random só é importado quando a amostra enche
+        if self._rng is None:
+            import random
+            self._rng = random.Random(self._seed)
+        return self._rng.randrange(stop)
+
+    def _subtree(self, path: str) -> str:
+        if self._root_prefix and path.startswith(self._root_prefix):
+            first = path[len(self._root_prefix):].split(os.sep, 1)[0]
+            return self._root_prefix + first
+        return self._root or os.path.dirname(path)
+
+    def record(self, operation: str, path: str, exc: BaseException):
+        """Registra uma falha"""
+        self.total += 1
+        code = getattr(exc, 'errno', None) or 0
+        self.by_errno[code] = self.by_errno.get(code, 0) + 1
+        subtree = self._subtree(path)
+        self.by_subtree[subtree] = self.by_subtree.get(subtree, 0) + 1
+
+        # Reservoir sampling: cada erro tem a mesma chance de ficar na amostra
+        if len(self.sample) < self.sample_size:
+            slot = len(self.sample)
+            self.sample.append(None)
+        else:
+            slot = self._randrange(self.total)
+            if slot >= self.sample_size:
+                return
+
+        strerror = getattr(exc, 'strerror', None) or str(exc)
+        self.sample[slot] = ScanError(operation, path, code, strerror)
+
+    def merge(self, other: 'ErrorLog'):
+        """Incorpora os erros de outro ErrorLog"""
+        for code, count in other.by_errno.items():
+            self.by_errno[code] = self.by_errno.get(code, 0) + count
+        for subtree, count in other.by_subtree.items():
+            self.by_subtree[subtree] = self.by_subtree.get(subtree, 0) + count
+
+        for error in other.sample:
+            self.total += 1
+            if len(self.sample) < self.sample_size:
+                self.sample.append(error)
+            else:
+                slot = self._randrange(self.total)
+                if slot < self.sample_size:
+                    self.sample[slot] = error
+
+        # Erros contados pelo outro log mas fora da sua amostra
+        self.total += other.total - len(other.sample)
+
+    def top_errnos(self, limit: int = 10) -> List[tuple]:
+        """Pares (nome do errno, contagem) mais frequentes"""
+        items = sorted(self.by_errno.items(), key=lambda x: x[1], reverse=True)[:limit]
+        return [(errno_name(code), count) for code, count in items]
+
+    def top_subtrees(self, limit: int = 10) -> List[tuple]:
+        """Pares (subárvore, contagem) com mais erros"""
+        return sorted(self.by_subtree.items(), key=lambda x: x[1], reverse=True)[:limit]
+
+    def to_dict(self, sample_limit: int = 10) -> Dict:
+        """Resumo serializável dos erros"""
+        return {
+            'total': self.total,
+            'by_errno': dict(self.top_errnos(len(self.by_errno))),
+            'by_subtree': dict(self.top_subtrees()),
+            'sample': self[:sample_limit],
+        }
+
+    def __len__(self) -> int:
+        return self.total
+
+    def __iter__(self) -> Iterator[str]:
+        return (error.format() for error in self.sample)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [error.format() for error in self.sample[index]]
+        return self.sample[index].format()
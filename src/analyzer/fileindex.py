@@ -0,0 +1,433 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - File Index
+Índice colunar por arquivo (tamanho, alocado, mtime, uid, gid, diretório,
+extensão e nome), capturado durante a varredura, e consultas sobre ele
+
+Durante a varredura as colunas são arrays compactos da biblioteca padrão.
+Gravado em disco, cada coluna ocupa um intervalo contíguo do arquivo;
+com numpy as colunas são abertas sem cópia (np.frombuffer sobre mmap) e
+filtros e agrupamentos são vetorizados. Sem numpy, as mesmas consultas
+rodam em Python puro.
+"""
+
+import heapq
+import json
+import mmap
+import os
+import struct
+import sys
+import time
+from array import array
+from collections import defaultdict
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from .attributes import AGE_EDGES, AGE_LABELS, age_bucket, group_name, owner_name
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+MAGIC = b'DUAINDEX'
+VERSION = 1
+INDEX_SUFFIX = '.duidx'
+
+# magic, versão, nº de arquivos, offset e tamanho do meta
+HEADER = struct.Struct('<8sIQQQ')
+
+# Colunas numéricas: nome -> typecode do array (little-endian no arquivo)
+COLUMNS = {
+    'size': 'q',
+    'allocated': 'q',
+    'mtime': 'd',
+    'uid': 'I',
+    'gid': 'I',
+    'dir': 'I',
+    'ext': 'I',
+    'name_offsets': 'Q',
+}
+_NUMPY_TYPES = {'q': '<i8', 'd': '<f8', 'I': '<u4', 'Q': '<u8'}
+_NATIVE_TYPES = {'q': 'i8', 'd': 'f8', 'I': 'u4', 'Q': 'u8'}
+
+GROUP_KEYS = ('owner', 'group', 'ext', 'age', 'dir')
+
+
+class FileIndex:
+    """
+    Colunas de todos os arquivos de uma varredura
+
+    add() é chamado pelo analisador para cada arquivo regular; diretórios
+    e extensões são internados (a coluna guarda só o id). Analisadores
+    filhos das varreduras concorrentes têm índices próprios, incorporados
+    com extend().
+    """
+
+    def __init__(self):
+        self.columns = {name: array(typecode) for name, typecode in COLUMNS.items()}
+        self.columns['name_offsets'].append(0)
+        self.names = bytearray()
+        self.dirs: List[str] = []
+        self.extensions: List[str] = []
+        self.root: Optional[str] = None
+        self.timestamp: Optional[float] = None
+        self._dir_ids: Dict[str, int] = {}
+        self._ext_ids: Dict[str, int] = {}
+        self._last_dir = None
+        self._last_dir_id = 0
+        self._mmap = None
+
+    def __len__(self) -> int:
+        return len(self.columns['size'])
+
+    def _dir_id(self, path: str) -> int:
+        dir_id = self._dir_ids.get(path)
+        if dir_id is None:
+            dir_id = self._dir_ids[path] = len(self.dirs)
+            self.dirs.append(path)
+        return dir_id
+
+    def _ext_id(self, extension: str) -> int:
+        ext_id = self._ext_ids.get(extension)
+        if ext_id is None:
+            ext_id = self._ext_ids[extension] = len(self.extensions)
+            self.extensions.append(extension)
+        return ext_id
+
+    def add(self, dir_path: str, file_info):
+        """Acrescenta um arquivo (FileInfo) do diretório dir_path"""
+        # Arquivos do mesmo diretório chegam juntos: evitar o dict
+        if dir_path is not self._last_dir:
+            self._last_dir = dir_path
+            self._last_dir_id = self._dir_id(dir_path)
+
+        columns = self.columns
+        columns['size'].append(file_info.size)
+        columns['allocated'].append(file_info.allocated)
+        columns['mtime'].append(file_info.modified.timestamp())
+        columns['uid'].append(int(file_info.owner))
+        columns['gid'].append(int(file_info.group))
+        columns['dir'].append(self._last_dir_id)
+        columns['ext'].append(self._ext_id(file_info.file_type))
+        self.names += file_info.name.encode('utf-8', 'surrogateescape')
+        columns['name_offsets'].append(len(self.names))
+
+    def extend(self, other: 'FileIndex'):
+        """Incorpora o índice de um analisador filho"""
+        if not len(other):
+            return
+        dir_map = [self._dir_id(path) for path in other.dirs]
+        ext_map = [self._ext_id(extension) for extension in other.extensions]
+        base = len(self.names)
+
+        columns, other_columns = self.columns, other.columns
+        for name in ('size', 'allocated', 'mtime', 'uid', 'gid'):
+            columns[name].extend(other_columns[name])
+        columns['dir'].extend(array('I', (dir_map[d] for d in other_columns['dir'])))
+        columns['ext'].extend(array('I', (ext_map[e] for e in other_columns['ext'])))
+        columns['name_offsets'].extend(
+            array('Q', (base + offset for offset in other_columns['name_offsets'][1:])))
+        self.names += other.names
+        self._last_dir = None
+
+    # Persistência
+
+    def save(self, path: str, root: Optional[str] = None, timestamp: Optional[float] = None):
+        """Grava o índice (escrita atômica); colunas alinhadas em 8 bytes"""
+        self.root = root if root is not None else self.root
+        self.timestamp = timestamp if timestamp is not None else (self.timestamp or time.time())
+
+        layout = {}
+        offset = 0
+        blobs = []
+        for name, column in self.columns.items():
+            data = column
+            if sys.byteorder != 'little':
+                data = array(column.typecode, column)
+                data.byteswap()
+            blob = data.tobytes()
+            layout[name] = [offset, len(column)]
+            blobs.append(blob)
+            offset += len(blob) + (-len(blob) % 8)
+        layout['names'] = [offset, len(self.names)]
+        blobs.append(bytes(self.names))
+
+        meta = json.dumps({
+            'root': self.root,
+            'timestamp': self.timestamp,
+            'dirs': self.dirs,
+            'extensions': self.extensions,
+            'columns': layout,
+        }, ensure_ascii=False).encode('utf-8', 'surrogateescape')
+        data_offset = HEADER.size + len(meta)
+        data_offset += -data_offset % 8
+
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, len(self), HEADER.size, len(meta)))
+            f.write(meta)
+            f.write(b'\0' * (data_offset - f.tell()))
+            for blob in blobs:
+                f.write(blob)
+                f.write(b'\0' * (-len(blob) % 8))
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path: str) -> 'FileIndex':
+        """Abre um índice gravado (com numpy, colunas mapeadas sem cópia)"""
+        with open(path, 'rb') as f:
+            buffer = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        if len(buffer) < HEADER.size:
+            buffer.close()
+            raise ValueError(f"Índice truncado: {path}")
+        magic, version, _, meta_offset, meta_size = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            buffer.close()
+            raise ValueError(f"Arquivo não é um índice do disk-analyzer: {path}")
+        if version != VERSION:
+            buffer.close()
+            raise ValueError(f"Versão de índice não suportada: {version}")
+
+        meta = json.loads(bytes(buffer[meta_offset:meta_offset + meta_size])
+                          .decode('utf-8', 'surrogateescape'))
+        data_offset = meta_offset + meta_size
+        data_offset += -data_offset % 8
+
+        index = cls()
+        index.root = meta['root']
+        index.timestamp = meta['timestamp']
+        index.dirs = meta['dirs']
+        index.extensions = meta['extensions']
+        index._dir_ids = {}
+        index._ext_ids = {extension: i for i, extension in enumerate(index.extensions)}
+        for name, typecode in COLUMNS.items():
+            offset, length = meta['columns'][name]
+            start = data_offset + offset
+            if np is not None:
+                index.columns[name] = np.frombuffer(buffer, _NUMPY_TYPES[typecode], length, start)
+            else:
+                column = array(typecode)
+                column.frombytes(buffer[start:start + length * column.itemsize])
+                if sys.byteorder != 'little':
+                    column.byteswap()
+                index.columns[name] = column
+        offset, length = meta['columns']['names']
+        start = data_offset + offset
+        if np is not None:
+            index.names = memoryview(buffer)[start:start + length]
+            index._mmap = buffer
+        else:
+            index.names = buffer[start:start + length]
+            buffer.close()
+        return index
+
+    def _vectors(self) -> Dict:
+        """Colunas como arrays do numpy (as do arquivo já são; as da varredura viram views)"""
+        vectors = {}
+        for name, column in self.columns.items():
+            if isinstance(column, array):
+                column = np.frombuffer(column, _NATIVE_TYPES[column.typecode]) if len(column) \
+                    else np.zeros(0, _NATIVE_TYPES[column.typecode])
+            vectors[name] = column
+        return vectors
+
+    # Consultas
+
+    def file_path(self, row: int) -> str:
+        """Caminho completo do arquivo na linha row"""
+        offsets = self.columns['name_offsets']
+        name = bytes(self.names[int(offsets[row]):int(offsets[row + 1])])
+        directory = self.dirs[int(self.columns['dir'][row])]
+        return os.path.join(directory, name.decode('utf-8', 'surrogateescape'))
+
+    def _dir_ids_under(self, prefix: str) -> List[int]:
+        prefix = prefix.rstrip(os.sep) or os.sep
+        nested = prefix if prefix.endswith(os.sep) else prefix + os.sep
+        return [i for i, path in enumerate(self.dirs)
+                if path == prefix or path.startswith(nested)]
+
+    def select(self, min_size: Optional[int] = None, max_size: Optional[int] = None,
+               older_than: Optional[float] = None, newer_than: Optional[float] = None,
+               owners: Optional[Iterable[int]] = None, extensions: Optional[Iterable[str]] = None,
+               under: Optional[str] = None, now: Optional[float] = None) -> Sequence[int]:
+        """
+        Linhas que atendem a todos os filtros
+
+        older_than e newer_than são idades em segundos (pela última
+        modificação, relativas a now); owners são uids; extensions como
+        em file_types ('.log', 'no_extension'); under restringe a uma
+        subárvore.
+        """
+        now = time.time() if now is None else now
+        ext_ids = None
+        if extensions is not None:
+            ext_ids = [self._ext_ids[ext] for ext in extensions if ext in self._ext_ids]
+        dir_ids = self._dir_ids_under(under) if under is not None else None
+        owners = list(owners) if owners is not None else None
+
+        if np is not None:
+            return self._select_numpy(min_size, max_size, older_than, newer_than,
+                                      owners, ext_ids, dir_ids, now)
+
+        columns = self.columns
+        conditions = []
+        if min_size is not None:
+            conditions.append((columns['size'], lambda v: v >= min_size))
+        if max_size is not None:
+            conditions.append((columns['size'], lambda v: v <= max_size))
+        if older_than is not None:
+            conditions.append((columns['mtime'], lambda v: v <= now - older_than))
+        if newer_than is not None:
+            conditions.append((columns['mtime'], lambda v: v > now - newer_than))
+        if owners is not None:
+            owner_set = set(owners)
+            conditions.append((columns['uid'], owner_set.__contains__))
+        if ext_ids is not None:
+            ext_set = set(ext_ids)
+            conditions.append((columns['ext'], ext_set.__contains__))
+        if dir_ids is not None:
+            dir_set = set(dir_ids)
+            conditions.append((columns['dir'], dir_set.__contains__))
+
+        rows = range(len(self))
+        for column, accept in conditions:
+            rows = [row for row in rows if accept(column[row])]
+        return rows
+
+    def _select_numpy(self, min_size, max_size, older_than, newer_than,
+                      owners, ext_ids, dir_ids, now):
+        columns = self._vectors()
+        mask = np.ones(len(self), dtype=bool)
+        if min_size is not None:
+            mask &= columns['size'] >= min_size
+        if max_size is not None:
+            mask &= columns['size'] <= max_size
+        if older_than is not None:
+            mask &= columns['mtime'] <= now - older_than
+        if newer_than is not None:
+            mask &= columns['mtime'] > now - newer_than
+        if owners is not None:
+            mask &= np.isin(columns['uid'], owners)
+        if ext_ids is not None:
+            mask &= np.isin(columns['ext'], ext_ids)
+        if dir_ids is not None:
+            mask &= np.isin(columns['dir'], dir_ids)
+        return np.flatnonzero(mask)
+
+    def _labels(self, by: str):
+        if by == 'owner':
+            return owner_name
+        if by == 'group':
+            return group_name
+        if by == 'ext':
+            return self.extensions.__getitem__
+        if by == 'dir':
+            return self.dirs.__getitem__
+        return AGE_LABELS.__getitem__
+
+    def group_by(self, rows: Sequence[int], by: str, now: Optional[float] = None,
+                 limit: Optional[int] = None) -> List[Dict]:
+        """
+        Contagem e bytes das linhas agrupados por owner, group, ext, age ou dir
+
+        Ordenado por bytes (decrescente); faixas de idade ficam na ordem
+        das faixas.
+        """
+        if by not in GROUP_KEYS:
+            raise ValueError(f"Agrupamento desconhecido: {by}")
+        now = time.time() if now is None else now
+
+        if np is not None:
+            totals = self._group_numpy(rows, by, now)
+        else:
+            size = self.columns['size']
+            totals = defaultdict(lambda: [0, 0])
+            if by == 'age':
+                mtime = self.columns['mtime']
+                keys = (age_bucket(now - mtime[row]) for row in rows)
+            else:
+                column = self.columns['uid' if by == 'owner' else 'gid' if by == 'group' else by]
+                keys = (column[row] for row in rows)
+            for key, row in zip(keys, rows):
+                entry = totals[key]
+                entry[0] += 1
+                entry[1] += size[row]
+
+        label = self._labels(by)
+        groups = [
+            {'key': label(key), 'count': count, 'bytes': total}
+            for key, (count, total) in totals.items()
+        ]
+        if by == 'age':
+            groups.sort(key=lambda group: AGE_LABELS.index(group['key']))
+        else:
+            groups.sort(key=lambda group: group['bytes'], reverse=True)
+        return groups[:limit] if limit else groups
+
+    def _group_numpy(self, rows, by: str, now: float) -> Dict[int, List[int]]:
+        columns = self._vectors()
+        rows = np.asarray(rows, dtype=np.intp)
+        sizes = columns['size'][rows]
+        if by == 'age':
+            codes = np.searchsorted(np.asarray(AGE_EDGES, dtype=np.float64),
+                                    now - columns['mtime'][rows], side='right')
+            keys = np.arange(len(AGE_LABELS))
+        elif by in ('ext', 'dir'):
+            codes = columns[by][rows].astype(np.intp)
+            keys = np.arange(len(self.extensions if by == 'ext' else self.dirs))
+        else:
+            keys, codes = np.unique(columns['uid' if by == 'owner' else 'gid'][rows],
+                                    return_inverse=True)
+        counts = np.bincount(codes, minlength=len(keys))
+        # Pesos em float64: exatos até 8 PiB por grupo
+        totals = np.bincount(codes, weights=sizes, minlength=len(keys))
+        present = np.flatnonzero(counts)
+        return {int(keys[i]): [int(counts[i]), int(totals[i])] for i in present}
+
+    def top_files(self, rows: Sequence[int], limit: int = 20) -> List[Dict]:
+        """Os limit maiores arquivos entre as linhas"""
+        columns = self.columns
+        size = columns['size']
+        if np is not None:
+            size = self._vectors()['size']
+            rows = np.asarray(rows, dtype=np.intp)
+            if len(rows) > limit:
+                rows = rows[np.argpartition(size[rows], -limit)[-limit:]]
+            top = rows[np.argsort(size[rows])[::-1]]
+        else:
+            top = heapq.nlargest(limit, rows, key=size.__getitem__)
+
+        return [
+            {
+                'path': self.file_path(row),
+                'size': int(size[row]),
+                'allocated': int(columns['allocated'][row]),
+                'modified': float(columns['mtime'][row]),
+                'owner': owner_name(int(columns['uid'][row])),
+                'group': group_name(int(columns['gid'][row])),
+            }
+            for row in top
+        ]
+
+    def total_size(self, rows: Sequence[int]) -> int:
+        """Soma dos tamanhos das linhas"""
+        if np is not None:
+            return int(self._vectors()['size'][np.asarray(rows, dtype=np.intp)].sum())
+        size = self.columns['size']
+        return sum(size[row] for row in rows)
+
+    def close(self):
+        """Libera o mmap de um índice carregado com numpy"""
+        if self._mmap is not None:
+            self.columns = {}
+            self.names.release()
+            self.names = b''
+            self._mmap.close()
+            self._mmap = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
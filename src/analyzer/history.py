@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - History Module
+Histórico de varreduras em SQLite para consultas de crescimento
+"""
+
+import os
+import sqlite3
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .core import DirectoryStats
+
+
+SCHEMA_VERSION = 1
+
+# Caminhos são internados em `paths`: cada amostra guarda só inteiros.
+# A chave primária (scan_id, path_id) atende a comparação entre duas
+# varreduras; o índice por path_id atende a série de um diretório.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS paths (
+    id INTEGER PRIMARY KEY,
+    path TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS scans (
+    id INTEGER PRIMARY KEY,
+    root_id INTEGER NOT NULL REFERENCES paths(id),
+    started_at REAL NOT NULL,
+    duration REAL,
+    max_depth INTEGER
+);
+CREATE INDEX IF NOT EXISTS scans_root_time ON scans(root_id, started_at);
+CREATE TABLE IF NOT EXISTS samples (
+    scan_id INTEGER NOT NULL REFERENCES scans(id),
+    path_id INTEGER NOT NULL REFERENCES paths(id),
+    total_size INTEGER NOT NULL,
+    file_count INTEGER NOT NULL,
+    dir_count INTEGER NOT NULL,
+    PRIMARY KEY (scan_id, path_id)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS samples_path ON samples(path_id, scan_id);
+"""
+
+
+def default_history_path() -> Path:
+    """Banco de histórico padrão ($XDG_DATA_HOME/disk-analyzer/history.db)"""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(Path.home(), '.local', 'share')
+    return Path(data_home) / 'disk-analyzer' / 'history.db'
+
+
+def _timestamp(value: float) -> str:
+    return datetime.fromtimestamp(value).isoformat(timespec='seconds')
+
+
+class ScanHistory:
+    """
+    Armazena uma linha por diretório por varredura
+
+    Consultas principais: growth() para os diretórios que mais cresceram
+    em uma janela de tempo e size_history() para a série de um caminho.
+    """
+
+    def __init__(self, db_path: Optional[str] = None):
+        self.db_path = str(db_path or default_history_path())
+        if self.db_path != ':memory:':
+            Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self.conn = sqlite3.connect(self.db_path)
+        self.conn.execute("PRAGMA journal_mode=WAL")
+        self.conn.execute("PRAGMA foreign_keys=ON")
+        if self.conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            with self.conn:
+                self.conn.executescript(_SCHEMA)
+                self.conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _path_id(self, path: str) -> Optional[int]:
+        row = self.conn.execute("SELECT id FROM paths WHERE path = ?", (path,)).fetchone()
+        return row[0] if row else None
+
+    def _root_id(self, root: Optional[str]) -> Optional[int]:
+        """Raiz informada ou a da varredura mais recente"""
+        if root is not None:
+            return self._path_id(os.path.abspath(root))
+        row = self.conn.execute(
+            "SELECT root_id FROM scans ORDER BY started_at DESC LIMIT 1").fetchone()
+        return row[0] if row else None
+
+    @staticmethod
+    def _rows(stats: DirectoryStats) -> Iterator[Tuple[str, int, int, int]]:
+        # Caminhos relativos viram absolutos para casar entre execuções
+        absolute = os.path.isabs(stats.path)
+        stack = [stats]
+        while stack:
+            node = stack.pop()
+            path = node.path if absolute else os.path.abspath(node.path)
+            yield path, node.total_size, node.file_count, node.dir_count
+            stack.extend(node.children)
+
+    def record(self, stats: DirectoryStats, started_at: Optional[float] = None,
+               duration: Optional[float] = None, max_depth: Optional[int] = None) -> int:
+        """
+        Grava uma varredura e retorna seu id
+
+        As linhas passam por uma tabela temporária para que o
+        internamento dos caminhos e a inserção das amostras sejam
+        feitos em lote pelo SQLite.
+        """
+        started_at = time.time() if started_at is None else started_at
+        root = stats.path if os.path.isabs(stats.path) else os.path.abspath(stats.path)
+
+        with self.conn:
+            self.conn.execute(
+                "CREATE TEMP TABLE IF NOT EXISTS staging ("
+                "path TEXT, total_size INTEGER, file_count INTEGER, dir_count INTEGER)")
+            self.conn.execute("DELETE FROM staging")
+            self.conn.executemany("INSERT INTO staging VALUES (?, ?, ?, ?)", self._rows(stats))
+            self.conn.execute(
+                "INSERT OR IGNORE INTO paths(path) SELECT path FROM staging")
+
+            cursor = self.conn.execute(
+                "INSERT INTO scans(root_id, started_at, duration, max_depth) VALUES (?, ?, ?, ?)",
+                (self._path_id(root), started_at, duration, max_depth))
+            scan_id = cursor.lastrowid
+
+            # Raízes aninhadas podem repetir caminhos: vale a primeira linha
+            self.conn.execute(
+                "INSERT OR IGNORE INTO samples"
+                "(scan_id, path_id, total_size, file_count, dir_count) "
+                "SELECT ?, p.id, s.total_size, s.file_count, s.dir_count "
+                "FROM staging s JOIN paths p ON p.path = s.path", (scan_id,))
+            self.conn.execute("DELETE FROM staging")
+
+        return scan_id
+
+    def scans(self, root: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Varreduras gravadas, da mais recente para a mais antiga"""
+        query = (
+            "SELECT s.id, p.path, s.started_at, s.duration, s.max_depth, "
+            "(SELECT total_size FROM samples WHERE scan_id = s.id AND path_id = s.root_id) "
+            "FROM scans s JOIN paths p ON p.id = s.root_id"
+        )
+        params: tuple = ()
+        if root is not None:
+            query += " WHERE s.root_id = ?"
+            params = (self._path_id(os.path.abspath(root)),)
+        query += " ORDER BY s.started_at DESC LIMIT ?"
+
+        return [
+            {
+                'id': scan_id,
+                'root': path,
+                'timestamp': _timestamp(started_at),
+                'duration': duration,
+                'max_depth': max_depth,
+                'total_size': total_size,
+            }
+            for scan_id, path, started_at, duration, max_depth, total_size
+            in self.conn.execute(query, params + (limit,))
+        ]
+
+    def growth(self, days: float = 7, root: Optional[str] = None, limit: int = 20,
+               now: Optional[float] = None) -> List[Dict]:
+        """
+        Diretórios que mais cresceram nos últimos days dias
+
+        Compara a primeira e a última varredura da raiz dentro da janela
+        (diretórios novos contam a partir de zero) e ordena pelo
+        crescimento absoluto. bytes_per_day normaliza pelo intervalo real
+        entre as duas varreduras.
+        """
+        root_id = self._root_id(root)
+        if root_id is None:
+            return []
+
+        since = (time.time() if now is None else now) - days * 86400
+        window = self.conn.execute(
+            "SELECT MIN(started_at), MAX(started_at) FROM scans "
+            "WHERE root_id = ? AND started_at >= ?", (root_id, since)).fetchone()
+        if window[0] is None or window[0] == window[1]:
+            return []
+
+        first_id, first_at = self.conn.execute(
+            "SELECT id, started_at FROM scans WHERE root_id = ? AND started_at = ?",
+            (root_id, window[0])).fetchone()
+        last_id, last_at = self.conn.execute(
+            "SELECT id, started_at FROM scans WHERE root_id = ? AND started_at = ?",
+            (root_id, window[1])).fetchone()
+        elapsed_days = (last_at - first_at) / 86400
+
+        rows = self.conn.execute(
+            "SELECT p.path, COALESCE(f.total_size, 0), l.total_size, "
+            "l.total_size - COALESCE(f.total_size, 0) AS delta "
+            "FROM samples l "
+            "LEFT JOIN samples f ON f.scan_id = ? AND f.path_id = l.path_id "
+            "JOIN paths p ON p.id = l.path_id "
+            "WHERE l.scan_id = ? AND delta > 0 "
+            "ORDER BY delta DESC LIMIT ?", (first_id, last_id, limit))
+
+        return [
+            {
+                'path': path,
+                'start_size': start_size,
+                'end_size': end_size,
+                'growth': delta,
+                'bytes_per_day': delta / elapsed_days,
+                'since': _timestamp(first_at),
+                'until': _timestamp(last_at),
+            }
+            for path, start_size, end_size, delta in rows
+        ]
+
+    def size_history(self, path: str, days: Optional[float] = None,
+                     now: Optional[float] = None) -> List[Dict]:
+        """Tamanho de um diretório em cada varredura que o incluiu"""
+        path_id = self._path_id(os.path.abspath(path))
+        if path_id is None:
+            return []
+
+        since = 0.0
+        if days is not None:
+            since = (time.time() if now is None else now) - days * 86400
+
+        rows = self.conn.execute(
+            "SELECT s.started_at, m.total_size, m.file_count, m.dir_count "
+            "FROM samples m JOIN scans s ON s.id = m.scan_id "
+            "WHERE m.path_id = ? AND s.started_at >= ? ORDER BY s.started_at",
+            (path_id, since))
+
+        return [
+            {
+                'timestamp': _timestamp(started_at),
+                'total_size': total_size,
+                'file_count': file_count,
+                'dir_count': dir_count,
+            }
+            for started_at, total_size, file_count, dir_count in rows
+        ]
+
+    def latest_sizes(self, paths: List[str]) -> Dict[str, int]:
+        """Tamanho de cada caminho na última varredura gravada que o incluiu"""
+        sizes = {}
+        # Lotes abaixo do limite de parâmetros do SQLite
+        for start in range(0, len(paths), 500):
+            batch = paths[start:start + 500]
+            rows = self.conn.execute(
+                "SELECT p.path, m.total_size FROM paths p JOIN samples m ON m.path_id = p.id "
+                f"WHERE p.path IN ({','.join('?' * len(batch))}) "
+                "AND m.scan_id = (SELECT max(scan_id) FROM samples WHERE path_id = p.id)",
+                batch)
+            sizes.update(rows)
+        return sizes
+
+    def prune(self, keep_days: float, now: Optional[float] = None) -> int:
+        """Remove varreduras mais antigas que keep_days; retorna quantas"""
+        before = (time.time() if now is None else now) - keep_days * 86400
+        with self.conn:
+            self.conn.execute(
+                "DELETE FROM samples WHERE scan_id IN (SELECT id FROM scans WHERE started_at < ?)",
+                (before,))
+            removed = self.conn.execute("DELETE FROM scans WHERE started_at < ?",
+                                        (before,)).rowcount
+            self.conn.execute(
+                "DELETE FROM paths WHERE id NOT IN (SELECT path_id FROM samples) "
+                "AND id NOT IN (SELECT root_id FROM scans)")
+        return removed
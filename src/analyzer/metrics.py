@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Metrics Module
+Instrumentação opcional das fases da varredura
+"""
+
+import heapq
+from time import perf_counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+
+# Fases medidas durante a varredura
+PHASES = ('listdir', 'stat', 'exclude', 'hash', 'aggregate')
+
+# Contadores expostos
+COUNTERS = ('syscalls', 'entries', 'directories', 'excluded',
+            'permission_errors', 'errors', 'hashed_bytes')
+
+
+class ScanMetrics:
+    """
+    Coleta tempos por fase, contadores e diretórios mais lentos
+
+    O callback opcional recebe (evento, dados) para os eventos
+    'directory' (a cada diretório concluído) e 'scan_complete'.
+    """
+
+    def __init__(self, slowest_limit: int = 10,
+                 callback: Optional[Callable[[str, Dict], None]] = None):
+        self.slowest_limit = slowest_limit
+        self.callback = callback
+        self.phase_seconds: Dict[str, float] = {phase: 0.0 for phase in PHASES}
+        self.phase_calls: Dict[str, int] = {phase: 0 for phase in PHASES}
+        self.counters: Dict[str, int] = {counter: 0 for counter in COUNTERS}
+        self.scan_seconds = 0.0
+        self._slowest: List[Tuple[float, str]] = []
+        self._nested = 0.0
+        self._dir_stack: List[List[float]] = []
+
+    def incr(self, counter: str, amount: int = 1):
+        """Incrementa um contador"""
+        self.counters[counter] += amount
+
+    def timed(self, func: Callable, phase: str, syscalls: int = 0) -> Callable:
+        """
+        Envolve uma função medindo o tempo exclusivo da fase
+
+        Chamadas aninhadas (ex: hash dentro de stat) não são contadas
+        duas vezes: o tempo da fase interna é descontado da externa.
+        """
+        def wrapper(*args, **kwargs):
+            outer_nested = self._nested
+            self._nested = 0.0
+            start = perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                elapsed = perf_counter() - start
+                self.phase_seconds[phase] += elapsed - self._nested
+                self.phase_calls[phase] += 1
+                self.counters['syscalls'] += syscalls
+                self._nested = outer_nested + elapsed
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def enter_directory(self):
+        """Marca o início da varredura de um diretório"""
+        self._dir_stack.append([perf_counter(), 0.0])
+
+    def exit_directory(self, path: str):
+        """Marca o fim de um diretório e registra seu tempo exclusivo"""
+        start, children = self._dir_stack.pop()
+        elapsed = perf_counter() - start
+        own = elapsed - children
+
+        self.counters['directories'] += 1
+        if self._dir_stack:
+            self._dir_stack[-1][1] += elapsed
+        else:
+            self.scan_seconds += elapsed
+
+        if len(self._slowest) < self.slowest_limit:
+            heapq.heappush(self._slowest, (own, path))
+        elif own > self._slowest[0][0]:
+            heapq.heapreplace(self._slowest, (own, path))
+
+        if self.callback:
+            self.callback('directory', {'path': path, 'seconds': own})
+            if not self._dir_stack:
+                self.callback('scan_complete', self.to_dict())
+
+    @property
+    def slowest_directories(self) -> List[Tuple[str, float]]:
+        """Diretórios com maior tempo exclusivo, do mais lento ao mais rápido"""
+        return [(path, seconds) for seconds, path in sorted(self._slowest, reverse=True)]
+
+    def merge(self, other: 'ScanMetrics'):
+        """Soma as métricas de outra varredura a esta"""
+        for phase in PHASES:
+            self.phase_seconds[phase] += other.phase_seconds[phase]
+            self.phase_calls[phase] += other.phase_calls[phase]
+        for counter in COUNTERS:
+            self.counters[counter] += other.counters[counter]
+        self.scan_seconds += other.scan_seconds
+        for item in other._slowest:
+            if len(self._slowest) < self.slowest_limit:
+                heapq.heappush(self._slowest, item)
+            elif item[0] > self._slowest[0][0]:
+                heapq.heapreplace(self._slowest, item)
+
+    def to_dict(self) -> Dict:
+        """Converte as métricas para dict serializável"""
+        return {
+            'scan_seconds': self.scan_seconds,
+            'phase_seconds': dict(self.phase_seconds),
+            'phase_calls': dict(self.phase_calls),
+            'counters': dict(self.counters),
+            'slowest_directories': [
+                {'path': path, 'seconds': seconds}
+                for path, seconds in self.slowest_directories
+            ]
+        }
+
+    def to_prometheus(self, prefix: str = 'disk_analyzer') -> str:
+        """Exporta as métricas no formato texto do Prometheus"""
+        lines = [
+            f"# HELP {prefix}_scan_seconds Duração total da varredura",
+            f"# TYPE {prefix}_scan_seconds gauge",
+            f"{prefix}_scan_seconds {self.scan_seconds:.6f}",
+            f"# HELP {prefix}_phase_seconds Tempo exclusivo gasto por fase",
+            f"# TYPE {prefix}_phase_seconds gauge",
+        ]
+        for phase in PHASES:
+            seconds = self.phase_seconds[phase]
+            lines.append(f'{prefix}_phase_seconds{{phase="{phase}"}} {seconds:.6f}')
+
+        for counter in COUNTERS:
+            lines.append(f"# TYPE {prefix}_{counter}_total counter")
+            lines.append(f"{prefix}_{counter}_total {self.counters[counter]}")
+
+        lines.append(f"# HELP {prefix}_slow_directory_seconds "
+                     f"Diretórios mais lentos (tempo exclusivo)")
+        lines.append(f"# TYPE {prefix}_slow_directory_seconds gauge")
+        for path, seconds in self.slowest_directories:
+            label = _escape_label(path)
+            lines.append(f'{prefix}_slow_directory_seconds{{path="{label}"}} {seconds:.6f}')
+
+        return "\n".join(lines) + "\n"
+
+
+def _escape_label(value: str) -> str:
+    """Escapa um valor de label do Prometheus"""
+    return value.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Mounts Module
+Tabela de montagens e uso de sistemas de arquivos via statvfs
+"""
+
+import os
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Dict, Optional, Tuple
+
+
+# Sistemas de arquivos virtuais: percorrê-los é lento ou não termina
+PSEUDO_FILESYSTEMS = frozenset({
+    'proc', 'sysfs', 'devtmpfs', 'devpts', 'cgroup', 'cgroup2', 'securityfs',
+    'debugfs', 'tracefs', 'pstore', 'bpf', 'configfs', 'fusectl', 'mqueue',
+    'hugetlbfs', 'autofs', 'binfmt_misc', 'efivarfs', 'selinuxfs',
+    'rpc_pipefs', 'nsfs',
+})
+
+MOUNTS_FILE = '/proc/self/mounts'
+SYS_DEV_BLOCK = '/sys/dev/block'
+
+
+@dataclass
+class MountInfo:
+    """Uma entrada da tabela de montagens"""
+    source: str
+    mount_point: str
+    fs_type: str
+    options: str
+
+
+def _unescape(field: str) -> str:
+    # /proc/self/mounts codifica espaço, tab, \n e \ em octal (ex: \040)
+    if '\\' not in field:
+        return field
+    unescaped = field.encode('latin-1').decode('unicode_escape')
+    return unescaped.encode('latin-1').decode('utf-8', 'replace')
+
+
+def read_mount_table(mounts_file: str = MOUNTS_FILE) -> Dict[str, MountInfo]:
+    """
+    Lê a tabela de montagens, indexada pelo ponto de montagem
+
+    Em montagens empilhadas no mesmo ponto vale a última (a visível).
+    Sem /proc (outros sistemas) retorna um dict vazio.
+    """
+    table = {}
+    try:
+        with open(mounts_file, encoding='utf-8', errors='surrogateescape') as f:
+            for line in f:
+                fields = line.split()
+                if len(fields) < 4:
+                    continue
+                mount = MountInfo(
+                    source=_unescape(fields[0]),
+                    mount_point=_unescape(fields[1]),
+                    fs_type=fields[2],
+                    options=fields[3]
+                )
+                table[mount.mount_point] = mount
+    except OSError:
+        pass
+    return table
+
+
+def filesystem_usage(path: str) -> Tuple[int, int]:
+    """
+    Uso de um sistema de arquivos montado, sem percorrê-lo
+
+    Retorna (bytes ocupados, inodes em uso) via statvfs.
+    """
+    st = os.statvfs(path)
+    return (st.f_blocks - st.f_bfree) * st.f_frsize, st.f_files - st.f_ffree
+
+
+@lru_cache(maxsize=256)
+def device_is_rotational(device: int) -> Optional[bool]:
+    """
+    Se o disco de um st_dev é rotacional (HDD), pelo sysfs
+
+    Partições usam a fila do disco pai. None quando não há um
+    dispositivo de bloco local (NFS, tmpfs, overlay) ou fora do Linux.
+    """
+    if not hasattr(os, 'major'):
+        return None
+    base = os.path.join(SYS_DEV_BLOCK, f"{os.major(device)}:{os.minor(device)}")
+    for queue in ('queue', os.path.join('..', 'queue')):
+        try:
+            with open(os.path.join(base, queue, 'rotational'), encoding='ascii') as f:
+                return f.read().strip() == '1'
+        except OSError:
+            continue
+    return None
@@ -0,0 +1,163 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Device Scheduler
+Fila de subárvores agrupada por st_dev, com concorrência por dispositivo
+ajustada pela latência observada (discos rotacionais não são disputados
+por todas as threads; SSD e NFS recebem mais)
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future
+from dataclasses import dataclass, field
+from typing import Callable, Deque, Dict, Optional
+
+from .mounts import device_is_rotational
+
+
+# Latência por operação pode subir até esse fator antes de reduzir o limite
+LATENCY_TOLERANCE = 1.5
+
+# Amostras (diretórios lidos) entre dois ajustes do limite
+ADJUST_EVERY = 8
+
+# Pesos das médias móveis: curta (situação atual) e referência, que
+# acompanha rápido as melhoras e devagar as pioras
+SHORT_ALPHA = 0.3
+BASELINE_RISE = 0.05
+BASELINE_FALL = 0.3
+
+
+@dataclass
+class LatencyGauge:
+    """Médias móveis da latência por operação e o gradiente entre elas"""
+    samples: int = 0
+    short_latency: float = 0.0
+    baseline: float = 0.0
+
+    def update(self, latency: float) -> Optional[float]:
+        """
+        Registra uma amostra; a cada ADJUST_EVERY amostras devolve o gradiente
+
+        O gradiente é 1 com a latência dentro da tolerância e fica entre
+        0.5 e 1 quando a fila do disco cresce; nas demais amostras, None.
+        """
+        if self.samples == 0:
+            self.short_latency = self.baseline = latency
+        else:
+            self.short_latency += SHORT_ALPHA * (latency - self.short_latency)
+            alpha = BASELINE_RISE if latency > self.baseline else BASELINE_FALL
+            self.baseline += alpha * (latency - self.baseline)
+        self.samples += 1
+        if self.samples % ADJUST_EVERY or not self.short_latency:
+            return None
+        return max(0.5, min(1.0, LATENCY_TOLERANCE * self.baseline / self.short_latency))
+
+
+@dataclass
+class DeviceState:
+    """Fila, limite e latência de um dispositivo"""
+    device: int
+    limit: float
+    max_limit: int
+    pending: Deque = field(default_factory=deque)
+    in_flight: int = 0
+    latency: LatencyGauge = field(default_factory=LatencyGauge)
+    tasks_done: int = 0
+
+    def observe(self, latency: float):
+        """Atualiza as médias e, a cada ADJUST_EVERY amostras, o limite"""
+        gradient = self.latency.update(latency)
+        if gradient is None:
+            return
+        if gradient < 1.0:
+            self.limit = max(1.0, self.limit * gradient)
+        else:
+            self.limit = min(float(self.max_limit), self.limit + 1)
+
+
+class DeviceScheduler:
+    """
+    Distribui tarefas de vários dispositivos em um executor
+
+    Cada dispositivo tem no máximo int(limit) tarefas em execução; os
+    dispositivos são atendidos em rodízio, então um disco lento não
+    ocupa as threads que os outros poderiam usar. Discos rotacionais
+    começam com uma tarefa por vez, os demais com duas.
+    """
+
+    def __init__(self, executor: Executor, max_workers: int):
+        self.executor = executor
+        self.max_workers = max_workers
+        self.devices: Dict[int, DeviceState] = {}
+        self._order: Deque[int] = deque()
+        self._in_flight = 0
+        self._lock = threading.Lock()
+
+    def _device(self, device: int) -> DeviceState:
+        state = self.devices.get(device)
+        if state is None:
+            initial = 1 if device_is_rotational(device) else min(2, self.max_workers)
+            state = DeviceState(device=device, limit=float(initial), max_limit=self.max_workers)
+            self.devices[device] = state
+            self._order.append(device)
+        return state
+
+    def submit(self, device: int, func: Callable, *args) -> Future:
+        """Enfileira func(*args) no dispositivo; o Future conclui com o resultado"""
+        future = Future()
+        with self._lock:
+            self._device(device).pending.append((future, func, args))
+            self._dispatch()
+        return future
+
+    def observe(self, device: int, seconds: float, operations: int):
+        """Registra o tempo de operations operações de I/O no dispositivo"""
+        with self._lock:
+            self._device(device).observe(seconds / max(1, operations))
+            self._dispatch()
+
+    def observer(self, device: int) -> Callable[[float, int], None]:
+        """Função observe já ligada a um dispositivo"""
+        return lambda seconds, operations: self.observe(device, seconds, operations)
+
+    def _dispatch(self):
+        # Chamado com o lock: inicia tarefas enquanto houver threads livres
+        idle = 0
+        while self._in_flight < self.max_workers and idle < len(self._order):
+            device = self._order[0]
+            self._order.rotate(-1)
+            state = self.devices[device]
+            if not state.pending or state.in_flight >= int(state.limit):
+                idle += 1
+                continue
+            idle = 0
+            task = state.pending.popleft()
+            try:
+                self.executor.submit(self._run, state, *task)
+            except RuntimeError:
+                # Executor encerrado por erro em outra tarefa: descartar o resto
+                task[0].cancel()
+                for other in self.devices.values():
+                    while other.pending:
+                        other.pending.popleft()[0].cancel()
+                return
+            state.in_flight += 1
+            self._in_flight += 1
+
+    def _run(self, state: DeviceState, future: Future, func: Callable, args):
+        if future.set_running_or_notify_cancel():
+            try:
+                future.set_result(func(*args))
+            except BaseException as e:
+                future.set_exception(e)
+        with self._lock:
+            state.in_flight -= 1
+            state.tasks_done += 1
+            self._in_flight -= 1
+            self._dispatch()
+
+    def limits(self) -> Dict[int, int]:
+        """Limite atual de cada dispositivo"""
+        with self._lock:
+            return {device: int(state.limit) for device, state in self.devices.items()}
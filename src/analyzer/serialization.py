@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Serialization Module
+Conversão de DirectoryStats para JSON e JSON Lines
+"""
+
+import json
+from array import array
+from pathlib import Path
+from typing import IO, Iterator, Optional, Tuple
+
+from .core import DirectoryStats
+
+
+JSONL_FORMAT = 'disk-analyzer-jsonl'
+JSONL_VERSION = 1
+
+
+def serialize_stats(stats: DirectoryStats) -> dict:
+    """Converte DirectoryStats para dict serializável"""
+    return {
+        'path': stats.path,
+        'total_size': stats.total_size,
+        'file_count': stats.file_count,
+        'dir_count': stats.dir_count,
+        'largest_file': {
+            'path': stats.largest_file.path,
+            'size': stats.largest_file.size,
+            'name': stats.largest_file.name
+        } if stats.largest_file else None,
+        'file_types': stats.file_types,
+        'file_type_sizes': stats.file_type_sizes,
+        'symlink_count': stats.symlink_count,
+        'allocated_size': stats.allocated_size,
+        'sparse_count': stats.sparse_count,
+        'age_sizes': list(stats.age_sizes) if stats.age_sizes is not None else None,
+        'owner_sizes': stats.owner_sizes,
+        'children': [serialize_stats(child) for child in stats.children]
+    }
+
+
+def _sorted_children(stats: DirectoryStats):
+    return sorted(stats.children, key=lambda child: Path(child.path).name)
+
+
+def _descendant_counts(stats: DirectoryStats) -> array:
+    """
+    Quantidade de descendentes de cada nó, na pré-ordem de write_jsonl
+
+    Uma passada em pós-ordem (iterativa): a subárvore de um nó ocupa as
+    posições seguintes à dele, então a contagem sai do tamanho do array
+    quando ela termina. Guarda um inteiro por nó, sem caminhos nem nós,
+    e os filhos descarregados para o disco (analyzer.spill) são relidos
+    uma única vez.
+    """
+    counts = array('q')
+    stack = [stats]
+    while stack:
+        node = stack.pop()
+        if isinstance(node, int):
+            # Fim da subárvore do nó na posição node
+            counts[node] = len(counts) - node - 1
+            continue
+        stack.append(len(counts))
+        counts.append(0)
+        stack.extend(reversed(_sorted_children(node)))
+    return counts
+
+
+def write_jsonl(stats: DirectoryStats, f: IO[str], summary: Optional[dict] = None,
+                timestamp: Optional[str] = None):
+    """
+    Grava a árvore em JSON Lines, um diretório por linha
+
+    A primeira linha é um cabeçalho com a raiz. Os diretórios seguem em
+    pré-ordem com os filhos ordenados por nome, e cada linha traz em
+    'descendants' quantas linhas a subárvore ocupa. Assim um leitor pode
+    comparar dois arquivos em paralelo e pular subárvores sem decodificá-las
+    (ver analyzer.diff).
+    """
+    header = {
+        'format': JSONL_FORMAT,
+        'version': JSONL_VERSION,
+        'root': stats.path,
+        'timestamp': timestamp,
+        'summary': summary,
+    }
+    f.write(json.dumps(header, ensure_ascii=False, default=str) + '\n')
+
+    # Mesma pré-ordem da contagem: a linha i usa counts[i]
+    counts = _descendant_counts(stats)
+    stack = [stats]
+    for descendants in counts:
+        node = stack.pop()
+        f.write(json.dumps({
+            'path': node.path,
+            'total_size': node.total_size,
+            'file_count': node.file_count,
+            'dir_count': node.dir_count,
+            'allocated_size': node.allocated_size,
+            'descendants': descendants,
+        }, ensure_ascii=False) + '\n')
+        stack.extend(reversed(_sorted_children(node)))
+
+
+def read_jsonl(f: IO[str]) -> Iterator[Tuple[dict, DirectoryStats]]:
+    """
+    Reconstrói as árvores de um export JSON Lines
+
+    Gera (cabeçalho, raiz) para cada raiz do arquivo. Os totais por
+    diretório são restaurados; maior arquivo e tipos por diretório não
+    fazem parte do formato (o resumo no cabeçalho traz os da raiz).
+    """
+    header = None
+    root = None
+    # (estatísticas, índice da última linha da subárvore)
+    stack = []
+    index = 0
+
+    for line in f:
+        data = json.loads(line)
+        if 'format' in data:
+            if root is not None:
+                yield header, root
+            header, root, stack = data, None, []
+            continue
+
+        index += 1
+        stats = DirectoryStats(
+            path=data['path'],
+            total_size=data['total_size'],
+            file_count=data['file_count'],
+            dir_count=data['dir_count'],
+            largest_file=None,
+            file_types={},
+            children=[],
+            allocated_size=data.get('allocated_size', 0)
+        )
+
+        while stack and stack[-1][1] < index:
+            stack.pop()
+        if stack:
+            stack[-1][0].children.append(stats)
+        else:
+            root = stats
+        stack.append((stats, index + data['descendants']))
+
+    if root is not None:
+        yield header, root
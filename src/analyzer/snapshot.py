@@ -0,0 +1,319 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Snapshot Module
+Snapshot binário de uma varredura, aberto com mmap e lido sob demanda
+
+Layout do arquivo (little-endian):
+
+    cabeçalho   MAGIC, versão, nº de nós, offsets/tamanhos das seções
+    meta        JSON com raiz, timestamp e resumo
+    nós         registros de tamanho fixo (NODE), em largura: os filhos de
+                cada nó ocupam um intervalo contíguo [first_child, +count),
+                ordenados por tamanho decrescente
+    strings     nomes (o nó raiz guarda o caminho completo) e caminhos dos
+                maiores arquivos, em UTF-8; com breakdowns, também os bytes
+                por faixa de idade e os pares (uid, bytes) de cada nó
+
+Abrir o arquivo só lê o cabeçalho e o meta; cada nó é decodificado quando
+acessado, então renderizar os primeiros níveis de uma árvore com dezenas
+de milhões de diretórios não depende do tamanho total.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from array import array
+from collections import deque
+from datetime import datetime
+from pathlib import Path
+from typing import Iterator, List, Optional
+
+from .attributes import AGE_LABELS
+from .core import DirectoryStats, FileInfo, file_type_of
+
+
+MAGIC = b'DUASNAP\x00'
+VERSION = 2
+SNAPSHOT_SUFFIX = '.dusnap'
+
+# magic, versão, nós, offset/tamanho do meta, offset dos nós, offset/tamanho das strings
+HEADER = struct.Struct('<8sIQQQQQQ')
+# total, alocado, arquivos, diretórios, tamanho do maior, mtime do maior,
+# offset do nome, offset do maior, tamanho do nome, tamanho do maior,
+# primeiro filho, nº de filhos, pai, links simbólicos, esparsos,
+# tamanho e offset dos breakdowns (0: sem breakdowns)
+NODE = struct.Struct('<QQQQQdQQIIIIIIIIQ')
+# Versão 1: sem breakdowns
+NODE_V1 = struct.Struct('<QQQQQdQQIIIIIII4x')
+
+# Breakdowns de um nó: bytes por faixa de idade, depois pares (uid, bytes)
+AGES = struct.Struct(f'<{len(AGE_LABELS)}q')
+OWNER = struct.Struct('<Iq')
+
+NO_PARENT = 0xFFFFFFFF
+
+
+def _ordered_children(stats: DirectoryStats) -> List[DirectoryStats]:
+    return sorted(stats.children, key=lambda child: child.total_size, reverse=True)
+
+
+def _pack_breakdowns(stats: DirectoryStats) -> bytes:
+    data = [AGES.pack(*stats.age_sizes)]
+    data.extend(OWNER.pack(uid, size) for uid, size in stats.owner_sizes.items())
+    return b''.join(data)
+
+
+def write_snapshot(stats: DirectoryStats, path: str, summary: Optional[dict] = None,
+                   timestamp: Optional[str] = None) -> int:
+    """
+    Grava a árvore como snapshot binário; retorna o número de nós
+
+    Os nós são gravados em largura à medida que a árvore é percorrida, e
+    as strings vão para um arquivo temporário, então só a fronteira da
+    travessia fica em memória (árvores descarregadas pelo analyzer.spill
+    são relidas um nível por vez).
+    """
+    meta = json.dumps({
+        'root': stats.path,
+        'timestamp': timestamp,
+        'summary': summary,
+    }, ensure_ascii=False, default=str).encode('utf-8')
+
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as out, tempfile.TemporaryFile() as strings:
+        meta_offset = HEADER.size
+        nodes_offset = meta_offset + len(meta)
+        out.write(b'\0' * HEADER.size)
+        out.write(meta)
+
+        string_size = 0
+
+        def add_string(text: str):
+            return add_bytes(text.encode('utf-8', 'surrogateescape'))
+
+        def add_bytes(data: bytes):
+            nonlocal string_size
+            offset = string_size
+            strings.write(data)
+            string_size += len(data)
+            return offset, len(data)
+
+        # (nó, índice do pai); índices atribuídos na ordem da fila
+        queue = deque([(stats, NO_PARENT)])
+        next_index = 1
+        count = 0
+        pack = NODE.pack
+        while queue:
+            node, parent = queue.popleft()
+            children = _ordered_children(node)
+            name = node.path if parent == NO_PARENT else Path(node.path).name
+            name_offset, name_len = add_string(name)
+
+            largest = node.largest_file
+            if largest is not None:
+                largest_offset, largest_len = add_string(largest.path)
+                largest_size, largest_mtime = largest.size, largest.modified.timestamp()
+            else:
+                largest_offset, largest_len, largest_size, largest_mtime = 0, 0, 0, 0.0
+
+            if node.age_sizes is not None:
+                breakdowns_offset, breakdowns_len = add_bytes(_pack_breakdowns(node))
+            else:
+                breakdowns_offset, breakdowns_len = 0, 0
+
+            out.write(pack(node.total_size, node.allocated_size, node.file_count, node.dir_count,
+                           largest_size, largest_mtime, name_offset, largest_offset,
+                           name_len, largest_len, next_index, len(children), parent,
+                           node.symlink_count, node.sparse_count,
+                           breakdowns_len, breakdowns_offset))
+            for child in children:
+                queue.append((child, count))
+            next_index += len(children)
+            count += 1
+
+        strings_offset = out.tell()
+        strings.seek(0)
+        shutil.copyfileobj(strings, out)
+
+        out.seek(0)
+        out.write(HEADER.pack(MAGIC, VERSION, count, meta_offset, len(meta),
+                              nodes_offset, strings_offset, string_size))
+
+    os.replace(tmp_path, path)
+    return count
+
+
+class Snapshot:
+    """
+    Snapshot aberto com mmap
+
+    Nós são acessados pelo índice (0 é a raiz). stats() devolve a raiz
+    como DirectoryStats cujos filhos são decodificados a cada acesso,
+    para usar os mesmos renderizadores da varredura ao vivo.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        buffer = self._mmap
+        if len(buffer) < HEADER.size:
+            self.close()
+            raise ValueError(f"Snapshot truncado: {path}")
+
+        (magic, version, self.node_count, meta_offset, meta_size,
+         self._nodes_offset, self._strings_offset, _) = HEADER.unpack_from(buffer, 0)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"Arquivo não é um snapshot do disk-analyzer: {path}")
+        if version not in (1, VERSION):
+            self.close()
+            raise ValueError(f"Versão de snapshot não suportada: {version}")
+        self._node = NODE if version == VERSION else NODE_V1
+
+        meta = json.loads(bytes(buffer[meta_offset:meta_offset + meta_size]))
+        self.root = meta['root']
+        self.timestamp = meta.get('timestamp')
+        self.summary = meta.get('summary')
+
+    def close(self):
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _record(self, index: int) -> tuple:
+        if not 0 <= index < self.node_count:
+            raise IndexError(f"Nó fora do snapshot: {index}")
+        return self._node.unpack_from(self._mmap, self._nodes_offset + index * self._node.size)
+
+    def _string(self, offset: int, size: int) -> str:
+        start = self._strings_offset + offset
+        return self._mmap[start:start + size].decode('utf-8', 'surrogateescape')
+
+    def children(self, index: int) -> range:
+        """Índices dos filhos de um nó (do maior para o menor)"""
+        record = self._record(index)
+        return range(record[10], record[10] + record[11])
+
+    def node_path(self, index: int) -> str:
+        """Caminho completo de um nó, subindo pelos pais"""
+        parts = []
+        while True:
+            record = self._record(index)
+            parts.append(self._string(record[6], record[8]))
+            if record[12] == NO_PARENT:
+                break
+            index = record[12]
+        return os.path.join(*reversed(parts))
+
+    def largest_files(self, threshold: int, limit: int = 20) -> List[FileInfo]:
+        """Maiores arquivos >= threshold, lendo os registros direto do mmap"""
+        end = self._nodes_offset + self.node_count * self._node.size
+        found = {}
+        # A view precisa ser liberada antes de close() fechar o mmap
+        with memoryview(self._mmap) as view:
+            for record in self._node.iter_unpack(view[self._nodes_offset:end]):
+                # O maior arquivo de um diretório se repete nos ancestrais
+                if record[9] and record[4] >= threshold:
+                    path = self._string(record[7], record[9])
+                    found[path] = (record[4], record[5])
+
+        ordered = sorted(found.items(), key=lambda item: item[1][0], reverse=True)[:limit]
+        return [self._file_info(path, size, mtime) for path, (size, mtime) in ordered]
+
+    @staticmethod
+    def _file_info(path: str, size: int, mtime: float) -> FileInfo:
+        name = os.path.basename(path)
+        return FileInfo(
+            path=path,
+            name=name,
+            size=size,
+            is_dir=False,
+            modified=datetime.fromtimestamp(mtime),
+            permissions='',
+            owner='',
+            group='',
+            file_type=file_type_of(name),
+            # O snapshot não guarda o alocado do arquivo: não marcar como esparso
+            allocated=size
+        )
+
+    def stats(self, index: int = 0, path: Optional[str] = None) -> DirectoryStats:
+        """Nó como DirectoryStats; os filhos são lidos quando percorridos"""
+        record = self._record(index)
+        (total_size, allocated_size, file_count, dir_count, largest_size, largest_mtime,
+         _, largest_offset, _, largest_len, first_child, child_count, _,
+         symlink_count, sparse_count) = record[:15]
+        if path is None:
+            path = self.node_path(index)
+        # Tipos de arquivo só existem no resumo da raiz
+        root_summary = (self.summary or {}) if index == 0 else {}
+
+        largest_file = None
+        if largest_len:
+            largest_file = self._file_info(self._string(largest_offset, largest_len),
+                                           largest_size, largest_mtime)
+
+        stats = DirectoryStats(
+            path=path,
+            total_size=total_size,
+            file_count=file_count,
+            dir_count=dir_count,
+            largest_file=largest_file,
+            file_types=root_summary.get('file_types', {}),
+            file_type_sizes=root_summary.get('file_type_sizes', {}),
+            children=SnapshotChildren(self, first_child, child_count, path),
+            symlink_count=symlink_count,
+            allocated_size=allocated_size,
+            sparse_count=sparse_count
+        )
+        if len(record) > 15 and record[15]:
+            stats.age_sizes, stats.owner_sizes = self._breakdowns(record[16], record[15])
+        return stats
+
+    def _breakdowns(self, offset: int, size: int) -> tuple:
+        start = self._strings_offset + offset
+        ages = array('q', AGES.unpack_from(self._mmap, start))
+        owners = dict(OWNER.iter_unpack(self._mmap[start + AGES.size:start + size]))
+        return ages, owners
+
+
+class SnapshotChildren:
+    """Filhos de um nó do snapshot, decodificados a cada iteração"""
+
+    # Gravados do maior para o menor: os N maiores são um fatiamento
+    ordered = True
+
+    def __init__(self, snapshot: Snapshot, first: int, count: int, parent_path: str):
+        self.snapshot = snapshot
+        self.first = first
+        self.count = count
+        self.parent_path = parent_path
+
+    def __len__(self) -> int:
+        return self.count
+
+    def _child(self, index: int) -> DirectoryStats:
+        record = self.snapshot._record(index)
+        name = self.snapshot._string(record[6], record[8])
+        return self.snapshot.stats(index, os.path.join(self.parent_path, name))
+
+    def __iter__(self) -> Iterator[DirectoryStats]:
+        for index in range(self.first, self.first + self.count):
+            yield self._child(index)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self._child(self.first + i) for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return self._child(self.first + index)
@@ -0,0 +1,257 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Spill Module
+Limite de memória da varredura: subárvores concluídas vão para um SQLite
+temporário e são relidas sob demanda
+"""
+
+import os
+import pickle
+import sqlite3
+import tempfile
+import threading
+import weakref
+from dataclasses import replace
+from typing import Iterable, Iterator, List, Optional, Set
+
+
+# Estimativa do custo em memória de cada nó retido (bytes). Não é exata:
+# serve para decidir quando descarregar, sem percorrer objetos com getsizeof.
+NODE_COST = 400
+FILE_TYPE_COST = 200
+FILE_INFO_COST = 600
+AGE_SIZES_COST = 120
+OWNER_COST = 100
+# Colunas e nome de cada arquivo no FileIndex, que fica em memória até o fim
+FILE_INDEX_COST = 64
+
+
+def node_cost(stats) -> int:
+    """Custo estimado de um DirectoryStats, sem contar os filhos"""
+    cost = NODE_COST + len(stats.path) + FILE_TYPE_COST * len(stats.file_types)
+    if stats.largest_file is not None:
+        cost += FILE_INFO_COST
+    if stats.age_sizes is not None:
+        cost += AGE_SIZES_COST + OWNER_COST * len(stats.owner_sizes)
+    return cost
+
+
+class SpilledChildren:
+    """
+    Lista de filhos parcialmente em disco
+
+    Os filhos já descarregados são relidos do SpillStore a cada iteração
+    (não ficam em memória) e o acesso por índice relê só o filho pedido;
+    os acrescentados depois ficam em pending até o próximo
+    descarregamento. A ordem de inserção é preservada.
+    """
+
+    def __init__(self, store: 'SpillStore', node_id: int, stored: int = 0):
+        self.store = store
+        self.node_id = node_id
+        self.stored = stored
+        self.pending: List = []
+
+    def append(self, stats):
+        self.pending.append(stats)
+
+    def __len__(self) -> int:
+        return self.stored + len(self.pending)
+
+    def __iter__(self) -> Iterator:
+        if self.stored:
+            yield from self.store.load_children(self.node_id)
+        yield from self.pending
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return list(self)[index]
+        if index < 0:
+            index += len(self)
+        if index >= self.stored:
+            return self.pending[index - self.stored]
+        if index < 0:
+            raise IndexError(index)
+        return self.store.load_child(self.node_id, index)
+
+    def __setitem__(self, index: int, stats):
+        # Só os filhos ainda em memória podem ser trocados (ex: enxertos do batch)
+        if index < self.stored:
+            raise IndexError("Filho já descarregado para o disco")
+        self.pending[index - self.stored] = stats
+
+    def __repr__(self) -> str:
+        return f"SpilledChildren(stored={self.stored}, pending={len(self.pending)})"
+
+
+class SpillStore:
+    """
+    Orçamento de memória da varredura e o armazenamento em disco
+
+    O analisador registra cada diretório concluído com charge(). Quando
+    a estimativa passa de memory_limit, os filhos concluídos do diretório
+    em andamento vão para o disco com spill_children(), em lotes de
+    chunk_size linhas, e só os totais do diretório ficam em memória.
+    Compartilhado (com lock) pelos analisadores filhos das varreduras
+    concorrentes; o arquivo é removido quando o store é coletado.
+    """
+
+    def __init__(self, memory_limit: int, directory: Optional[str] = None,
+                 chunk_size: int = 1000):
+        self.memory_limit = memory_limit
+        self.chunk_size = max(1, chunk_size)
+        self.retained = 0
+        # Memória que o descarregamento não libera (FileIndex)
+        self.pinned = 0
+        self.spilled_nodes = 0
+        self._next_id = 0
+        self._lock = threading.Lock()
+
+        fd, self.db_path = tempfile.mkstemp(prefix='disk-analyzer-spill-', suffix='.db',
+                                            dir=directory)
+        os.close(fd)
+        self.conn = sqlite3.connect(self.db_path, check_same_thread=False, isolation_level=None)
+        # Dados temporários: sem journal nem fsync
+        self.conn.execute("PRAGMA journal_mode=OFF")
+        self.conn.execute("PRAGMA synchronous=OFF")
+        # position é o índice entre os irmãos; id é o nó (um nó já
+        # descarregado mantém o id quando ele mesmo é gravado)
+        self.conn.execute(
+            "CREATE TABLE nodes (seq INTEGER PRIMARY KEY, id INTEGER NOT NULL, "
+            "parent INTEGER NOT NULL, position INTEGER NOT NULL, "
+            "children INTEGER NOT NULL, data BLOB NOT NULL)")
+        self.conn.execute("CREATE UNIQUE INDEX nodes_parent ON nodes(parent, position)")
+        self._finalizer = weakref.finalize(self, _remove_store, self.conn, self.db_path)
+
+    def close(self):
+        self._finalizer()
+
+    def charge(self, stats, indexed: bool = False):
+        """Registra um diretório concluído (e seus arquivos no FileIndex) no orçamento"""
+        cost = node_cost(stats)
+        pinned = FILE_INDEX_COST * stats.file_count + len(stats.path) if indexed else 0
+        with self._lock:
+            self.retained += cost
+            self.pinned += pinned
+
+    def over_budget(self) -> bool:
+        return self.retained + self.pinned > self.memory_limit
+
+    def _new_id(self) -> int:
+        self._next_id += 1
+        return self._next_id
+
+    def spill_children(self, stats, keep: Optional[Set[int]] = None) -> bool:
+        """
+        Descarrega os filhos concluídos de stats (e suas subárvores)
+
+        Subárvores que contêm nós de keep (ids de objetos que precisam
+        continuar em memória, como os marcadores do batch) não são
+        descarregadas. Retorna se algo foi para o disco.
+        """
+        with self._lock:
+            children = stats.children
+            if not isinstance(children, SpilledChildren):
+                children = SpilledChildren(self, self._new_id())
+                children.pending = stats.children
+            if not children.pending:
+                return False
+
+            rows = []
+            freed = 0
+            kept = []
+            written = 0
+            for child in children.pending:
+                subtree_rows = []
+                cost = self._collect(child, children.node_id, children.stored + written,
+                                     subtree_rows, keep)
+                if cost is None:
+                    kept.append(child)
+                    continue
+                if kept:
+                    # Preservar a ordem: o que vem depois de um filho mantido fica em memória
+                    kept.append(child)
+                    continue
+                rows.extend(subtree_rows)
+                freed += cost
+                written += 1
+                self.spilled_nodes += len(subtree_rows)
+                if len(rows) >= self.chunk_size:
+                    self._write(rows)
+                    rows = []
+            if rows:
+                self._write(rows)
+
+            if not written:
+                return False
+            children.stored += written
+            children.pending = kept
+            stats.children = children
+            self.retained -= freed
+            return True
+
+    def _collect(self, stats, parent_id: int, position: int, rows: List,
+                 keep: Optional[Set[int]]) -> Optional[int]:
+        """Linhas da subárvore em memória; None se ela contém um nó de keep"""
+        if keep and id(stats) in keep:
+            return None
+
+        children = stats.children
+        if isinstance(children, SpilledChildren):
+            # Já descarregada: os filhos gravados continuam sob o mesmo id
+            node_id, in_memory, stored = children.node_id, children.pending, children.stored
+        else:
+            node_id, in_memory, stored = self._new_id(), children, 0
+
+        # A linha do nó vem antes das dos filhos, com a contagem final
+        index = len(rows)
+        rows.append(None)
+        cost = node_cost(stats)
+        for offset, child in enumerate(in_memory):
+            child_cost = self._collect(child, node_id, stored + offset, rows, keep)
+            if child_cost is None:
+                return None
+            cost += child_cost
+
+        data = pickle.dumps(replace(stats, children=[]), pickle.HIGHEST_PROTOCOL)
+        rows[index] = (node_id, parent_id, position, stored + len(in_memory), data)
+        return cost
+
+    def _write(self, rows: Iterable):
+        self.conn.execute("BEGIN")
+        self.conn.executemany(
+            "INSERT INTO nodes (id, parent, position, children, data) VALUES (?, ?, ?, ?, ?)",
+            rows)
+        self.conn.execute("COMMIT")
+
+    def load_children(self, node_id: int) -> List:
+        """Relê os filhos descarregados de um nó (netos continuam em disco)"""
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, children, data FROM nodes WHERE parent = ? ORDER BY position",
+                (node_id,)).fetchall()
+        return [self._load(*row) for row in rows]
+
+    def load_child(self, node_id: int, position: int):
+        """Relê só o filho descarregado na posição position de um nó"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT id, children, data FROM nodes WHERE parent = ? AND position = ?",
+                (node_id, position)).fetchone()
+        if row is None:
+            raise IndexError(position)
+        return self._load(*row)
+
+    def _load(self, node_id: int, count: int, data: bytes):
+        stats = pickle.loads(data)
+        if count:
+            stats.children = SpilledChildren(self, node_id, count)
+        return stats
+
+
+def _remove_store(conn: sqlite3.Connection, db_path: str):
+    conn.close()
+    try:
+        os.unlink(db_path)
+    except FileNotFoundError:
+        pass
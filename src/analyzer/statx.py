@@ -0,0 +1,324 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Batched Stat Module
+statx em lote para os itens de um diretório: em um pool de threads
+(ctypes e os.stat liberam o GIL durante a chamada) ou, sob pedido
+explícito, via io_uring
+"""
+
+import ctypes
+import errno
+import mmap
+import os
+import struct
+import threading
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Union
+
+try:
+    _libc = ctypes.CDLL(None, use_errno=True)
+except (OSError, TypeError):  # Windows
+    _libc = None
+
+_statx = getattr(_libc, 'statx', None)
+if _statx is not None:
+    _statx.argtypes = [ctypes.c_int, ctypes.c_char_p, ctypes.c_int, ctypes.c_uint, ctypes.c_void_p]
+    _statx.restype = ctypes.c_int
+
+# Campos pedidos ao statx: só o que FileInfo usa (stx_dev vem sempre)
+STATX_TYPE = 0x0001
+STATX_MODE = 0x0002
+STATX_UID = 0x0008
+STATX_GID = 0x0010
+STATX_MTIME = 0x0040
+STATX_INO = 0x0100
+STATX_SIZE = 0x0200
+STATX_BLOCKS = 0x0400
+STATX_MASK = (STATX_TYPE | STATX_MODE | STATX_UID | STATX_GID | STATX_MTIME
+              | STATX_INO | STATX_SIZE | STATX_BLOCKS)
+
+AT_FDCWD = -100
+AT_SYMLINK_NOFOLLOW = 0x100
+STATX_BUFFER_SIZE = 256
+
+# stx_uid, stx_gid, stx_mode, stx_ino, stx_size, stx_blocks, stx_mtime
+# (tv_sec, tv_nsec) e stx_dev_major/minor, do início até o byte 144
+_STATX_FIELDS = struct.Struct('=20xIIH2xQQQ56xqI4x8xII')
+
+# io_uring (os números das syscalls são os mesmos em todas as arquiteturas)
+NR_IO_URING_SETUP = 425
+NR_IO_URING_ENTER = 426
+IORING_OP_STATX = 21
+IORING_ENTER_GETEVENTS = 1
+IORING_OFF_SQ_RING = 0
+IORING_OFF_CQ_RING = 0x8000000
+IORING_OFF_SQES = 0x10000000
+
+# opcode, flags, ioprio, fd, addr2 (buffer), addr (nome), len (máscara),
+# statx_flags, user_data; o restante da SQE fica zerado
+_SQE = struct.Struct('=BBHiQQIIQ24x')
+_CQE = struct.Struct('=QiI')
+_U32 = struct.Struct('=I')
+
+
+class StatxResult(NamedTuple):
+    """Subconjunto de os.stat_result preenchido pelo statx"""
+    st_mode: int
+    st_ino: int
+    st_dev: int
+    st_uid: int
+    st_gid: int
+    st_size: int
+    st_blocks: int
+    st_mtime: float
+
+
+StatOutcome = Union[StatxResult, os.stat_result, OSError]
+
+
+def _parse_statx(buffer, offset: int = 0) -> StatxResult:
+    (uid, gid, mode, ino, size, blocks, sec, nsec,
+     major, minor) = _STATX_FIELDS.unpack_from(buffer, offset)
+    # Mesma conta de os.stat, para st_mtime idêntico
+    return StatxResult(mode, ino, os.makedev(major, minor), uid, gid, size, blocks,
+                       sec + nsec * 1e-9)
+
+
+def _stat_chunk(dir_fd: int, names: List[str]) -> List[StatOutcome]:
+    """lstat relativo a dir_fd de cada nome (statx via ctypes se disponível)"""
+    results = []
+    if _statx is None:
+        for name in names:
+            try:
+                results.append(os.stat(name, dir_fd=dir_fd, follow_symlinks=False))
+            except OSError as e:
+                results.append(e)
+        return results
+
+    buffer = ctypes.create_string_buffer(STATX_BUFFER_SIZE)
+    for name in names:
+        if _statx(dir_fd, os.fsencode(name), AT_SYMLINK_NOFOLLOW, STATX_MASK, buffer) == 0:
+            results.append(_parse_statx(buffer))
+        else:
+            err = ctypes.get_errno()
+            results.append(OSError(err, os.strerror(err), name))
+    return results
+
+
+def _open_directory(dir_path: str) -> int:
+    return os.open(dir_path, os.O_RDONLY | getattr(os, 'O_DIRECTORY', 0))
+
+
+class ThreadedStat:
+    """statx em lotes de chunk_size nomes distribuídos em threads"""
+
+    name = 'threads'
+    # Diretórios menores usam o lstat por item: o lote não compensa
+    min_batch = 16
+
+    def __init__(self, workers: int = 4, chunk_size: int = 64):
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self._executor = None
+        self._lock = threading.Lock()
+
+    def syscalls(self, count: int) -> int:
+        """Chamadas ao kernel para count itens (inclui abrir e fechar o diretório)"""
+        return count + 2
+
+    def stat_many(self, dir_path: str, names: List[str]) -> List[StatOutcome]:
+        """Resultado ou OSError de cada nome, na mesma ordem"""
+        dir_fd = _open_directory(dir_path)
+        try:
+            chunk_size = self.chunk_size
+            if len(names) <= chunk_size or self.workers <= 1:
+                return _stat_chunk(dir_fd, names)
+            executor = self._get_executor()
+            futures = [executor.submit(_stat_chunk, dir_fd, names[start:start + chunk_size])
+                       for start in range(0, len(names), chunk_size)]
+            results = []
+            for future in futures:
+                results.extend(future.result())
+            return results
+        finally:
+            os.close(dir_fd)
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers,
+                                                    thread_name_prefix='disk-analyzer-stat')
+            return self._executor
+
+    def close(self):
+        """Encerra o pool; o próximo lote cria outro"""
+        with self._lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False)
+
+
+def _syscall(number: int, *args) -> int:
+    result = _libc.syscall(ctypes.c_long(number), *(ctypes.c_long(arg) for arg in args))
+    if result < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+    return result
+
+
+class _Ring:
+    """Um io_uring com as filas mapeadas em memória (uso por uma thread)"""
+
+    def __init__(self, entries: int):
+        params = ctypes.create_string_buffer(120)
+        self.fd = _syscall(NR_IO_URING_SETUP, entries, ctypes.addressof(params))
+        self._finalizer = weakref.finalize(self, os.close, self.fd)
+        try:
+            sq_entries, cq_entries = struct.unpack_from('=II', params, 0)
+            sq_head, sq_tail, sq_mask, _, _, _, sq_array = struct.unpack_from('=7I', params, 40)
+            cq_head, cq_tail, cq_mask, _, _, cqes = struct.unpack_from('=6I', params, 80)
+            self.sq_ring = mmap.mmap(self.fd, sq_array + sq_entries * 4, offset=IORING_OFF_SQ_RING)
+            self.cq_ring = mmap.mmap(self.fd, cqes + cq_entries * _CQE.size,
+                                     offset=IORING_OFF_CQ_RING)
+            self.sqes = mmap.mmap(self.fd, sq_entries * _SQE.size, offset=IORING_OFF_SQES)
+        except Exception:
+            self.close()
+            raise
+        self.entries = sq_entries
+        self.sq_tail_offset, self.sq_mask = sq_tail, _U32.unpack_from(self.sq_ring, sq_mask)[0]
+        self.cq_head_offset, self.cq_tail_offset = cq_head, cq_tail
+        self.cq_mask = _U32.unpack_from(self.cq_ring, cq_mask)[0]
+        self.cqes_offset = cqes
+        # Índices da fila de submissão fixos: a posição i usa a SQE i
+        for index in range(sq_entries):
+            _U32.pack_into(self.sq_ring, sq_array + index * 4, index)
+        self.buffers = ctypes.create_string_buffer(STATX_BUFFER_SIZE * sq_entries)
+
+    def statx_many(self, dir_fd: int, names: List[str], flags: int, mask: int) -> List[StatOutcome]:
+        """statx de cada nome relativo a dir_fd, em ondas de até entries SQEs"""
+        results = []
+        buffers_base = ctypes.addressof(self.buffers)
+        for start in range(0, len(names), self.entries):
+            wave = [os.fsencode(name) for name in names[start:start + self.entries]]
+            # Nomes consecutivos terminados em \0 em um único buffer
+            blob = ctypes.create_string_buffer(b'\0'.join(wave) + b'\0')
+            name_address = ctypes.addressof(blob)
+            tail = _U32.unpack_from(self.sq_ring, self.sq_tail_offset)[0]
+            for index, name in enumerate(wave):
+                _SQE.pack_into(self.sqes, ((tail + index) & self.sq_mask) * _SQE.size,
+                               IORING_OP_STATX, 0, 0, dir_fd,
+                               buffers_base + index * STATX_BUFFER_SIZE, name_address,
+                               mask, flags, index)
+                name_address += len(name) + 1
+            # A syscall seguinte serve de barreira entre as SQEs e o tail
+            _U32.pack_into(self.sq_ring, self.sq_tail_offset, (tail + len(wave)) & 0xffffffff)
+
+            codes = self._submit_and_wait(len(wave))
+            for index, code in enumerate(codes):
+                if code == 0:
+                    results.append(_parse_statx(self.buffers, index * STATX_BUFFER_SIZE))
+                else:
+                    results.append(OSError(-code, os.strerror(-code), names[start + index]))
+        return results
+
+    def _submit_and_wait(self, count: int) -> List[int]:
+        """Submete count SQEs e retorna o res de cada uma (por user_data)"""
+        codes = [0] * count
+        to_submit, reaped = count, 0
+        while reaped < count:
+            try:
+                to_submit -= _syscall(NR_IO_URING_ENTER, self.fd, to_submit, count - reaped,
+                                      IORING_ENTER_GETEVENTS, 0, 0)
+            except InterruptedError:
+                pass
+            head = _U32.unpack_from(self.cq_ring, self.cq_head_offset)[0]
+            tail = _U32.unpack_from(self.cq_ring, self.cq_tail_offset)[0]
+            while head != tail:
+                user_data, res, _ = _CQE.unpack_from(
+                    self.cq_ring, self.cqes_offset + (head & self.cq_mask) * _CQE.size)
+                codes[user_data] = res
+                head = (head + 1) & 0xffffffff
+                reaped += 1
+            _U32.pack_into(self.cq_ring, self.cq_head_offset, head)
+        return codes
+
+    def close(self):
+        for name in ('sq_ring', 'cq_ring', 'sqes'):
+            region = getattr(self, name, None)
+            if region is not None:
+                region.close()
+        self._finalizer()
+
+
+class IoUringStat:
+    """
+    statx em lote via io_uring: uma syscall submete e aguarda uma onda
+
+    Cada thread usa o próprio anel (criado na primeira chamada), então
+    a mesma instância serve às varreduras concorrentes.
+    """
+
+    name = 'uring'
+    min_batch = 16
+
+    def __init__(self, entries: int = 256):
+        if _libc is None or not hasattr(_libc, 'syscall') or not hasattr(os, 'makedev'):
+            raise OSError(errno.ENOSYS, "io_uring indisponível nesta plataforma")
+        self.entries = entries
+        self._local = threading.local()
+        self._rings = []
+        self._lock = threading.Lock()
+        # Kernels sem IORING_OP_STATX (< 5.6) ou com io_uring desativado falham aqui
+        result = self._ring().statx_many(AT_FDCWD, ['/'], AT_SYMLINK_NOFOLLOW, STATX_MASK)[0]
+        if isinstance(result, OSError):
+            self.close()
+            raise result
+
+    def _ring(self) -> _Ring:
+        ring = getattr(self._local, 'ring', None)
+        if ring is None:
+            ring = _Ring(self.entries)
+            self._local.ring = ring
+            with self._lock:
+                self._rings.append(ring)
+        return ring
+
+    def syscalls(self, count: int) -> int:
+        """Chamadas ao kernel para count itens (inclui abrir e fechar o diretório)"""
+        return -(-count // self.entries) + 2
+
+    def stat_many(self, dir_path: str, names: List[str]) -> List[StatOutcome]:
+        """Resultado ou OSError de cada nome, na mesma ordem"""
+        dir_fd = _open_directory(dir_path)
+        try:
+            return self._ring().statx_many(dir_fd, names, AT_SYMLINK_NOFOLLOW, STATX_MASK)
+        finally:
+            os.close(dir_fd)
+
+    def close(self):
+        """Fecha os anéis de todas as threads; o próximo lote cria outros"""
+        with self._lock:
+            rings, self._rings = self._rings, []
+            self._local = threading.local()
+        for ring in rings:
+            ring.close()
+
+
+STAT_BACKENDS = ('lstat', 'statx', 'uring', 'threads')
+
+
+def create_stat_backend(name: str, workers: int = 4):
+    """
+    Cria o backend de stat em lote
+
+    'statx' e 'threads' usam o pool de threads; 'uring' exige io_uring
+    (OSError caso contrário). Com o cache quente o io_uring ficou mais
+    lento que o lstat por item em todas as árvores do bench_scan.py (o
+    parse de cada resultado é em Python), por isso só é usado quando pedido.
+    """
+    if name not in STAT_BACKENDS or name == 'lstat':
+        raise ValueError(f"Backend de stat em lote desconhecido: {name}")
+    if name == 'uring':
+        return IoUringStat()
+    return ThreadedStat(workers)
@@ -0,0 +1,261 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Throttle
+Varredura "gentil" para hosts em produção: token buckets para stat por
+segundo e bytes de hash por segundo, recuo automático quando a latência
+das syscalls sobe e prioridade de I/O e de CPU reduzidas
+"""
+
+import ctypes
+import os
+import platform
+import threading
+from functools import lru_cache
+from time import monotonic, perf_counter, sleep
+from typing import Callable, Dict, List, Optional
+
+from .scheduler import LatencyGauge
+
+
+# Fator mínimo sobre as taxas configuradas durante o recuo
+MIN_FACTOR = 1 / 16
+
+# Aumento do fator a cada ajuste com a latência normal
+RECOVERY_STEP = 1 / 8
+
+# Operações somadas em cada amostra de latência (um lstat sozinho é só ruído)
+SAMPLE_OPERATIONS = 64
+
+# Fração de segundo de tokens pedida por vez (lotes de stat são divididos)
+CHUNK_SECONDS = 0.1
+
+# Classes de ioprio_set (linux/ioprio.h)
+IO_CLASSES = {'realtime': 1, 'best-effort': 2, 'idle': 3}
+_IOPRIO_CLASS_SHIFT = 13
+_IOPRIO_WHO_PROCESS = 1
+
+# Número da syscall ioprio_set (a glibc não tem wrapper)
+_SYSCALL_NUMBERS = {
+    'x86_64': 251,
+    'aarch64': 30,
+    'riscv64': 30,
+    'ppc64le': 273,
+    's390x': 282,
+    'i686': 289,
+    'i386': 289,
+}
+
+
+class TokenBucket:
+    """
+    Limite de taxa compartilhado entre threads
+
+    acquire() reserva os tokens na hora e dorme o necessário fora do
+    lock: pedidos simultâneos formam fila pela própria dívida do balde,
+    e um pedido maior que a capacidade só espera mais.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None,
+                 clock: Callable[[], float] = monotonic,
+                 sleep: Callable[[float], None] = sleep):
+        if rate <= 0:
+            raise ValueError(f"Taxa inválida: {rate}")
+        self.rate = float(rate)
+        self.capacity = float(capacity if capacity is not None else rate)
+        self._clock = clock
+        self._sleep = sleep
+        self._tokens = self.capacity
+        self._stamp = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        # Chamado com o lock
+        self._tokens = min(self.capacity, self._tokens + (now - self._stamp) * self.rate)
+        self._stamp = now
+
+    def acquire(self, amount: float) -> float:
+        """Consome amount tokens, esperando se preciso; devolve os segundos esperados"""
+        with self._lock:
+            self._refill(self._clock())
+            self._tokens -= amount
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+        if wait > 0:
+            self._sleep(wait)
+        return wait
+
+    def set_rate(self, rate: float):
+        """Muda a taxa; os tokens acumulados até agora seguem a taxa anterior"""
+        with self._lock:
+            self._refill(self._clock())
+            self.rate = float(rate)
+
+
+class Throttle:
+    """
+    Limites de uma varredura, compartilhados por todas as threads
+
+    stat_rate limita listagens e stat por segundo; hash_rate, os bytes
+    lidos para hash por segundo. Com backoff, a latência por operação é
+    acompanhada como em analyzer.scheduler: quando sobe além da
+    tolerância, as duas taxas são reduzidas (até MIN_FACTOR) e voltam
+    aos poucos quando ela normaliza. Sem stat_rate, o recuo só afeta o
+    hash.
+    """
+
+    def __init__(self, stat_rate: Optional[float] = None, hash_rate: Optional[float] = None,
+                 backoff: bool = True, clock: Callable[[], float] = monotonic,
+                 sleep: Callable[[float], None] = sleep):
+        self.stat_rate = stat_rate
+        self.hash_rate = hash_rate
+        self.backoff = backoff
+        self.stat_bucket = TokenBucket(stat_rate, clock=clock, sleep=sleep) if stat_rate else None
+        self.hash_bucket = TokenBucket(hash_rate, clock=clock, sleep=sleep) if hash_rate else None
+        # Lotes de stat divididos para não esperar segundos de uma vez
+        self.chunk_size = max(16, int(stat_rate * CHUNK_SECONDS)) if stat_rate else None
+        self.factor = 1.0
+        self.latency = LatencyGauge()
+        self._sample_seconds = 0.0
+        self._sample_operations = 0
+        self.waited = 0.0
+        self.backoffs = 0
+        self._lock = threading.Lock()
+        self._local = threading.local()
+
+    def _wait(self, bucket: Optional[TokenBucket], amount: float):
+        if bucket is None:
+            return
+        waited = bucket.acquire(amount)
+        if waited:
+            self._local.waited = getattr(self._local, 'waited', 0.0) + waited
+            with self._lock:
+                self.waited += waited
+
+    def thread_waited(self) -> float:
+        """Segundos esperados pela thread atual (para descontar de medições)"""
+        return getattr(self._local, 'waited', 0.0)
+
+    def stat(self, operations: int = 1):
+        """Espera tokens para operations listagens ou stat"""
+        self._wait(self.stat_bucket, operations)
+
+    def hashed(self, size: int):
+        """Espera tokens para size bytes lidos no cálculo de hash"""
+        self._wait(self.hash_bucket, size)
+
+    def observe(self, seconds: float, operations: int):
+        """Registra o tempo de operations syscalls e ajusta o fator das taxas"""
+        if not self.backoff:
+            return
+        with self._lock:
+            self._sample_seconds += seconds
+            self._sample_operations += operations
+            if self._sample_operations < SAMPLE_OPERATIONS:
+                return
+            gradient = self.latency.update(self._sample_seconds / self._sample_operations)
+            self._sample_seconds, self._sample_operations = 0.0, 0
+            if gradient is None:
+                return
+            if gradient < 1.0:
+                factor = max(MIN_FACTOR, self.factor * gradient)
+                self.backoffs += 1
+            else:
+                factor = min(1.0, self.factor + RECOVERY_STEP)
+            if factor == self.factor:
+                return
+            self.factor = factor
+        if self.stat_bucket is not None:
+            self.stat_bucket.set_rate(self.stat_rate * factor)
+        if self.hash_bucket is not None:
+            self.hash_bucket.set_rate(self.hash_rate * factor)
+
+    def wrap(self, func: Callable, operations: int = 1) -> Callable:
+        """func com tokens de stat antes de cada chamada e a latência medida"""
+        def wrapper(*args, **kwargs):
+            self.stat(operations)
+            started = perf_counter()
+            waited = self.thread_waited()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                # Esperas aninhadas (hash dentro do stat) não são latência
+                self.observe(perf_counter() - started - (self.thread_waited() - waited), operations)
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def wrap_batch(self, func: Callable) -> Callable:
+        """func(dir_path, itens) -> lista, em pedaços de até chunk_size itens"""
+        def wrapper(dir_path, items: List) -> List:
+            chunk_size = self.chunk_size or max(1, len(items))
+            results = []
+            for start in range(0, len(items), chunk_size):
+                chunk = items[start:start + chunk_size]
+                self.stat(len(chunk))
+                started = perf_counter()
+                waited = self.thread_waited()
+                results.extend(func(dir_path, chunk))
+                self.observe(perf_counter() - started - (self.thread_waited() - waited), len(chunk))
+            return results
+
+        wrapper.__wrapped__ = func
+        return wrapper
+
+    def to_dict(self) -> Dict:
+        """Configuração e estado para o resumo"""
+        return {
+            'stat_rate': self.stat_rate,
+            'hash_rate': self.hash_rate,
+            'factor': round(self.factor, 3),
+            'backoffs': self.backoffs,
+            'waited_seconds': round(self.waited, 3)
+        }
+
+
+@lru_cache(maxsize=None)
+def _load_ioprio_set():
+    # Procurado na primeira chamada: importar o módulo não carrega a libc
+    if platform.system() != 'Linux':
+        return None
+    number = _SYSCALL_NUMBERS.get(platform.machine())
+    if number is None:
+        return None
+    try:
+        libc = ctypes.CDLL(None, use_errno=True)
+    except OSError:
+        return None
+    syscall = libc.syscall
+    syscall.restype = ctypes.c_long
+
+    def ioprio_set(which, who, ioprio):
+        return syscall(ctypes.c_long(number), ctypes.c_int(which), ctypes.c_int(who),
+                       ctypes.c_int(ioprio))
+    return ioprio_set
+
+
+def io_priority_available() -> bool:
+    """Se ioprio_set existe nesta plataforma"""
+    return _load_ioprio_set() is not None
+
+
+def set_io_priority(io_class: str = 'idle', level: int = 7):
+    """
+    Prioridade de I/O da thread atual (ioprio_set), herdada pelas threads criadas depois
+
+    'idle' só usa o disco quando ninguém mais usa; em 'best-effort',
+    level vai de 0 (maior) a 7 (menor). Requer um escalonador de I/O que
+    respeite prioridades (BFQ, CFQ). Levanta OSError sem suporte.
+    """
+    if io_class not in IO_CLASSES:
+        raise ValueError(f"Classe de I/O desconhecida: {io_class}")
+    ioprio_set = _load_ioprio_set()
+    if ioprio_set is None:
+        raise OSError(f"ioprio_set indisponível em {platform.system()}/{platform.machine()}")
+    data = 0 if io_class == 'idle' else max(0, min(7, level))
+    if ioprio_set(_IOPRIO_WHO_PROCESS, 0, IO_CLASSES[io_class] << _IOPRIO_CLASS_SHIFT | data) < 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def lower_cpu_priority(increment: int = 10) -> int:
+    """Aumenta o nice da thread atual (herdado pelas threads criadas depois)"""
+    return os.nice(increment)
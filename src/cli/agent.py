@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Agent
+Varre o host local e envia o snapshot para um collector (disk-analyzer-web)
+"""
+
+import gzip
+import io
+import socket
+import sys
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+# Adicionar o diretório src ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.serialization import write_jsonl
+from cli.main import configure_throttle, parse_size
+
+
+def build_snapshot(analyzer: DiskUsageAnalyzer, results: dict, host: str,
+                   large_file_threshold: int) -> bytes:
+    """Export jsonl comprimido de todas as raízes, com o resumo de cada uma"""
+    import humanize
+    
+    timestamp = datetime.now().isoformat()
+    buffer = io.BytesIO()
+    with gzip.GzipFile(fileobj=buffer, mode='wb') as raw:
+        f = io.TextIOWrapper(raw, encoding='utf-8')
+        # Raízes repetidas apontam para o mesmo objeto
+        for stats in {id(stats): stats for stats in results.values()}.values():
+            summary = analyzer.get_summary(stats)
+            summary['host'] = host
+            summary['errors'] = analyzer.errors_of(stats).to_dict()
+            summary['large_files'] = [
+                {
+                    'path': file_info.path,
+                    'name': file_info.name,
+                    'size': file_info.size,
+                    'size_human': humanize.naturalsize(file_info.size),
+                    'modified': file_info.modified.isoformat()
+                }
+                for file_info in analyzer.find_large_files(stats, large_file_threshold)[:20]
+            ]
+            write_jsonl(stats, f, summary=summary, timestamp=timestamp)
+        f.flush()
+        f.detach()
+    return buffer.getvalue()
+
+
+def send_snapshot(collector: str, host: str, snapshot: bytes, token: str = None,
+                  timeout: float = 60) -> dict:
+    """Envia o snapshot para POST /api/ingest do collector"""
+    import json
+    
+    url = collector.rstrip('/') + '/api/ingest?' + urllib.parse.urlencode({'host': host})
+    headers = {'Content-Type': 'application/gzip'}
+    if token:
+        headers['X-Agent-Token'] = token
+    req = urllib.request.Request(url, data=snapshot, headers=headers, method='POST')
+    with urllib.request.urlopen(req, timeout=timeout) as response:
+        return json.loads(response.read().decode('utf-8'))
+
+
+@click.command()
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
+@click.option('--collector', required=True, help='URL do collector (ex: http://collector:8080)')
+@click.option('--host-name', default=socket.gethostname, help='Nome deste host na frota')
+@click.option('--token', envvar='DISK_ANALYZER_AGENT_TOKEN', help='Token exigido pelo collector')
+@click.option('--interval', default=0, help='Segundos entre varreduras (0: uma vez e sair)')
+@click.option('--max-depth', default=10, help='Profundidade máxima de análise')
+@click.option('--exclude', multiple=True, help='Padrões para excluir (ex: *.tmp)')
+@click.option('--include-hidden', is_flag=True, help='Incluir arquivos ocultos')
+@click.option('--large-files', default='100MB', help='Arquivos grandes enviados no resumo')
+@click.option('-x', '--one-file-system', is_flag=True,
+              help='Não atravessar para outros sistemas de arquivos')
+@click.option('--workers', default=4, help='Threads compartilhadas entre as raízes')
+@click.option('--nice', is_flag=True,
+              help='Modo gentil: taxa de stat limitada, I/O idle, nice e recuo automático')
+@click.option('--max-stat-rate', type=int, help='Máximo de listagens e stat por segundo')
+@click.option('--io-class', type=click.Choice(['idle', 'best-effort']),
+              help='Classe de prioridade de I/O do processo (ioprio)')
+def agent(paths, collector, host_name, token, interval, max_depth, exclude, include_hidden,
+          large_files, one_file_system, workers, nice, max_stat_rate, io_class):
+    """
+    🛰️ Varre este host e envia o snapshot para o collector
+
+    O collector é o disk-analyzer-web, que guarda o último snapshot de
+    cada host e serve os painéis em /api/fleet.
+
+    Exemplos:
+
+    disk-analyzer-agent /var /home --collector http://collector:8080
+
+    disk-analyzer-agent / -x --interval 3600 --collector http://collector:8080
+    
+    disk-analyzer-agent /srv --nice --interval 900 --collector http://collector:8080
+    """
+    paths = list(paths) or ['/']
+    threshold = parse_size(large_files)
+    # Um único throttle: o recuo vale entre uma varredura e a próxima
+    throttle = None
+    if nice or max_stat_rate or io_class:
+        throttle = configure_throttle(nice, max_stat_rate, io_class=io_class)
+    
+    while True:
+        analyzer = DiskUsageAnalyzer(
+            max_depth=max_depth,
+            exclude_patterns=list(exclude),
+            include_hidden=include_hidden,
+            one_file_system=one_file_system,
+            throttle=throttle
+        )
+        started_at = time.monotonic()
+        results = analyzer.analyze_roots(paths, workers)
+        snapshot = build_snapshot(analyzer, results, host_name, threshold)
+        
+        try:
+            reply = send_snapshot(collector, host_name, snapshot, token)
+            click.echo(f"{host_name}: {len(reply.get('roots', []))} raiz(es) enviada(s), "
+                       f"{len(snapshot):,} bytes em {time.monotonic() - started_at:.1f}s", err=True)
+        except (urllib.error.URLError, OSError) as e:
+            click.echo(f"Erro enviando snapshot para {collector}: {e}", err=True)
+            if not interval:
+                sys.exit(1)
+        
+        if not interval:
+            return
+        time.sleep(interval)
+
+
+if __name__ == '__main__':
+    agent()
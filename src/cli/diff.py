@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Diff CLI
+Compara duas varreduras: exports (.json/.jsonl) ou varreduras do histórico
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import click
+
+# Adicionar o diretório src ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzer.diff import diff_trees, open_tree, top_changes
+from cli.main import get_console, naturalsize, parse_size
+
+
+_STATUS_STYLE = {
+    'added': ("➕", "green"),
+    'removed': ("➖", "red"),
+    'grown': ("📈", "yellow"),
+    'shrunk': ("📉", "cyan"),
+}
+
+
+@click.command()
+@click.argument('old')
+@click.argument('new')
+@click.option('--threshold', default='1MB', help='Mudança mínima para reportar (ex: 100MB)')
+@click.option('--limit', default=50, help='Máximo de mudanças exibidas (as maiores)')
+@click.option('--db', 'db_path', help='Banco de histórico para fontes scan:ID')
+@click.option('--root',
+              help='Raiz a comparar em exports com várias raízes (ex: snapshots do agente)')
+@click.option('--json', 'json_output', is_flag=True, help='Saída em JSON')
+def diff(old, new, threshold, limit, db_path, root, json_output):
+    """
+    🔀 Mostra o que mudou entre duas varreduras
+
+    OLD e NEW são exports (--export jsonl é lido em fluxo; json é
+    carregado inteiro) ou scan:ID de uma varredura do histórico.
+
+    Exemplos:
+
+    disk-analyzer-diff ontem.jsonl hoje.jsonl --threshold 500MB
+
+    disk-analyzer-diff scan:41 scan:42
+
+    disk-analyzer-diff web01-ontem.jsonl web01-hoje.jsonl --root /var
+    """
+    threshold_bytes = parse_size(threshold)
+
+    try:
+        old_tree = open_tree(old, db_path, root)
+        new_tree = open_tree(new, db_path, root)
+    except (OSError, ValueError) as e:
+        click.echo(f"Erro abrindo varredura: {e}", err=True)
+        sys.exit(1)
+
+    try:
+        changes = top_changes(diff_trees(old_tree, new_tree, threshold_bytes), limit)
+    except ValueError as e:
+        click.echo(f"Erro comparando varreduras: {e}", err=True)
+        sys.exit(1)
+    finally:
+        old_tree.close()
+        new_tree.close()
+
+    if json_output:
+        click.echo(json.dumps([change.to_dict() for change in changes], ensure_ascii=False))
+        return
+
+    console = get_console()
+    if not changes:
+        console.print(f"[green]Nenhuma mudança acima de {threshold}[/green]")
+        return
+
+    from rich.table import Table
+    table = Table(title=f"🔀 {old_tree.root} → {new_tree.root}", show_header=True,
+                  header_style="bold magenta")
+    table.add_column("", no_wrap=True)
+    table.add_column("Diretório", style="cyan")
+    table.add_column("Antes", justify="right")
+    table.add_column("Depois", justify="right")
+    table.add_column("Diferença", justify="right")
+    for change in changes:
+        icon, style = _STATUS_STYLE[change.status]
+        sign = "+" if change.delta >= 0 else "-"
+        table.add_row(icon, change.path, naturalsize(change.old_size), naturalsize(change.new_size),
+                      f"[{style}]{sign}{naturalsize(abs(change.delta))}[/{style}]")
+    console.print(table)
+
+
+if __name__ == '__main__':
+    diff()
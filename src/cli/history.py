@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - History CLI
+Consultas ao histórico de varreduras (gravado com disk-analyzer --record)
+"""
+
+import json
+import sys
+from pathlib import Path
+
+import click
+
+# Adicionar o diretório src ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzer.history import ScanHistory
+from cli.main import get_console, naturalsize
+
+
+def _echo_json(data):
+    click.echo(json.dumps(data, ensure_ascii=False))
+
+
+@click.group()
+@click.option('--db', 'db_path',
+              help='Banco de histórico (padrão: ~/.local/share/disk-analyzer/history.db)')
+@click.pass_context
+def history(ctx, db_path):
+    """
+    📈 Consulta o histórico de varreduras
+
+    Exemplos:
+
+    disk-analyzer-history growth --days 7      # Quem mais cresceu na semana
+
+    disk-analyzer-history trend /var/log       # Tamanho ao longo do tempo
+    """
+    ctx.obj = ScanHistory(db_path)
+    ctx.call_on_close(ctx.obj.close)
+
+
+@history.command()
+@click.option('--root', help='Raiz das varreduras (padrão: a mais recente)')
+@click.option('--limit', default=20, help='Máximo de varreduras')
+@click.option('--json', 'json_output', is_flag=True, help='Saída em JSON')
+@click.pass_obj
+def scans(store, root, limit, json_output):
+    """Lista as varreduras gravadas"""
+    rows = store.scans(root, limit)
+    if json_output:
+        _echo_json(rows)
+        return
+
+    from rich.table import Table
+    table = Table(title="🗂️ Varreduras", show_header=True, header_style="bold magenta")
+    table.add_column("ID", justify="right")
+    table.add_column("Data", style="cyan")
+    table.add_column("Raiz")
+    table.add_column("Tamanho", style="green", justify="right")
+    for row in rows:
+        table.add_row(str(row['id']), row['timestamp'], row['root'],
+                      naturalsize(row['total_size'] or 0))
+    get_console().print(table)
+
+
+@history.command()
+@click.option('--days', default=7.0, help='Janela em dias')
+@click.option('--root', help='Raiz das varreduras (padrão: a mais recente)')
+@click.option('--limit', default=20, help='Máximo de diretórios')
+@click.option('--json', 'json_output', is_flag=True, help='Saída em JSON')
+@click.pass_obj
+def growth(store, days, root, limit, json_output):
+    """Diretórios que mais cresceram na janela"""
+    rows = store.growth(days, root, limit)
+    if json_output:
+        _echo_json(rows)
+        return
+
+    if not rows:
+        get_console().print("[yellow]São necessárias ao menos duas varreduras na janela[/yellow]")
+        return
+
+    from rich.table import Table
+    table = Table(title=f"📈 Crescimento ({rows[0]['since']} → {rows[0]['until']})",
+                  show_header=True, header_style="bold magenta")
+    table.add_column("Diretório", style="cyan")
+    table.add_column("Crescimento", style="red", justify="right")
+    table.add_column("Por dia", style="yellow", justify="right")
+    table.add_column("Tamanho", style="green", justify="right")
+    for row in rows:
+        table.add_row(row['path'], f"+{naturalsize(row['growth'])}",
+                      naturalsize(row['bytes_per_day']), naturalsize(row['end_size']))
+    get_console().print(table)
+
+
+@history.command()
+@click.argument('path')
+@click.option('--days', type=float, help='Janela em dias (padrão: todo o histórico)')
+@click.option('--json', 'json_output', is_flag=True, help='Saída em JSON')
+@click.pass_obj
+def trend(store, path, days, json_output):
+    """Tamanho de um diretório ao longo do tempo"""
+    rows = store.size_history(path, days)
+    if json_output:
+        _echo_json(rows)
+        return
+
+    if not rows:
+        get_console().print(f"[yellow]Sem histórico para {path}[/yellow]")
+        return
+
+    console = get_console()
+    peak = max(row['total_size'] for row in rows) or 1
+    for row in rows:
+        bar = "█" * max(1, int(row['total_size'] / peak * 40))
+        size = naturalsize(row['total_size'])
+        console.print(f"{row['timestamp']}  [green]{size:>10}[/green]  {bar}")
+
+
+@history.command()
+@click.option('--keep-days', default=90.0, help='Manter varreduras dos últimos N dias')
+@click.pass_obj
+def prune(store, keep_days):
+    """Remove varreduras antigas"""
+    removed = store.prune(keep_days)
+    click.echo(f"{removed} varredura(s) removida(s)")
+
+
+if __name__ == '__main__':
+    history()
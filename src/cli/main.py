@@ -2,35 +2,71 @@
 """
 Disk Usage Analyzer - CLI Interface
 Interface de linha de comando com Rich para visualização
+
+O rich e o humanize são importados sob demanda: o caminho --quiet/--json,
+usado em cron, não carrega nenhum dos dois para reduzir o tempo de início.
 """
 
 import click
 import os
 import sys
+import time
+from datetime import datetime
 from pathlib import Path
-from rich.console import Console
-from rich.tree import Tree
-from rich.table import Table
-from rich.progress import Progress, SpinnerColumn, TextColumn
-from rich.panel import Panel
-from rich.columns import Columns
-from rich.text import Text
-import humanize
+from typing import TYPE_CHECKING
 
 # Adicionar o diretório src ao path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from analyzer.core import DiskUsageAnalyzer, DirectoryStats
+from analyzer.metrics import ScanMetrics
+from cli.profiling import ScanProfiler
+
+if TYPE_CHECKING:
+    from rich.table import Table
+    from rich.tree import Tree
+
+    from analyzer.throttle import Throttle
+
+
+# Padrões de --nice: stat por segundo, bytes de hash por segundo e incremento de nice
+NICE_STAT_RATE = 2000
+NICE_HASH_RATE = 16 * 1024**2
+NICE_INCREMENT = 10
+
+_console = None
+
+
+def get_console():
+    """Console do rich, criado no primeiro uso"""
+    global _console
+    if _console is None:
+        from rich.console import Console
+        _console = Console()
+    return _console
+
 
+def __getattr__(name):
+    # Compatibilidade: cli.main.console continua disponível
+    if name == 'console':
+        return get_console()
+    if name == 'serialize_stats':
+        from analyzer.serialization import serialize_stats
+        return serialize_stats
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-console = Console()
 
+def naturalsize(size: int) -> str:
+    import humanize
+    return humanize.naturalsize(size)
 
-def create_tree_view(stats: DirectoryStats, max_items: int = 20) -> Tree:
+
+def create_tree_view(stats: DirectoryStats, max_items: int = 20) -> 'Tree':
     """Cria visualização em árvore dos diretórios"""
+    from rich.tree import Tree
     
     def format_size(size: int) -> str:
-        return f"[cyan]{humanize.naturalsize(size)}[/cyan]"
+        return f"[cyan]{naturalsize(size)}[/cyan]"
     
     def format_name(name: str, is_dir: bool, size: int) -> str:
         icon = "📁" if is_dir else "📄"
@@ -45,13 +81,16 @@ def create_tree_view(stats: DirectoryStats, max_items: int = 20) -> Tree:
         if depth > 3:  # Limitar profundidade visual
             return
         
-        # Ordenar filhos por tamanho (maiores primeiro)
-        sorted_children = sorted(directory_stats.children, 
-                               key=lambda x: x.total_size, 
-                               reverse=True)
+        # Ordenar filhos por tamanho (maiores primeiro); os de snapshot já vêm ordenados
+        if getattr(directory_stats.children, 'ordered', False):
+            sorted_children = directory_stats.children[:max_items]
+        else:
+            sorted_children = sorted(directory_stats.children, 
+                                   key=lambda x: x.total_size, 
+                                   reverse=True)[:max_items]
         
         # Mostrar apenas os maiores
-        for child in sorted_children[:max_items]:
+        for child in sorted_children:
             child_name = Path(child.path).name
             child_node = parent_tree.add(format_name(child_name, True, child.total_size))
             
@@ -62,65 +101,216 @@ def create_tree_view(stats: DirectoryStats, max_items: int = 20) -> Tree:
     return tree
 
 
-def create_summary_table(summary: dict) -> Table:
+def create_summary_table(summary: dict) -> 'Table':
     """Cria tabela com resumo da análise"""
+    from rich.table import Table
     table = Table(title="📊 Resumo da Análise", show_header=True, header_style="bold magenta")
     table.add_column("Métrica", style="cyan", no_wrap=True)
     table.add_column("Valor", style="green")
     
     table.add_row("📁 Diretório", summary['path'])
     table.add_row("💾 Tamanho Total", summary['total_size_human'])
+    table.add_row("💽 Espaço Alocado", summary['allocated_size_human'])
+    
+    if summary.get('sparse_count'):
+        table.add_row("🕳️ Arquivos Esparsos", f"{summary['sparse_count']:,}")
     table.add_row("📄 Arquivos", f"{summary['file_count']:,}")
     table.add_row("📁 Diretórios", f"{summary['dir_count']:,}")
     
     if summary['largest_file']:
-        table.add_row("🔍 Maior Arquivo", 
-                     f"{Path(summary['largest_file']['path']).name} ({summary['largest_file']['size_human']})")
+        largest = summary['largest_file']
+        table.add_row("🔍 Maior Arquivo",
+                      f"{Path(largest['path']).name} ({largest['size_human']})")
     
     table.add_row("⚡ Arquivos Escaneados", f"{summary['files_scanned']:,}")
     
+    if summary.get('symlink_count'):
+        table.add_row("🔗 Links Simbólicos", f"{summary['symlink_count']:,}")
+    
+    if summary.get('skipped_mounts'):
+        table.add_row("🔌 Montagens Não Percorridas", ", ".join(summary['skipped_mounts'][:5]))
+    
+    if summary.get('spilled_directories'):
+        table.add_row("💾 Diretórios em Disco (limite de memória)",
+                      f"{summary['spilled_directories']:,}")
+    
+    if summary.get('throttle'):
+        throttle = summary['throttle']
+        table.add_row("🐢 Modo Gentil", f"{throttle['waited_seconds']:.1f}s de espera, "
+                                        f"{throttle['backoffs']} recuo(s)")
+    
     if summary['errors_count'] > 0:
         table.add_row("⚠️ Erros", f"{summary['errors_count']}", style="red")
     
     return table
 
 
-def create_file_types_table(file_types: dict) -> Table:
-    """Cria tabela com tipos de arquivo"""
+def create_file_types_table(file_types: dict, file_type_sizes: dict = None,
+                            sort_by: str = 'bytes') -> 'Table':
+    """Cria tabela com tipos de arquivo (por bytes ou por quantidade)"""
     if not file_types:
         return None
     
-    table = Table(title="📋 Tipos de Arquivo", show_header=True, header_style="bold blue")
+    from rich.table import Table
+    
+    # Exports antigos só têm a quantidade
+    if not file_type_sizes:
+        file_type_sizes = {}
+        sort_by = 'count'
+    
+    title = "📋 Tipos de Arquivo" + (" (por tamanho)" if sort_by == 'bytes' else "")
+    table = Table(title=title, show_header=True, header_style="bold blue")
     table.add_column("Extensão", style="cyan")
     table.add_column("Quantidade", style="green", justify="right")
+    if file_type_sizes:
+        table.add_column("Tamanho", style="green", justify="right")
     table.add_column("Percentual", style="yellow", justify="right")
     
-    total_files = sum(file_types.values())
+    values = file_type_sizes if sort_by == 'bytes' else file_types
+    total = sum(values.values()) or 1
     
-    # Ordenar por quantidade
-    sorted_types = sorted(file_types.items(), key=lambda x: x[1], reverse=True)
+    # Ordenar por bytes ou por quantidade
+    sorted_types = sorted(values.items(), key=lambda x: x[1], reverse=True)
     
-    for file_type, count in sorted_types[:15]:  # Top 15
-        percentage = (count / total_files) * 100
+    for file_type, value in sorted_types[:15]:  # Top 15
+        percentage = (value / total) * 100
         ext_display = file_type if file_type != 'no_extension' else '(sem extensão)'
-        table.add_row(ext_display, f"{count:,}", f"{percentage:.1f}%")
+        row = [ext_display, f"{file_types.get(file_type, 0):,}"]
+        if file_type_sizes:
+            row.append(naturalsize(file_type_sizes.get(file_type, 0)))
+        table.add_row(*row, f"{percentage:.1f}%")
+    
+    return table
+
+
+def create_breakdown_table(summary: dict) -> 'Table':
+    """Cria tabela com o espaço por idade e por dono (--breakdown)"""
+    ages, owners = summary.get('age_breakdown'), summary.get('owner_breakdown')
+    if not ages:
+        return None
+    
+    from rich.table import Table
+    
+    total = sum(entry['bytes'] for entry in ages) or 1
+    table = Table(title="🗓️ Espaço por Idade e por Dono", show_header=True,
+                  header_style="bold blue")
+    table.add_column("Última Modificação", style="cyan")
+    table.add_column("Tamanho", style="green", justify="right")
+    table.add_column("Percentual", style="yellow", justify="right")
+    for entry in ages:
+        table.add_row(entry['label'], naturalsize(entry['bytes']),
+                      f"{entry['bytes'] / total * 100:.1f}%")
+    
+    table.add_section()
+    for entry in owners[:10]:
+        table.add_row(f"👤 {entry['owner']}", naturalsize(entry['bytes']),
+                      f"{entry['bytes'] / total * 100:.1f}%")
+    
+    return table
+
+
+def create_metrics_table(metrics: dict) -> 'Table':
+    """Cria tabela com as métricas de instrumentação"""
+    from rich.table import Table
+    table = Table(title="⏱️ Instrumentação", show_header=True, header_style="bold yellow")
+    table.add_column("Fase / Contador", style="cyan")
+    table.add_column("Valor", style="green", justify="right")
+    table.add_column("Percentual", style="yellow", justify="right")
+    
+    total = metrics['scan_seconds'] or 1.0
+    for phase, seconds in metrics['phase_seconds'].items():
+        calls = metrics['phase_calls'][phase]
+        table.add_row(f"{phase} ({calls:,} chamadas)", f"{seconds:.3f}s",
+                      f"{seconds / total * 100:.1f}%")
+    table.add_row("total", f"{metrics['scan_seconds']:.3f}s", "100.0%")
+    
+    for counter, value in metrics['counters'].items():
+        table.add_row(counter, f"{value:,}", "")
+    
+    for item in metrics['slowest_directories'][:5]:
+        table.add_row(f"🐢 {item['path']}", f"{item['seconds']:.3f}s", "")
     
     return table
 
 
+def write_metrics_file(metrics: ScanMetrics, output_file: str):
+    """Grava métricas no formato Prometheus (escrita atômica para textfile collectors)"""
+    tmp_file = f"{output_file}.tmp"
+    with open(tmp_file, 'w', encoding='utf-8') as f:
+        f.write(metrics.to_prometheus())
+    os.replace(tmp_file, output_file)
+
+
 @click.command()
-@click.argument('path', default='.', type=click.Path(exists=True))
+@click.argument('paths', nargs=-1, type=click.Path(exists=True))
 @click.option('--min-size', default='0B', help='Tamanho mínimo (ex: 1MB, 100KB)')
 @click.option('--max-depth', default=10, help='Profundidade máxima de análise')
 @click.option('--exclude', multiple=True, help='Padrões para excluir (ex: *.tmp)')
 @click.option('--include-hidden', is_flag=True, help='Incluir arquivos ocultos')
 @click.option('--tree-items', default=20, help='Máximo de itens na árvore')
-@click.option('--export', type=click.Choice(['json', 'csv']), help='Exportar resultados')
+@click.option('--export', type=click.Choice(['json', 'jsonl', 'csv', 'snapshot']),
+              help='Exportar resultados')
 @click.option('--output', help='Arquivo de saída para exportação')
 @click.option('--large-files', help='Mostrar arquivos maiores que (ex: 100MB)')
-@click.option('--quiet', is_flag=True, help='Modo silencioso')
-def analyze(path, min_size, max_depth, exclude, include_hidden, tree_items, 
-           export, output, large_files, quiet):
+@click.option('--quiet', is_flag=True, help='Modo silencioso (saída em texto simples, sem rich)')
+@click.option('--json', 'json_output', is_flag=True,
+              help='Imprimir o resumo em JSON (implica --quiet)')
+@click.option('--profile', is_flag=True, help='Perfilar a análise (pyinstrument ou cProfile)')
+@click.option('--profile-output', help='Arquivo para o relatório de perfilamento')
+@click.option('--metrics', 'show_metrics', is_flag=True,
+              help='Mostrar tempos por fase e contadores')
+@click.option('--metrics-file', help='Gravar métricas no formato Prometheus')
+@click.option('--workers', default=4, help='Threads compartilhadas ao analisar várias raízes')
+@click.option('-x', '--one-file-system', is_flag=True,
+              help='Não atravessar para outros sistemas de arquivos')
+@click.option('--mount-usage', is_flag=True, help='Reportar montagens via statvfs sem percorrê-las')
+@click.option('--skip-fs', multiple=True, help='Tipo de sistema de arquivos a ignorar (ex: nfs)')
+@click.option('--scan-pseudo-fs', is_flag=True, help='Percorrer também proc, sysfs e afins')
+@click.option('-L', '--follow-symlinks', is_flag=True,
+              help='Seguir links simbólicos (sem repetir diretórios)')
+@click.option('--allocated', is_flag=True,
+              help='Usar o espaço alocado em disco em vez do tamanho aparente')
+@click.option('--measure-extents', is_flag=True,
+              help='Medir os dados reais (SEEK_DATA) dos arquivos grandes esparsos')
+@click.option('--record', is_flag=True,
+              help='Gravar a varredura no histórico (disk-analyzer-history)')
+@click.option('--history-db', help='Banco de histórico (implica --record)')
+@click.option('--memory-limit',
+              help='Memória para os resultados; o excedente vai para o disco (ex: 1GB)')
+@click.option('--stat-backend', type=click.Choice(['lstat', 'statx', 'uring', 'threads']),
+              help='stat por item (lstat, padrão) ou statx em lote por diretório '
+                   '(statx/threads: pool de threads; uring: io_uring)')
+@click.option('--fast-listing', is_flag=True,
+              help='Somar arquivos sem criar um objeto por arquivo (mesmo resultado)')
+@click.option('--inode-order', is_flag=True,
+              help='stat em ordem de inode em cada diretório '
+                   '(discos rotacionais; implica --fast-listing)')
+@click.option('--nice', is_flag=True,
+              help=f'Modo gentil para produção: {NICE_STAT_RATE} stat/s, I/O idle, '
+                   f'nice +{NICE_INCREMENT} e recuo automático')
+@click.option('--max-stat-rate', type=int, help='Máximo de listagens e stat por segundo')
+@click.option('--max-hash-rate', help='Máximo de bytes lidos para hash por segundo (ex: 16MB)')
+@click.option('--io-class', type=click.Choice(['idle', 'best-effort']),
+              help='Classe de prioridade de I/O do processo (ioprio)')
+@click.option('--config', 'config_file', type=click.Path(exists=True, dir_okay=False),
+              help='config.yaml com a seção performance (memory_limit, chunk_size, '
+                   'max_workers, stat_backend, fast_listing, inode_order, max_stat_rate, '
+                   'max_hash_rate, io_class)')
+@click.option('--types-by', type=click.Choice(['bytes', 'count']), default='bytes',
+              help='Ordenar os tipos de arquivo por bytes ou por quantidade')
+@click.option('--breakdown', is_flag=True,
+              help='Espaço por faixa de idade e por dono em cada diretório')
+@click.option('--file-index', 'file_index_path',
+              help='Gravar um índice por arquivo para consultas (disk-analyzer-query)')
+@click.option('--open-snapshot', type=click.Path(exists=True, dir_okay=False),
+              help='Mostrar um snapshot gravado com --export snapshot, sem varrer')
+def analyze(paths, min_size, max_depth, exclude, include_hidden, tree_items, 
+           export, output, large_files, quiet, json_output, profile, profile_output,
+           show_metrics, metrics_file, workers, one_file_system, mount_usage, skip_fs,
+           scan_pseudo_fs, follow_symlinks, allocated, measure_extents, record, history_db,
+           memory_limit, stat_backend, fast_listing, inode_order, nice, max_stat_rate,
+           max_hash_rate, io_class, config_file, types_by, breakdown, file_index_path,
+           open_snapshot):
     """
     🔍 Analisa o uso de disco em um diretório
     
@@ -133,44 +323,156 @@ def analyze(path, min_size, max_depth, exclude, include_hidden, tree_items,
     disk-analyzer --min-size 1MB          # Arquivos >= 1MB
     
     disk-analyzer --exclude "*.log" "*.tmp"  # Excluir padrões
+    
+    disk-analyzer /var --json              # Resumo para scripts
+    
+    disk-analyzer /home /var /srv /opt     # Várias raízes em uma execução
+    
+    disk-analyzer / -x                     # Sem atravessar montagens
+    
+    disk-analyzer / --memory-limit 256MB   # VMs pequenas: resultados em disco
+    
+    disk-analyzer --open-snapshot root.dusnap  # Reabrir uma varredura gravada
+    
+    disk-analyzer /srv --file-index srv.duidx   # Índice para disk-analyzer-query
+    
+    disk-analyzer /home --breakdown        # Espaço por idade e por dono
+    
+    disk-analyzer /var/lib/postgresql --nice   # Host em produção
     """
+    quiet = quiet or json_output
+    paths = list(paths) or ['.']
+    path = paths[0]
+    multi_root = len(paths) > 1
+    
+    # Opções da linha de comando têm precedência sobre o config.yaml
+    performance = load_performance_config(config_file) if config_file else {}
+    memory_limit_bytes = (parse_size(memory_limit) if memory_limit
+                          else performance.get('memory_limit'))
+    workers_source = click.get_current_context().get_parameter_source('workers')
+    if 'workers' in performance and workers_source == click.core.ParameterSource.DEFAULT:
+        workers = performance['workers']
     
     if not quiet:
+        from rich.panel import Panel
+        console = get_console()
         console.print(Panel.fit("🔍 [bold blue]Disk Usage Analyzer[/bold blue]", 
                                border_style="blue"))
     
+    if open_snapshot:
+        show_snapshot(open_snapshot, tree_items, export, output, large_files, quiet, json_output)
+        return
+    
     # Converter tamanho mínimo
     min_size_bytes = parse_size(min_size)
     
+    # Sistemas de arquivos nunca percorridos
+    skip_fs_types = set(skip_fs)
+    if not scan_pseudo_fs:
+        from analyzer.mounts import PSEUDO_FILESYSTEMS
+        skip_fs_types |= PSEUDO_FILESYSTEMS
+    
+    # Prioridades antes de criar threads (são herdadas por elas); sem
+    # limites, analyzer.throttle nem é importado
+    max_stat_rate = max_stat_rate or performance.get('max_stat_rate')
+    max_hash_rate = parse_size(max_hash_rate) if max_hash_rate else performance.get('max_hash_rate')
+    io_class = io_class or performance.get('io_class')
+    throttle = None
+    if nice or max_stat_rate or max_hash_rate or io_class:
+        throttle = configure_throttle(nice, max_stat_rate, max_hash_rate, io_class)
+    
+    # --stat-backend uring sem suporte do kernel; só a criação do backend é
+    # verificada aqui, outros OSError do construtor (ex: spill) seguem adiante
+    stat_backend = stat_backend or performance.get('stat_backend', 'lstat')
+    if stat_backend == 'uring':
+        from analyzer.statx import create_stat_backend
+        try:
+            create_stat_backend(stat_backend).close()
+        except OSError as e:
+            raise click.BadParameter(f"io_uring indisponível: {e}", param_hint='--stat-backend')
+    
     # Configurar analisador
+    metrics = ScanMetrics() if show_metrics or metrics_file else None
+    display = None
+    if not quiet and not multi_root:
+        from cli.progress import ScanProgressDisplay
+        display = ScanProgressDisplay(path, console)
     analyzer = DiskUsageAnalyzer(
         min_size=min_size_bytes,
         max_depth=max_depth,
         exclude_patterns=list(exclude),
         include_hidden=include_hidden,
-        calculate_hashes=False  # Por enquanto desabilitado
+        calculate_hashes=False,  # Por enquanto desabilitado
+        metrics=metrics,
+        progress_callback=display.update if display else None,
+        one_file_system=one_file_system,
+        skip_fs_types=skip_fs_types,
+        mount_usage=mount_usage,
+        follow_symlinks=follow_symlinks,
+        use_allocated_size=allocated,
+        memory_limit=memory_limit_bytes,
+        chunk_size=performance.get('chunk_size', 1000),
+        file_index=bool(file_index_path),
+        breakdowns=breakdown,
+        stat_backend=stat_backend,
+        fast_listing=fast_listing or performance.get('fast_listing', False),
+        inode_order=inode_order or performance.get('inode_order', False),
+        throttle=throttle
     )
+    profiler = ScanProfiler() if profile or profile_output else None
     
-    # Executar análise com progress bar
-    with Progress(
-        SpinnerColumn(),
-        TextColumn("[progress.description]{task.description}"),
-        console=console,
-        transient=True
-    ) as progress:
-        
-        task = progress.add_task("Analisando diretórios...", total=None)
-        
-        try:
-            stats = analyzer.analyze_directory(path)
-            progress.update(task, description="✅ Análise concluída!")
-            
-        except Exception as e:
-            console.print(f"[red]❌ Erro na análise: {e}[/red]")
-            sys.exit(1)
+    # Executar análise (com progress bar fora do modo silencioso)
+    started_at = time.time()
+    try:
+        if multi_root:
+            if quiet:
+                results = run_batch_analysis(analyzer, paths, workers, profiler)
+            else:
+                with console.status(f"Analisando {len(paths)} raízes..."):
+                    results = run_batch_analysis(analyzer, paths, workers, profiler)
+        elif display:
+            with display:
+                stats = run_analysis(analyzer, path, profiler)
+                display.finish("✅ Análise concluída!")
+        else:
+            stats = run_analysis(analyzer, path, profiler)
     
-    # Gerar resumo
-    summary = analyzer.get_summary(stats)
+    except Exception as e:
+        if quiet:
+            click.echo(f"Erro na análise: {e}", err=True)
+        else:
+            console.print(f"[red]❌ Erro na análise: {e}[/red]")
+        sys.exit(1)
+    
+    if profiler:
+        profiler.report(profile_output)
+        if profile_output:
+            message = f"Perfil ({profiler.backend}) salvo em: {profile_output}"
+            if quiet:
+                click.echo(message, err=True)
+            else:
+                console.print(f"[green]✅ {message}[/green]")
+    
+    if metrics_file:
+        write_metrics_file(metrics, metrics_file)
+    
+    if file_index_path:
+        save_file_index(analyzer, file_index_path, None if multi_root else path, started_at, quiet)
+    
+    if record or history_db:
+        roots = list(results.values()) if multi_root else [stats]
+        record_history(roots, history_db, started_at, time.time() - started_at, max_depth, quiet)
+    
+    if multi_root:
+        show_batch_results(analyzer, results, tree_items, export, output, large_files,
+                           quiet, json_output, measure_extents)
+        show_errors(analyzer, quiet)
+        return
+    
+    # Gerar resumo (no modo silencioso só quando algo vai consumi-lo)
+    summary = None
+    if not quiet or export or json_output:
+        summary = analyzer.get_summary(stats)
     
     if not quiet:
         # Mostrar resultados
@@ -184,37 +486,310 @@ def analyze(path, min_size, max_depth, exclude, include_hidden, tree_items,
         console.print()
         
         # Tipos de arquivo
-        file_types_table = create_file_types_table(summary['file_types'])
+        file_types_table = create_file_types_table(summary['file_types'],
+                                                   summary.get('file_type_sizes'), types_by)
         if file_types_table:
             console.print(file_types_table)
             console.print()
+        
+        breakdown_table = create_breakdown_table(summary)
+        if breakdown_table:
+            console.print(breakdown_table)
+            console.print()
+        
+        if show_metrics:
+            console.print(create_metrics_table(summary['metrics']))
+            console.print()
     
     # Arquivos grandes
     if large_files:
         threshold = parse_size(large_files)
-        large_file_list = analyzer.find_large_files(stats, threshold)
+        large_file_list = analyzer.find_large_files(stats, threshold)[:20]
+        if measure_extents:
+            analyzer.measure_data_extents(large_file_list)
+        show_large_files(analyzer, large_file_list, large_files, quiet, json_output)
         
-        if large_file_list:
-            console.print(f"📋 [bold]Arquivos maiores que {large_files}:[/bold]")
-            for i, file_info in enumerate(large_file_list[:20], 1):
-                size_str = humanize.naturalsize(file_info.size)
-                console.print(f"{i:2d}. [cyan]{size_str}[/cyan] {file_info.path}")
-            console.print()
+        if json_output:
+            summary['large_files'] = [large_file_dict(file_info) for file_info in large_file_list]
     
     # Exportar se solicitado
     if export:
-        export_results(stats, summary, export, output)
+        export_results(stats, summary, export, output, quiet=quiet)
     
-    # Mostrar erros se houver
-    if analyzer.errors and not quiet:
-        console.print(f"[yellow]⚠️ {len(analyzer.errors)} erro(s) encontrado(s)[/yellow]")
-        if len(analyzer.errors) <= 5:
-            for error in analyzer.errors:
-                console.print(f"  [red]•[/red] {error}")
+    if json_output:
+        import json
+        click.echo(json.dumps(summary, ensure_ascii=False, default=str))
+    
+    show_errors(analyzer, quiet)
+
+
+def show_snapshot(snapshot_file: str, tree_items: int, export: str, output: str,
+                  large_files: str, quiet: bool, json_output: bool):
+    """Mostra um snapshot binário; só os nós exibidos são lidos do arquivo"""
+    from analyzer.snapshot import Snapshot
+    
+    try:
+        snapshot = Snapshot(snapshot_file)
+    except (OSError, ValueError) as e:
+        if quiet:
+            click.echo(f"Erro ao abrir o snapshot: {e}", err=True)
         else:
-            for error in analyzer.errors[:3]:
-                console.print(f"  [red]•[/red] {error}")
-            console.print(f"  [yellow]... e mais {len(analyzer.errors) - 3} erros[/yellow]")
+            get_console().print(f"[red]❌ Erro ao abrir o snapshot: {e}[/red]")
+        sys.exit(1)
+    
+    with snapshot:
+        stats = snapshot.stats()
+        summary = dict(snapshot.summary or {}, path=snapshot.root, snapshot=snapshot_file,
+                       timestamp=snapshot.timestamp)
+        
+        if not quiet:
+            from rich.panel import Panel
+            console = get_console()
+            console.print()
+            console.print(create_summary_table(summary))
+            console.print()
+            tree = create_tree_view(stats, tree_items)
+            console.print(Panel(tree, title=f"🌳 Estrutura de Diretórios ({snapshot.timestamp})",
+                                border_style="green"))
+            console.print()
+            
+            file_types_table = create_file_types_table(summary.get('file_types', {}),
+                                                       summary.get('file_type_sizes'))
+            if file_types_table:
+                console.print(file_types_table)
+                console.print()
+            
+            breakdown_table = create_breakdown_table(summary)
+            if breakdown_table:
+                console.print(breakdown_table)
+                console.print()
+        
+        if large_files:
+            # Só o maior arquivo de cada diretório está no snapshot
+            analyzer = DiskUsageAnalyzer()
+            large_file_list = snapshot.largest_files(parse_size(large_files))
+            show_large_files(analyzer, large_file_list, large_files, quiet, json_output)
+            if json_output:
+                summary['large_files'] = [large_file_dict(file_info)
+                                          for file_info in large_file_list]
+        
+        if export:
+            export_results(stats, summary, export, output, quiet=quiet)
+    
+    if json_output:
+        import json
+        click.echo(json.dumps(summary, ensure_ascii=False, default=str))
+
+
+def save_file_index(analyzer: DiskUsageAnalyzer, output_file: str, root: str,
+                    started_at: float, quiet: bool = False):
+    """Grava o índice por arquivo coletado na varredura"""
+    index = analyzer.file_index
+    index.save(output_file, root=os.path.abspath(root) if root else None, timestamp=started_at)
+    
+    message = f"Índice de {len(index):,} arquivos salvo em: {output_file}"
+    if quiet:
+        click.echo(message, err=True)
+    else:
+        get_console().print(f"[green]✅ {message}[/green]")
+
+
+def record_history(roots: list, db_path: str, started_at: float, duration: float,
+                   max_depth: int, quiet: bool = False):
+    """Grava as raízes analisadas no histórico de varreduras"""
+    from analyzer.history import ScanHistory
+    
+    # Raízes repetidas apontam para o mesmo objeto
+    unique = list({id(stats): stats for stats in roots}.values())
+    with ScanHistory(db_path) as store:
+        for stats in unique:
+            store.record(stats, started_at=started_at, duration=duration, max_depth=max_depth)
+    
+    message = f"Varredura gravada no histórico: {store.db_path}"
+    if quiet:
+        click.echo(message, err=True)
+    else:
+        get_console().print(f"[green]✅ {message}[/green]")
+
+
+def large_file_dict(file_info) -> dict:
+    """Arquivo grande no formato do resumo JSON"""
+    return {
+        'path': file_info.path,
+        'size': file_info.size,
+        'allocated': file_info.allocated,
+        'sparse': file_info.is_sparse,
+        'data_size': file_info.data_size
+    }
+
+
+def show_large_files(analyzer: DiskUsageAnalyzer, large_file_list: list, label: str,
+                     quiet: bool, json_output: bool):
+    """Lista os arquivos grandes (texto simples no modo silencioso)"""
+    if quiet and not json_output:
+        # Saída para scripts: bytes<TAB>caminho
+        for file_info in large_file_list:
+            click.echo(f"{analyzer._size_of(file_info)}\t{file_info.path}")
+    elif large_file_list and not quiet:
+        console = get_console()
+        console.print(f"📋 [bold]Arquivos maiores que {label}:[/bold]")
+        for i, file_info in enumerate(large_file_list, 1):
+            size_str = naturalsize(analyzer._size_of(file_info))
+            line = f"{i:2d}. [cyan]{size_str}[/cyan] {file_info.path}"
+            if file_info.is_sparse:
+                detail = (f"aparente {naturalsize(file_info.size)}, "
+                          f"alocado {naturalsize(file_info.allocated)}")
+                if file_info.data_size is not None:
+                    detail += f", dados {naturalsize(file_info.data_size)}"
+                line += f" [yellow](esparso: {detail})[/yellow]"
+            console.print(line)
+        console.print()
+
+
+def show_errors(analyzer: DiskUsageAnalyzer, quiet: bool):
+    """Mostra o resumo dos erros da análise"""
+    if analyzer.errors and not quiet:
+        console = get_console()
+        errors = analyzer.errors
+        console.print(f"[yellow]⚠️ {len(errors):,} erro(s) encontrado(s)[/yellow]")
+        by_errno = ", ".join(f"{name}: {count:,}" for name, count in errors.top_errnos(5))
+        console.print(f"  [yellow]Por tipo:[/yellow] {by_errno}")
+        if len(errors.by_subtree) > 1:
+            for subtree, count in errors.top_subtrees(3):
+                console.print(f"  [yellow]{count:,}[/yellow] em {subtree}")
+        for error in errors[:3]:
+            console.print(f"  [red]•[/red] {error}")
+        if len(errors) > 3:
+            console.print(f"  [yellow]... e mais {len(errors) - 3:,} erros[/yellow]")
+
+
+def show_batch_results(analyzer: DiskUsageAnalyzer, results: dict, tree_items: int,
+                       export: str, output: str, large_files: str, quiet: bool, json_output: bool,
+                       measure_extents: bool = False):
+    """Mostra os resultados de uma análise com várias raízes"""
+    summaries = None
+    if not quiet or export or json_output:
+        summaries = [analyzer.get_summary(stats) for stats in results.values()]
+    
+    if not quiet:
+        from rich.panel import Panel
+        console = get_console()
+        for summary, stats in zip(summaries, results.values()):
+            console.print()
+            console.print(create_summary_table(summary))
+            tree = create_tree_view(stats, tree_items)
+            console.print(Panel(tree, title="🌳 Estrutura de Diretórios", border_style="green"))
+            breakdown_table = create_breakdown_table(summary)
+            if breakdown_table:
+                console.print(breakdown_table)
+        console.print()
+    
+    if large_files:
+        threshold = parse_size(large_files)
+        # Raízes aninhadas compartilham a subárvore: remover repetições
+        seen = {}
+        for stats in results.values():
+            for file_info in analyzer.find_large_files(stats, threshold):
+                seen.setdefault(file_info.path, file_info)
+        large_file_list = sorted(seen.values(), key=analyzer._size_of, reverse=True)[:20]
+        if measure_extents:
+            analyzer.measure_data_extents(large_file_list)
+        show_large_files(analyzer, large_file_list, large_files, quiet, json_output)
+        
+        if json_output:
+            for summary, stats in zip(summaries, results.values()):
+                prefix = stats.path.rstrip(os.sep) + os.sep
+                summary['large_files'] = [
+                    large_file_dict(file_info)
+                    for file_info in large_file_list
+                    if file_info.path.startswith(prefix)
+                ]
+    
+    if export:
+        export_results(list(results.values()), summaries, export, output, quiet=quiet)
+    
+    if json_output:
+        import json
+        click.echo(json.dumps(summaries, ensure_ascii=False, default=str))
+
+
+def run_batch_analysis(analyzer: DiskUsageAnalyzer, paths: list, workers: int,
+                       profiler: ScanProfiler = None) -> dict:
+    """Executa a análise de várias raízes, opcionalmente sob o profiler"""
+    if profiler:
+        return profiler.run(analyzer.analyze_roots, paths, workers)
+    return analyzer.analyze_roots(paths, workers)
+
+
+def run_analysis(analyzer: DiskUsageAnalyzer, path: str,
+                 profiler: ScanProfiler = None) -> DirectoryStats:
+    """Executa a análise, opcionalmente sob o profiler"""
+    if profiler:
+        return profiler.run(analyzer.analyze_directory, path)
+    return analyzer.analyze_directory(path)
+
+
+def load_performance_config(config_file: str) -> dict:
+    """Lê a seção performance de um config.yaml"""
+    import yaml
+    
+    with open(config_file, encoding='utf-8') as f:
+        config = yaml.safe_load(f) or {}
+    section = config.get('performance') or {}
+    
+    performance = {}
+    if section.get('memory_limit'):
+        performance['memory_limit'] = parse_size(str(section['memory_limit']))
+    if section.get('chunk_size'):
+        performance['chunk_size'] = int(section['chunk_size'])
+    if section.get('max_workers'):
+        performance['workers'] = int(section['max_workers'])
+    if section.get('stat_backend'):
+        from analyzer.statx import STAT_BACKENDS
+        if section['stat_backend'] not in STAT_BACKENDS:
+            raise click.BadParameter(f"stat_backend inválido: {section['stat_backend']}",
+                                     param_hint='--config')
+        performance['stat_backend'] = section['stat_backend']
+    for flag in ('fast_listing', 'inode_order'):
+        if flag in section:
+            performance[flag] = bool(section[flag])
+    if section.get('max_stat_rate'):
+        performance['max_stat_rate'] = int(section['max_stat_rate'])
+    if section.get('max_hash_rate'):
+        performance['max_hash_rate'] = parse_size(str(section['max_hash_rate']))
+    if section.get('io_class'):
+        if section['io_class'] not in ('idle', 'best-effort'):
+            raise click.BadParameter(f"io_class inválido: {section['io_class']}",
+                                     param_hint='--config')
+        performance['io_class'] = section['io_class']
+    return performance
+
+
+def configure_throttle(nice: bool, max_stat_rate: int = None, max_hash_rate: int = None,
+                       io_class: str = None) -> 'Throttle':
+    """
+    Aplica --nice e --io-class ao processo e cria o Throttle dos limites
+    
+    Deve rodar antes de criar threads, que herdam ioprio e nice. Retorna
+    None sem limites de taxa.
+    """
+    from analyzer.throttle import Throttle, lower_cpu_priority, set_io_priority
+    
+    if nice:
+        max_stat_rate = max_stat_rate or NICE_STAT_RATE
+        max_hash_rate = max_hash_rate or NICE_HASH_RATE
+        io_class = io_class or 'idle'
+        lower_cpu_priority(NICE_INCREMENT)
+    
+    if io_class:
+        try:
+            set_io_priority(io_class)
+        except OSError as e:
+            click.echo(f"Aviso: prioridade de I/O não alterada: {e}", err=True)
+    
+    if not max_stat_rate and not max_hash_rate:
+        return None
+    return Throttle(stat_rate=max_stat_rate, hash_rate=max_hash_rate)
 
 
 def parse_size(size_str: str) -> int:
@@ -249,21 +824,41 @@ def parse_size(size_str: str) -> int:
     return int(number * multipliers[unit])
 
 
-def export_results(stats: DirectoryStats, summary: dict, format_type: str, output_file: str):
-    """Exporta resultados para arquivo"""
+def export_results(stats, summary, format_type: str, output_file: str,
+                   quiet: bool = False):
+    """
+    Exporta resultados para arquivo
+    
+    stats e summary podem ser listas (uma entrada por raiz) quando a
+    análise cobriu várias raízes.
+    """
+    from analyzer.serialization import serialize_stats
+    
+    roots = stats if isinstance(stats, list) else [stats]
+    summaries = summary if isinstance(stats, list) else [summary]
     if not output_file:
-        output_file = f"disk_analysis.{format_type}"
+        suffix = 'dusnap' if format_type == 'snapshot' else format_type
+        output_file = f"disk_analysis.{suffix}"
     
     try:
         if format_type == 'json':
             import json
             
             # Converter stats para dict serializável
-            export_data = {
-                'summary': summary,
-                'timestamp': str(datetime.now()),
-                'directory_tree': serialize_stats(stats)
-            }
+            if isinstance(stats, list):
+                export_data = {
+                    'timestamp': str(datetime.now()),
+                    'roots': [
+                        {'summary': root_summary, 'directory_tree': serialize_stats(root_stats)}
+                        for root_summary, root_stats in zip(summary, stats)
+                    ]
+                }
+            else:
+                export_data = {
+                    'summary': summary,
+                    'timestamp': str(datetime.now()),
+                    'directory_tree': serialize_stats(stats)
+                }
             
             with open(output_file, 'w', encoding='utf-8') as f:
                 json.dump(export_data, f, indent=2, ensure_ascii=False)
@@ -274,45 +869,55 @@ def export_results(stats: DirectoryStats, summary: dict, format_type: str, outpu
             # Criar CSV com informações dos diretórios
             with open(output_file, 'w', newline='', encoding='utf-8') as f:
                 writer = csv.writer(f)
-                writer.writerow(['Path', 'Size_Bytes', 'Size_Human', 'Files', 'Directories'])
+                writer.writerow(['Path', 'Size_Bytes', 'Size_Human', 'Files', 'Directories',
+                                 'Allocated_Bytes'])
                 
                 def write_directory(dir_stats: DirectoryStats):
                     writer.writerow([
                         dir_stats.path,
                         dir_stats.total_size,
-                        humanize.naturalsize(dir_stats.total_size),
+                        naturalsize(dir_stats.total_size),
                         dir_stats.file_count,
-                        dir_stats.dir_count
+                        dir_stats.dir_count,
+                        dir_stats.allocated_size
                     ])
                     
                     for child in dir_stats.children:
                         write_directory(child)
                 
-                write_directory(stats)
+                for root_stats in roots:
+                    write_directory(root_stats)
         
-        console.print(f"[green]✅ Resultados exportados para: {output_file}[/green]")
+        elif format_type == 'jsonl':
+            from analyzer.serialization import write_jsonl
+            
+            # Um diretório por linha, em pré-ordem: lido em fluxo por disk-analyzer-diff
+            timestamp = str(datetime.now())
+            with open(output_file, 'w', encoding='utf-8') as f:
+                for root_stats, root_summary in zip(roots, summaries):
+                    write_jsonl(root_stats, f, root_summary, timestamp)
+        
+        elif format_type == 'snapshot':
+            from analyzer.snapshot import write_snapshot
+            
+            # Um arquivo por raiz: o snapshot guarda uma única árvore
+            timestamp = str(datetime.now())
+            base, extension = os.path.splitext(output_file)
+            for index, (root_stats, root_summary) in enumerate(zip(roots, summaries)):
+                root_file = output_file if len(roots) == 1 else f"{base}.{index}{extension}"
+                write_snapshot(root_stats, root_file, root_summary, timestamp)
+        
+        if quiet:
+            click.echo(f"Resultados exportados para: {output_file}", err=True)
+        else:
+            get_console().print(f"[green]✅ Resultados exportados para: {output_file}[/green]")
         
     except Exception as e:
-        console.print(f"[red]❌ Erro na exportação: {e}[/red]")
-
-
-def serialize_stats(stats: DirectoryStats) -> dict:
-    """Converte DirectoryStats para dict serializável"""
-    return {
-        'path': stats.path,
-        'total_size': stats.total_size,
-        'file_count': stats.file_count,
-        'dir_count': stats.dir_count,
-        'largest_file': {
-            'path': stats.largest_file.path,
-            'size': stats.largest_file.size,
-            'name': stats.largest_file.name
-        } if stats.largest_file else None,
-        'file_types': stats.file_types,
-        'children': [serialize_stats(child) for child in stats.children]
-    }
+        if quiet:
+            click.echo(f"Erro na exportação: {e}", err=True)
+        else:
+            get_console().print(f"[red]❌ Erro na exportação: {e}[/red]")
 
 
 if __name__ == '__main__':
-    from datetime import datetime
     analyze()
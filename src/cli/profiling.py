@@ -0,0 +1,61 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - CLI Profiling
+Perfilamento da análise com pyinstrument (se instalado) ou cProfile
+"""
+
+import sys
+from typing import Callable, Optional
+
+
+class ScanProfiler:
+    """Executa uma função sob profiler e gera o relatório"""
+
+    def __init__(self):
+        try:
+            from pyinstrument import Profiler
+            self.backend = 'pyinstrument'
+            self._profiler = Profiler()
+        except ImportError:
+            import cProfile
+            self.backend = 'cProfile'
+            self._profiler = cProfile.Profile()
+
+    def run(self, func: Callable, *args, **kwargs):
+        """Executa func com o profiler ativo"""
+        if self.backend == 'pyinstrument':
+            self._profiler.start()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                self._profiler.stop()
+
+        return self._profiler.runcall(func, *args, **kwargs)
+
+    def report(self, output_file: Optional[str] = None, limit: int = 30):
+        """
+        Gera o relatório do perfilamento
+
+        Sem output_file o relatório vai para stderr. Com pyinstrument,
+        arquivos .html recebem o relatório interativo; com cProfile o
+        arquivo recebe o dump binário (abrir com pstats ou snakeviz).
+        """
+        if self.backend == 'pyinstrument':
+            if output_file and output_file.endswith('.html'):
+                content = self._profiler.output_html()
+            else:
+                content = self._profiler.output_text(unicode=True, color=not output_file)
+
+            if output_file:
+                with open(output_file, 'w', encoding='utf-8') as f:
+                    f.write(content)
+            else:
+                sys.stderr.write(content)
+            return
+
+        if output_file:
+            self._profiler.dump_stats(output_file)
+        else:
+            import pstats
+            stats = pstats.Stats(self._profiler, stream=sys.stderr)
+            stats.sort_stats('cumulative').print_stats(limit)
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - CLI Progress
+Barra de progresso com vazão e ETA estimado a partir da varredura anterior
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Dict, Optional
+
+import humanize
+from rich.console import Console
+from rich.progress import (
+    BarColumn, Progress, ProgressColumn, SpinnerColumn, TextColumn, TimeRemainingColumn
+)
+from rich.text import Text
+
+from analyzer.core import ScanProgress
+
+
+def _snapshot_file() -> Path:
+    """Arquivo com o tamanho das varreduras anteriores por diretório"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(cache_home) / 'disk-analyzer' / 'progress.json'
+
+
+def load_previous_snapshot(root: str) -> Optional[Dict]:
+    """Retorna entradas e duração da última varredura do mesmo diretório"""
+    try:
+        with open(_snapshot_file(), encoding='utf-8') as f:
+            return json.load(f).get(os.path.abspath(root))
+    except (OSError, ValueError):
+        return None
+
+
+def save_snapshot(root: str, entries: int, seconds: float):
+    """Registra o tamanho da varredura para estimar o ETA da próxima"""
+    snapshot_file = _snapshot_file()
+    try:
+        try:
+            with open(snapshot_file, encoding='utf-8') as f:
+                snapshots = json.load(f)
+        except (OSError, ValueError):
+            snapshots = {}
+
+        snapshots[os.path.abspath(root)] = {'entries': entries, 'seconds': seconds}
+        snapshot_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp_file = snapshot_file.with_suffix('.tmp')
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(snapshots, f)
+        os.replace(tmp_file, snapshot_file)
+    except OSError:
+        # O cache de progresso é apenas uma conveniência
+        pass
+
+
+class ThroughputColumn(ProgressColumn):
+    """Mostra entradas/s e bytes lidos"""
+
+    def render(self, task) -> Text:
+        speed = task.speed or 0
+        scanned = humanize.naturalsize(task.fields.get('bytes', 0))
+        return Text(f"{task.completed:,.0f} entradas • {speed:,.0f}/s • {scanned}", style="cyan")
+
+
+class ScanProgressDisplay:
+    """Liga o callback de progresso do analisador a uma barra do rich"""
+
+    def __init__(self, root: str, console: Console):
+        self.root = root
+        previous = load_previous_snapshot(root)
+        self.expected = previous['entries'] if previous else None
+        self.progress = Progress(
+            SpinnerColumn(),
+            TextColumn("[progress.description]{task.description}"),
+            BarColumn(),
+            ThroughputColumn(),
+            TimeRemainingColumn(),
+            console=console,
+            transient=True
+        )
+        self.task = None
+        self.last_state: Optional[ScanProgress] = None
+
+    def __enter__(self):
+        self.progress.__enter__()
+        self.task = self.progress.add_task("Analisando diretórios...", total=self.expected, bytes=0)
+        return self
+
+    def __exit__(self, *exc_info):
+        return self.progress.__exit__(*exc_info)
+
+    def update(self, state: ScanProgress):
+        """Callback para DiskUsageAnalyzer(progress_callback=...)"""
+        self.last_state = state
+        if self.expected is not None and state.entries >= self.expected:
+            # Árvore cresceu desde a última varredura: reajustar a estimativa
+            self.expected = int(state.entries * 1.1) + 1
+
+        current = state.current_path
+        if len(current) > 40:
+            current = '…' + current[-39:]
+
+        self.progress.update(
+            self.task,
+            completed=state.entries,
+            total=self.expected,
+            bytes=state.bytes,
+            description=f"{current} ({state.dirs_queued:,} na fila)"
+        )
+
+    def finish(self, description: str):
+        """Marca o fim da varredura e guarda o tamanho para a próxima"""
+        self.progress.update(self.task, description=description)
+        if self.last_state is not None:
+            save_snapshot(self.root, self.last_state.entries, self.last_state.elapsed)
@@ -0,0 +1,146 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Query CLI
+Filtros e agrupamentos sobre o índice por arquivo (disk-analyzer --file-index)
+"""
+
+import json
+import re
+import sys
+import time
+from datetime import datetime
+from pathlib import Path
+
+import click
+
+# Adicionar o diretório src ao path para imports
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from analyzer.attributes import DAY, resolve_owner
+from analyzer.fileindex import GROUP_KEYS, FileIndex
+from cli.main import get_console, naturalsize, parse_size
+
+
+_GROUP_TITLES = {
+    'owner': 'Dono',
+    'group': 'Grupo',
+    'ext': 'Extensão',
+    'age': 'Idade',
+    'dir': 'Diretório',
+}
+
+_AGE_UNITS = {'h': 3600, 'd': DAY, 'w': 7 * DAY, 'm': 30 * DAY, 'y': 365 * DAY}
+
+
+def parse_age(age_str: str) -> float:
+    """Converte idade (ex: 90d, 6m, 1y; sem unidade = dias) para segundos"""
+    match = re.match(r'^(\d+(?:\.\d+)?)\s*([hdwmy]?)$', age_str.strip().lower())
+    if not match:
+        raise click.BadParameter(f"Formato de idade inválido: {age_str}")
+    return float(match.group(1)) * _AGE_UNITS[match.group(2) or 'd']
+
+
+def _extension(value: str) -> str:
+    if value in ('no_extension', 'symlink') or value.startswith('.'):
+        return value.lower()
+    return f".{value.lower()}"
+
+
+@click.command()
+@click.argument('index_file', type=click.Path(exists=True, dir_okay=False))
+@click.option('--min-size', help='Só arquivos com ao menos esse tamanho (ex: 1GB)')
+@click.option('--max-size', help='Só arquivos com até esse tamanho')
+@click.option('--older-than', help='Sem modificação há mais que (ex: 365d, 6m, 1y)')
+@click.option('--newer-than', help='Modificados há menos que (ex: 7d)')
+@click.option('--owner', multiple=True, help='Dono (nome ou uid); pode repetir')
+@click.option('--ext', multiple=True, help='Extensão (ex: log ou .log); pode repetir')
+@click.option('--under', help='Só arquivos abaixo deste diretório')
+@click.option('--group-by', type=click.Choice(GROUP_KEYS),
+              help='Agrupar por dono, grupo, extensão, idade ou diretório')
+@click.option('--limit', default=20, help='Máximo de linhas exibidas')
+@click.option('--json', 'json_output', is_flag=True, help='Saída em JSON')
+def query(index_file, min_size, max_size, older_than, newer_than, owner, ext, under,
+          group_by, limit, json_output):
+    """
+    🔎 Consulta o índice por arquivo de uma varredura
+
+    Sem --group-by, lista os maiores arquivos que atendem aos filtros.
+
+    Exemplos:
+
+    disk-analyzer-query srv.duidx --min-size 1GB --older-than 1y --group-by owner
+
+    disk-analyzer-query srv.duidx --ext log --under /srv/app --group-by dir
+    """
+    owners = None
+    if owner:
+        owners = []
+        for name in owner:
+            uid = resolve_owner(name)
+            if uid is None:
+                raise click.BadParameter(f"Usuário desconhecido: {name}", param_hint='--owner')
+            owners.append(uid)
+
+    try:
+        index = FileIndex.load(index_file)
+    except (OSError, ValueError) as e:
+        click.echo(f"Erro abrindo índice: {e}", err=True)
+        sys.exit(1)
+
+    started = time.perf_counter()
+    with index:
+        rows = index.select(
+            min_size=parse_size(min_size) if min_size else None,
+            max_size=parse_size(max_size) if max_size else None,
+            older_than=parse_age(older_than) if older_than else None,
+            newer_than=parse_age(newer_than) if newer_than else None,
+            owners=owners,
+            extensions=[_extension(value) for value in ext] or None,
+            under=under,
+        )
+        matched, matched_bytes = len(rows), index.total_size(rows)
+        if group_by:
+            result = index.group_by(rows, group_by, limit=limit)
+        else:
+            result = index.top_files(rows, limit)
+        elapsed = time.perf_counter() - started
+        indexed = len(index)
+
+    if json_output:
+        click.echo(json.dumps({
+            'indexed_files': indexed,
+            'matched_files': matched,
+            'matched_bytes': matched_bytes,
+            'group_by': group_by,
+            'results': result,
+            'elapsed': elapsed,
+        }, ensure_ascii=False))
+        return
+
+    from rich.table import Table
+    if group_by:
+        title = _GROUP_TITLES[group_by]
+        table = Table(title=f"🔎 Por {title.lower()}", show_header=True, header_style="bold magenta")
+        table.add_column(title, style="cyan")
+        table.add_column("Arquivos", justify="right")
+        table.add_column("Tamanho", style="green", justify="right")
+        for group in result:
+            table.add_row(str(group['key']), f"{group['count']:,}", naturalsize(group['bytes']))
+    else:
+        table = Table(title="🔎 Maiores arquivos", show_header=True, header_style="bold magenta")
+        table.add_column("Tamanho", style="green", justify="right")
+        table.add_column("Modificado", style="cyan")
+        table.add_column("Dono")
+        table.add_column("Caminho")
+        for row in result:
+            modified = datetime.fromtimestamp(row['modified']).strftime('%Y-%m-%d')
+            table.add_row(naturalsize(row['size']), modified, row['owner'], row['path'])
+
+    console = get_console()
+    console.print(table)
+    console.print(f"{matched:,} de {indexed:,} arquivos ({naturalsize(matched_bytes)}) "
+                  f"em {elapsed * 1000:.0f} ms")
+
+
+if __name__ == '__main__':
+    query()
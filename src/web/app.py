@@ -1,29 +1,70 @@
 #!/usr/bin/env python3
 """
 Disk Usage Analyzer - Web Interface
-Interface web com Flask e Plotly para visualização interativa
+Interface web com Flask e Plotly (no navegador) para visualização interativa
 """
 
 import os
 import sys
-import json
+import time
 from pathlib import Path
 from flask import Flask, render_template, request, jsonify, send_from_directory
-import plotly.graph_objs as go
-import plotly.utils
 import humanize
 from datetime import datetime
 
 # Adicionar o diretório src ao path para imports
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from analyzer.core import DiskUsageAnalyzer, DirectoryStats
+from analyzer.attributes import AGE_LABELS
+from analyzer.core import DiskUsageAnalyzer, DirectoryStats, owner_breakdown
+from analyzer.history import ScanHistory, default_history_path
+from analyzer.snapshot import SNAPSHOT_SUFFIX, Snapshot
+from web.collector import FleetIndex, valid_host
+from web.directories import DirectorySuggestions
+from web.payload import dumps, gzip_body, json_response
+from web.state import CachedBody, SharedState
 
 app = Flask(__name__)
 app.config['SECRET_KEY'] = 'disk-analyzer-secret-key'
+# Banco do histórico de varreduras (padrão: ~/.local/share/disk-analyzer/history.db)
+app.config['HISTORY_DB'] = os.environ.get('DISK_ANALYZER_HISTORY_DB')
+# Modo collector: snapshots dos agentes (padrão: ~/.local/share/disk-analyzer/fleet)
+app.config['COLLECTOR_DIR'] = os.environ.get('DISK_ANALYZER_COLLECTOR_DIR')
+# Token exigido dos agentes em /api/ingest (sem token: qualquer agente)
+app.config['COLLECTOR_TOKEN'] = os.environ.get('DISK_ANALYZER_COLLECTOR_TOKEN')
+# Cache de análises e varreduras em andamento, compartilhados entre workers
+# (padrão: ~/.cache/disk-analyzer/web-state.db)
+app.config['STATE_DB'] = os.environ.get('DISK_ANALYZER_STATE_DB')
+app.config['CACHE_TIMEOUT'] = 300
+# Snapshots binários (disk-analyzer --export snapshot) servidos sem varrer
+app.config['SNAPSHOT_DIR'] = os.environ.get('DISK_ANALYZER_SNAPSHOT_DIR')
+# Quanto esperar pela varredura de outro worker antes de varrer também
+app.config['SCAN_WAIT_TIMEOUT'] = 600
 
-# Cache para análises
-analysis_cache = {}
+# Estado compartilhado por banco
+shared_states = {}
+
+# Sugestões de diretórios, listadas em segundo plano
+directory_suggestions = DirectorySuggestions(['/home', '/var', '/usr', '/opt', '/tmp'])
+
+# Índices da frota por diretório de snapshots
+fleet_indexes = {}
+
+
+def get_shared_state() -> SharedState:
+    """Cache compartilhado do STATE_DB configurado, criado no primeiro uso"""
+    db_path = app.config['STATE_DB']
+    if db_path not in shared_states:
+        shared_states[db_path] = SharedState(db_path)
+    return shared_states[db_path]
+
+
+def get_fleet_index() -> FleetIndex:
+    """Índice da frota do COLLECTOR_DIR configurado, criado no primeiro uso"""
+    directory = app.config['COLLECTOR_DIR']
+    if directory not in fleet_indexes:
+        fleet_indexes[directory] = FleetIndex(directory)
+    return fleet_indexes[directory]
 
 
 @app.route('/')
@@ -32,15 +73,34 @@ def index():
     return render_template('index.html')
 
 
-@app.route('/api/analyze', methods=['POST'])
+def parse_flag(value) -> bool:
+    """Booleano do JSON ou da query string ('true', '1', 'on')"""
+    if isinstance(value, str):
+        return value.lower() in ('1', 'true', 'on', 'yes')
+    return bool(value)
+
+
+def cached_response(cached: CachedBody):
+    """Resposta do cache com ETag do snapshot (304 se o cliente já o tem)"""
+    return json_response(cached.body, etag=f"snapshot-{cached.snapshot}",
+                         last_modified=cached.created_at, gzipped=cached.body_gzip)
+
+
+@app.route('/api/analyze', methods=['GET', 'POST'])
 def api_analyze():
-    """API para análise de diretório"""
+    """API para análise de diretório (via GET o navegador revalida com ETag)"""
     try:
-        data = request.get_json()
+        data = request.get_json() if request.method == 'POST' else request.args.to_dict()
+        if data.get('host'):
+            return fleet_dashboard(data['host'], data.get('path'))
+        if data.get('snapshot'):
+            return snapshot_dashboard(data['snapshot'], parse_size_web(data.get('min_size', '0B')))
+        
         path = data.get('path', '/home')
         min_size = parse_size_web(data.get('min_size', '0B'))
         max_depth = int(data.get('max_depth', 5))
-        include_hidden = data.get('include_hidden', False)
+        include_hidden = parse_flag(data.get('include_hidden', False))
+        record = parse_flag(data.get('record', False))
         
         # Verificar se path existe
         if not os.path.exists(path):
@@ -49,38 +109,57 @@ def api_analyze():
         # Criar chave de cache
         cache_key = f"{path}_{min_size}_{max_depth}_{include_hidden}"
         
-        # Verificar cache (válido por 5 minutos)
-        if cache_key in analysis_cache:
-            cached_data, timestamp = analysis_cache[cache_key]
-            if (datetime.now() - timestamp).seconds < 300:
-                return jsonify(cached_data)
+        # Verificar cache (válido por CACHE_TIMEOUT, em todos os workers)
+        state = get_shared_state()
+        cached = state.get(cache_key)
+        claimed = cached is None and state.claim(cache_key)
+        if cached is None and not claimed:
+            # Outro worker já está varrendo o mesmo diretório: usar o resultado dele
+            cached = state.wait(cache_key, app.config['SCAN_WAIT_TIMEOUT'])
+        if cached is not None:
+            return cached_response(cached)
         
-        # Executar análise
-        analyzer = DiskUsageAnalyzer(
-            min_size=min_size,
-            max_depth=max_depth,
-            include_hidden=include_hidden,
-            exclude_patterns=['*.tmp', '.git', '__pycache__', '*.pyc']
-        )
-        
-        stats = analyzer.analyze_directory(path)
-        summary = analyzer.get_summary(stats)
-        
-        # Preparar dados para visualização
-        result = {
-            'summary': summary,
-            'tree_data': prepare_tree_data(stats),
-            'pie_chart': create_pie_chart_data(stats),
-            'treemap_data': create_treemap_data(stats),
-            'large_files': get_large_files_data(stats, min_size * 10),  # 10x maior que min_size
-            'file_types': summary['file_types'],
-            'errors': analyzer.errors[:10]  # Primeiros 10 erros
-        }
-        
-        # Salvar no cache
-        analysis_cache[cache_key] = (result, datetime.now())
+        try:
+            # Executar análise
+            analyzer = DiskUsageAnalyzer(
+                min_size=min_size,
+                max_depth=max_depth,
+                include_hidden=include_hidden,
+                exclude_patterns=['*.tmp', '.git', '__pycache__', '*.pyc'],
+                breakdowns=True
+            )
+            
+            started_at = time.time()
+            stats = analyzer.analyze_directory(path)
+            summary = analyzer.get_summary(stats)
+            
+            if record:
+                with ScanHistory(app.config['HISTORY_DB']) as store:
+                    store.record(stats, started_at=started_at,
+                                 duration=time.time() - started_at, max_depth=max_depth)
+            
+            # Preparar dados para visualização
+            result = {
+                'summary': summary,
+                'tree_data': prepare_tree_data(stats),
+                'pie_chart': create_pie_chart_data(stats),
+                'treemap_data': create_treemap_data(stats),
+                'large_files': get_large_files_data(stats, min_size * 10),  # 10x maior que min_size
+                'file_types': summary['file_types'],
+                'file_type_sizes': summary['file_type_sizes'],
+                'age_labels': AGE_LABELS,
+                'errors': analyzer.errors[:10],  # Até 10 exemplos
+                'errors_summary': analyzer.errors.to_dict()
+            }
+            
+            # Salvar no cache já serializado e comprimido
+            body = dumps(result)
+            cached = state.put(cache_key, body, app.config['CACHE_TIMEOUT'], gzip_body(body))
+        finally:
+            if claimed:
+                state.release(cache_key)
         
-        return jsonify(result)
+        return cached_response(cached)
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
@@ -88,25 +167,20 @@ def api_analyze():
 
 @app.route('/api/directories')
 def api_directories():
-    """API para listar diretórios disponíveis"""
+    """API para listar diretórios disponíveis (cache atualizado em segundo plano)"""
     try:
-        base_paths = ['/home', '/var', '/usr', '/opt', '/tmp']
-        available_dirs = []
+        entries, pending = directory_suggestions.listing()
+        available_dirs = [dict(entry) for entry in entries[:20]]  # Limitar a 20
         
-        for base_path in base_paths:
-            if os.path.exists(base_path) and os.access(base_path, os.R_OK):
-                try:
-                    # Listar subdiretórios
-                    for item in os.listdir(base_path):
-                        full_path = os.path.join(base_path, item)
-                        if os.path.isdir(full_path) and os.access(full_path, os.R_OK):
-                            available_dirs.append({
-                                'path': full_path,
-                                'name': f"{base_path}/{item}",
-                                'readable': True
-                            })
-                except PermissionError:
-                    continue
+        # Tamanho na última varredura gravada no histórico, sem abrir nada no disco
+        history_db = app.config['HISTORY_DB'] or default_history_path()
+        if available_dirs and os.path.exists(history_db):
+            with ScanHistory(history_db) as store:
+                sizes = store.latest_sizes([entry['path'] for entry in available_dirs])
+            for entry in available_dirs:
+                if entry['path'] in sizes:
+                    entry['size'] = sizes[entry['path']]
+                    entry['size_human'] = humanize.naturalsize(sizes[entry['path']])
         
         # Adicionar diretórios comuns
         common_dirs = [
@@ -116,14 +190,208 @@ def api_directories():
         ]
         
         return jsonify({
-            'directories': available_dirs[:20],  # Limitar a 20
-            'common': common_dirs
+            'directories': available_dirs,
+            'common': common_dirs,
+            'pending': pending  # Bases que ainda não responderam
         })
         
     except Exception as e:
         return jsonify({'error': str(e)}), 500
 
 
+@app.route('/api/history/scans')
+def api_history_scans():
+    """API com as varreduras gravadas no histórico"""
+    try:
+        with ScanHistory(app.config['HISTORY_DB']) as store:
+            return jsonify(store.scans(request.args.get('root'),
+                                       request.args.get('limit', 20, type=int)))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/history/growth')
+def api_history_growth():
+    """API com os diretórios que mais cresceram (?days=7&root=/var&limit=20)"""
+    try:
+        with ScanHistory(app.config['HISTORY_DB']) as store:
+            return jsonify(store.growth(request.args.get('days', 7, type=float),
+                                        request.args.get('root'),
+                                        request.args.get('limit', 20, type=int)))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/history/size')
+def api_history_size():
+    """API com o tamanho de um diretório ao longo do tempo (?path=/var/log&days=30)"""
+    path = request.args.get('path')
+    if not path:
+        return jsonify({'error': 'Parâmetro path é obrigatório'}), 400
+    
+    try:
+        with ScanHistory(app.config['HISTORY_DB']) as store:
+            return jsonify(store.size_history(path, request.args.get('days', type=float)))
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/ingest', methods=['POST'])
+def api_ingest():
+    """Recebe o snapshot de um agente (jsonl com gzip, ?host=nome)"""
+    token = app.config['COLLECTOR_TOKEN']
+    if token and request.headers.get('X-Agent-Token') != token:
+        return jsonify({'error': 'Token do agente inválido'}), 401
+    
+    host = request.args.get('host', '')
+    if not valid_host(host):
+        return jsonify({'error': f'Nome de host inválido: {host!r}'}), 400
+    
+    try:
+        roots = get_fleet_index().ingest(host, request.stream)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+    
+    return jsonify({'host': host, 'roots': roots}), 202
+
+
+@app.route('/api/fleet')
+def api_fleet():
+    """API com o resumo da frota: hosts, raízes e último envio"""
+    try:
+        return jsonify(get_fleet_index().overview())
+    except Exception as e:
+        return jsonify({'error': str(e)}), 500
+
+
+@app.route('/api/fleet/<host>')
+def api_fleet_host(host):
+    """API com o painel de uma raiz de um host (?root=/var)"""
+    return fleet_dashboard(host, request.args.get('root'))
+
+
+def fleet_dashboard(host: str, root: str = None):
+    """Monta a resposta de /api/analyze a partir do snapshot de um agente"""
+    if not valid_host(host):
+        return jsonify({'error': f'Nome de host inválido: {host!r}'}), 400
+    
+    try:
+        found = get_fleet_index().find(host, root)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    if found is None:
+        message = f'Sem snapshot de {host}' + (f' para {root}' if root else '')
+        return jsonify({'error': message}), 404
+    
+    header, stats = found
+    received_at = header['received_at']
+    etag = f"fleet-{host}-{int(received_at * 1e6)}"
+    if request.if_none_match.contains_weak(etag):
+        # 304 antes de montar o painel
+        return json_response(b'', etag=etag, last_modified=received_at)
+    
+    # O agente envia o resumo completo no cabeçalho; a árvore só tem totais
+    summary = header.get('summary') or {}
+    return json_response(dumps({
+        'host': host,
+        'timestamp': header.get('timestamp'),
+        'received_at': datetime.fromtimestamp(received_at).isoformat(),
+        'summary': summary,
+        'tree_data': prepare_tree_data(stats),
+        'pie_chart': create_pie_chart_data(stats),
+        'treemap_data': create_treemap_data(stats),
+        'large_files': summary.get('large_files', []),
+        'file_types': summary.get('file_types', {}),
+        'file_type_sizes': summary.get('file_type_sizes', {}),
+        'errors': summary.get('errors', {}).get('sample', []),
+        'errors_summary': summary.get('errors', {})
+    }), etag=etag, last_modified=received_at)
+
+
+@app.route('/api/snapshots')
+def api_snapshots():
+    """API com os snapshots disponíveis no SNAPSHOT_DIR"""
+    directory = app.config['SNAPSHOT_DIR']
+    if not directory or not os.path.isdir(directory):
+        return jsonify([])
+    
+    snapshots = []
+    with os.scandir(directory) as it:
+        for entry in it:
+            if entry.name.endswith(SNAPSHOT_SUFFIX) and entry.is_file():
+                info = entry.stat()
+                snapshots.append({
+                    'name': entry.name,
+                    'size': info.st_size,
+                    'modified': datetime.fromtimestamp(info.st_mtime).isoformat()
+                })
+    snapshots.sort(key=lambda item: item['modified'], reverse=True)
+    return jsonify(snapshots)
+
+
+def snapshot_dashboard(name: str, min_size: int = 0):
+    """Monta a resposta de /api/analyze a partir de um snapshot do SNAPSHOT_DIR"""
+    directory = app.config['SNAPSHOT_DIR']
+    # Só nomes de arquivo: nada fora do SNAPSHOT_DIR
+    if not directory or os.path.basename(name) != name or not name.endswith(SNAPSHOT_SUFFIX):
+        return jsonify({'error': f'Snapshot inválido: {name!r}'}), 400
+    
+    path = os.path.join(directory, name)
+    try:
+        info = os.stat(path)
+    except FileNotFoundError:
+        return jsonify({'error': f'Snapshot não encontrado: {name}'}), 404
+    
+    etag = f"dusnap-{info.st_ino}-{info.st_mtime_ns}-{info.st_size}"
+    if request.if_none_match.contains_weak(etag):
+        return json_response(b'', etag=etag, last_modified=info.st_mtime)
+    
+    try:
+        snapshot = Snapshot(path)
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+    
+    # Só os primeiros níveis são lidos do mmap
+    with snapshot:
+        stats = snapshot.stats()
+        summary = snapshot.summary or {}
+        large_files = summary.get('large_files')
+        if large_files is None:
+            large_files = [
+                {
+                    'path': file_info.path,
+                    'name': file_info.name,
+                    'size': file_info.size,
+                    'size_human': humanize.naturalsize(file_info.size),
+                    'modified': file_info.modified.isoformat()
+                }
+                for file_info in snapshot.largest_files(min_size * 10)
+            ]
+        body = dumps({
+            'snapshot': name,
+            'timestamp': snapshot.timestamp,
+            'summary': summary,
+            'tree_data': prepare_tree_data(stats),
+            'pie_chart': create_pie_chart_data(stats),
+            'treemap_data': create_treemap_data(stats, max_depth=3),
+            'large_files': large_files,
+            'file_types': summary.get('file_types', {}),
+            'file_type_sizes': summary.get('file_type_sizes', {}),
+            'errors': [],
+            'errors_summary': {}
+        })
+    return json_response(body, etag=etag, last_modified=info.st_mtime)
+
+
+def largest_children(stats: DirectoryStats, count: int) -> list:
+    """Os count maiores filhos (os de snapshot já vêm ordenados)"""
+    if getattr(stats.children, 'ordered', False):
+        return stats.children[:count]
+    return sorted(stats.children, key=lambda x: x.total_size, reverse=True)[:count]
+
+
 def prepare_tree_data(stats: DirectoryStats, max_depth: int = 3) -> list:
     """Prepara dados da árvore para visualização"""
     def build_tree_node(dir_stats: DirectoryStats, depth: int = 0) -> dict:
@@ -137,11 +405,14 @@ def prepare_tree_data(stats: DirectoryStats, max_depth: int = 3) -> list:
             'children': []
         }
         
+        # Idade e donos de cada diretório, para o painel trocar sem nova requisição
+        if dir_stats.age_sizes is not None:
+            node['age_sizes'] = list(dir_stats.age_sizes)
+            node['owners'] = owner_breakdown(dir_stats, limit=10)
+        
         if depth < max_depth and dir_stats.children:
             # Ordenar filhos por tamanho e pegar os maiores
-            sorted_children = sorted(dir_stats.children, 
-                                   key=lambda x: x.total_size, 
-                                   reverse=True)[:10]
+            sorted_children = largest_children(dir_stats, 10)
             
             for child in sorted_children:
                 node['children'].append(build_tree_node(child, depth + 1))
@@ -157,9 +428,7 @@ def create_pie_chart_data(stats: DirectoryStats) -> dict:
         return {}
     
     # Pegar os 10 maiores diretórios
-    sorted_children = sorted(stats.children, 
-                           key=lambda x: x.total_size, 
-                           reverse=True)[:10]
+    sorted_children = largest_children(stats, 10)
     
     labels = []
     values = []
@@ -183,13 +452,13 @@ def create_pie_chart_data(stats: DirectoryStats) -> dict:
     }
 
 
-def create_treemap_data(stats: DirectoryStats) -> dict:
-    """Cria dados para treemap"""
+def create_treemap_data(stats: DirectoryStats, max_depth: int = None) -> dict:
+    """Cria dados para treemap (max_depth limita os níveis; None percorre todos)"""
     labels = []
     values = []
     parents = []
     
-    def add_to_treemap(dir_stats: DirectoryStats, parent_name: str = ""):
+    def add_to_treemap(dir_stats: DirectoryStats, parent_name: str = "", depth: int = 0):
         current_name = Path(dir_stats.path).name or "root"
         full_name = f"{parent_name}/{current_name}" if parent_name else current_name
         
@@ -198,13 +467,11 @@ def create_treemap_data(stats: DirectoryStats) -> dict:
         parents.append(parent_name)
         
         # Adicionar filhos (limitado aos maiores)
-        if dir_stats.children:
-            sorted_children = sorted(dir_stats.children, 
-                                   key=lambda x: x.total_size, 
-                                   reverse=True)[:8]
+        if dir_stats.children and (max_depth is None or depth < max_depth):
+            sorted_children = largest_children(dir_stats, 8)
             
             for child in sorted_children:
-                add_to_treemap(child, full_name)
+                add_to_treemap(child, full_name, depth + 1)
     
     add_to_treemap(stats)
     
@@ -217,17 +484,19 @@ def create_treemap_data(stats: DirectoryStats) -> dict:
 
 def get_large_files_data(stats: DirectoryStats, threshold: int) -> list:
     """Obtém dados dos arquivos grandes"""
-    large_files = []
+    large_files = {}
     
     def collect_large_files(dir_stats: DirectoryStats):
+        # O maior arquivo de um diretório se repete nos ancestrais
         if dir_stats.largest_file and dir_stats.largest_file.size >= threshold:
-            large_files.append({
+            large_files[dir_stats.largest_file.path] = {
                 'path': dir_stats.largest_file.path,
                 'name': dir_stats.largest_file.name,
                 'size': dir_stats.largest_file.size,
                 'size_human': humanize.naturalsize(dir_stats.largest_file.size),
-                'modified': dir_stats.largest_file.modified.isoformat() if hasattr(dir_stats.largest_file, 'modified') else None
-            })
+                'modified': (dir_stats.largest_file.modified.isoformat()
+                             if hasattr(dir_stats.largest_file, 'modified') else None)
+            }
         
         for child in dir_stats.children:
             collect_large_files(child)
@@ -235,7 +504,7 @@ def get_large_files_data(stats: DirectoryStats, threshold: int) -> list:
     collect_large_files(stats)
     
     # Ordenar por tamanho e retornar os 20 maiores
-    return sorted(large_files, key=lambda x: x['size'], reverse=True)[:20]
+    return sorted(large_files.values(), key=lambda x: x['size'], reverse=True)[:20]
 
 
 def parse_size_web(size_str: str) -> int:
@@ -281,6 +550,45 @@ def internal_error(error):
     return jsonify({'error': 'Erro interno do servidor'}), 500
 
 
+def run_production(host: str, port: int, workers: int, threads: int):
+    """
+    Serve com um servidor WSGI de produção (extra 'web' do setup.py)
+    
+    O gunicorn roda vários processos; o waitress (também no Windows/WSL)
+    roda um processo com várias threads. Nos dois casos o cache e as
+    varreduras em andamento ficam no STATE_DB, compartilhados.
+    """
+    try:
+        from gunicorn.app.base import BaseApplication
+    except ImportError:
+        BaseApplication = None
+    
+    if BaseApplication is not None:
+        class GunicornApp(BaseApplication):
+            def load_config(self):
+                self.cfg.set('bind', f"{host}:{port}")
+                self.cfg.set('workers', workers)
+                self.cfg.set('threads', threads)
+                # Varreduras longas não podem derrubar o worker
+                self.cfg.set('timeout', 0)
+            
+            def load(self):
+                return app
+        
+        print(f"🦄 gunicorn: {workers} processo(s) x {threads} thread(s)")
+        GunicornApp().run()
+        return
+    
+    try:
+        import waitress
+    except ImportError:
+        sys.exit("Servidor de produção indisponível: "
+                 "instale com pip install .[web] (gunicorn ou waitress)")
+    
+    print(f"🍽️ waitress: {workers * threads} thread(s)")
+    waitress.serve(app, host=host, port=port, threads=workers * threads)
+
+
 def main():
     """Função principal para executar o servidor web"""
     import argparse
@@ -289,13 +597,31 @@ def main():
     parser.add_argument('--host', default='127.0.0.1', help='Host para bind')
     parser.add_argument('--port', type=int, default=8080, help='Porta para bind')
     parser.add_argument('--debug', action='store_true', help='Modo debug')
+    parser.add_argument('--collector-dir', help='Diretório dos snapshots recebidos dos agentes')
+    parser.add_argument('--production', action='store_true',
+                        help='Servidor WSGI com vários workers (gunicorn ou waitress)')
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 2,
+                        help='Processos do servidor de produção')
+    parser.add_argument('--threads', type=int, default=4, help='Threads por processo')
+    parser.add_argument('--state-db', help='Banco SQLite do cache compartilhado entre workers')
+    parser.add_argument('--snapshot-dir',
+                        help='Diretório com snapshots .dusnap servidos sem varrer')
     
     args = parser.parse_args()
+    if args.collector_dir:
+        app.config['COLLECTOR_DIR'] = args.collector_dir
+    if args.state_db:
+        app.config['STATE_DB'] = args.state_db
+    if args.snapshot_dir:
+        app.config['SNAPSHOT_DIR'] = args.snapshot_dir
     
     print(f"🌐 Iniciando servidor web em http://{args.host}:{args.port}")
     print("📊 Interface de análise de disco disponível!")
     
-    app.run(host=args.host, port=args.port, debug=args.debug)
+    if args.production:
+        run_production(args.host, args.port, args.workers, args.threads)
+    else:
+        app.run(host=args.host, port=args.port, debug=args.debug)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Collector
+Recebe snapshots dos agentes e mantém o índice da frota
+"""
+
+import gzip
+import os
+import re
+import tempfile
+import threading
+import time
+from itertools import chain
+from pathlib import Path
+from typing import Dict, IO, List, Optional, Tuple
+
+from analyzer.core import DirectoryStats
+from analyzer.serialization import JSONL_FORMAT, read_jsonl
+
+
+# Nome do host vira nome de arquivo: só caracteres seguros
+_HOST_PATTERN = re.compile(r'^[A-Za-z0-9][A-Za-z0-9._-]{0,252}$')
+
+
+def valid_host(host: str) -> bool:
+    """Verifica se o nome de host pode ser usado como nome de snapshot"""
+    return bool(host) and _HOST_PATTERN.match(host) is not None
+
+
+def default_collector_dir() -> Path:
+    """Diretório padrão dos snapshots ($XDG_DATA_HOME/disk-analyzer/fleet)"""
+    data_home = os.environ.get('XDG_DATA_HOME') or os.path.join(Path.home(), '.local', 'share')
+    return Path(data_home) / 'disk-analyzer' / 'fleet'
+
+
+class FleetIndex:
+    """
+    Último snapshot de cada (host, raiz), guardado em disco
+
+    Cada host tem um arquivo <host>.jsonl.gz com todas as suas raízes. As
+    árvores são reconstruídas sob demanda e mantidas em memória enquanto
+    o arquivo não mudar (mtime), então vários processos podem servir o
+    mesmo diretório.
+    """
+
+    def __init__(self, directory: Optional[str] = None, max_snapshot_bytes: int = 1024 ** 3):
+        self.directory = Path(directory or default_collector_dir())
+        self.max_snapshot_bytes = max_snapshot_bytes
+        self._loaded: Dict[str, Tuple[float, List[Tuple[dict, DirectoryStats]]]] = {}
+        self._lock = threading.Lock()
+
+    def _snapshot_file(self, host: str) -> Path:
+        if not valid_host(host):
+            raise ValueError(f"Nome de host inválido: {host!r}")
+        return self.directory / f"{host}.jsonl.gz"
+
+    def ingest(self, host: str, stream: IO[bytes]) -> List[str]:
+        """
+        Grava o snapshot (jsonl comprimido com gzip) de um host
+
+        O corpo é validado por inteiro antes de substituir o snapshot
+        anterior. Retorna as raízes recebidas.
+        """
+        snapshot = self._snapshot_file(host)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        fd, tmp_name = tempfile.mkstemp(dir=self.directory, suffix='.tmp')
+        try:
+            with os.fdopen(fd, 'wb') as tmp:
+                received = 0
+                for chunk in iter(lambda: stream.read(65536), b''):
+                    received += len(chunk)
+                    if received > self.max_snapshot_bytes:
+                        raise ValueError("Snapshot maior que o limite do collector")
+                    tmp.write(chunk)
+
+            roots = self._parse(tmp_name, host)
+            if not roots:
+                raise ValueError("Snapshot sem raízes")
+            os.replace(tmp_name, snapshot)
+        except BaseException:
+            os.unlink(tmp_name)
+            raise
+
+        with self._lock:
+            self._loaded.pop(host, None)
+        return [stats.path for _, stats in roots]
+
+    def _parse(self, file_name: str, host: str) -> List[Tuple[dict, DirectoryStats]]:
+        try:
+            with gzip.open(file_name, 'rt', encoding='utf-8') as f:
+                first = f.readline()
+                if JSONL_FORMAT not in first:
+                    raise ValueError("Snapshot não é um export jsonl do disk-analyzer")
+                roots = list(read_jsonl(chain([first], f)))
+        except (OSError, EOFError, KeyError) as e:
+            raise ValueError(f"Snapshot inválido: {e!r}")
+
+        for header, _ in roots:
+            header['host'] = host
+        return roots
+
+    def host_roots(self, host: str) -> List[Tuple[dict, DirectoryStats]]:
+        """Cabeçalhos e árvores do último snapshot do host"""
+        snapshot = self._snapshot_file(host)
+        try:
+            mtime = snapshot.stat().st_mtime
+        except FileNotFoundError:
+            return []
+
+        with self._lock:
+            cached = self._loaded.get(host)
+            if cached and cached[0] == mtime:
+                return cached[1]
+
+        roots = self._parse(str(snapshot), host)
+        for header, _ in roots:
+            header['received_at'] = mtime
+        with self._lock:
+            self._loaded[host] = (mtime, roots)
+        return roots
+
+    def hosts(self) -> List[str]:
+        """Hosts com snapshot"""
+        if not self.directory.exists():
+            return []
+        return sorted(snapshot.name[:-len('.jsonl.gz')]
+                      for snapshot in self.directory.glob('*.jsonl.gz'))
+
+    def find(self, host: str, root: Optional[str] = None) -> Optional[Tuple[dict, DirectoryStats]]:
+        """Snapshot de uma raiz do host (a primeira se root for None)"""
+        for header, stats in self.host_roots(host):
+            if root is None or stats.path == root:
+                return header, stats
+        return None
+
+    def overview(self) -> Dict:
+        """Resumo da frota: raízes por host e totais"""
+        hosts = []
+        fleet_total = 0
+        for host in self.hosts():
+            snapshots = self.host_roots(host)
+            roots = []
+            for header, stats in snapshots:
+                roots.append({
+                    'path': stats.path,
+                    'total_size': stats.total_size,
+                    'file_count': stats.file_count,
+                    'timestamp': header.get('timestamp'),
+                })
+                fleet_total += stats.total_size
+            received = snapshots[0][0]['received_at'] if snapshots else None
+            hosts.append({
+                'host': host,
+                'roots': roots,
+                'received_at': (time.strftime('%Y-%m-%dT%H:%M:%S', time.localtime(received))
+                                if received else None),
+            })
+        return {'hosts': hosts, 'host_count': len(hosts), 'total_size': fleet_total}
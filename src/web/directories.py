@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Directory Suggestions
+Listagem dos diretórios sugeridos na interface web, atualizada em segundo
+plano para que uma montagem lenta não trave a página
+"""
+
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+
+
+def list_subdirectories(base_path: str) -> List[Dict]:
+    """Subdiretórios legíveis de base_path (scandir: sem stat extra por entrada)"""
+    entries = []
+    with os.scandir(base_path) as it:
+        for entry in it:
+            try:
+                if entry.is_dir() and os.access(entry.path, os.R_OK):
+                    entries.append({
+                        'path': entry.path,
+                        'name': f"{base_path}/{entry.name}",
+                        'readable': True
+                    })
+            except OSError:
+                continue
+    entries.sort(key=lambda item: item['path'])
+    return entries
+
+
+class DirectorySuggestions:
+    """
+    Cache dos subdiretórios de cada caminho base
+
+    Cada base é listada na sua própria thread: uma montagem NFS travada
+    só atrasa a sua entrada, e a próxima listagem dela não começa enquanto
+    a anterior não voltar. As requisições nunca esperam mais que timeout;
+    depois de refresh_interval a lista é atualizada em segundo plano e a
+    versão anterior continua sendo servida.
+    """
+
+    def __init__(self, base_paths: List[str], refresh_interval: float = 60,
+                 timeout: float = 2.0):
+        self.base_paths = list(base_paths)
+        self.refresh_interval = refresh_interval
+        self.timeout = timeout
+        # base -> (entradas, instante da listagem)
+        self._listings: Dict[str, Tuple[List[Dict], float]] = {}
+        self._running: Dict[str, threading.Event] = {}
+        self._lock = threading.Lock()
+
+    def _refresh(self, base_path: str, done: threading.Event):
+        try:
+            if os.path.isdir(base_path) and os.access(base_path, os.R_OK):
+                entries = list_subdirectories(base_path)
+            else:
+                entries = []
+        except OSError:
+            entries = []
+        with self._lock:
+            self._listings[base_path] = (entries, time.monotonic())
+            del self._running[base_path]
+        done.set()
+
+    def _start_refresh(self, base_path: str) -> threading.Event:
+        # Chamado com o lock
+        done = self._running.get(base_path)
+        if done is None:
+            done = self._running[base_path] = threading.Event()
+            threading.Thread(target=self._refresh, args=(base_path, done),
+                             name=f"list {base_path}", daemon=True).start()
+        return done
+
+    def listing(self, now: Optional[float] = None) -> Tuple[List[Dict], List[str]]:
+        """
+        Subdiretórios de todas as bases e as bases ainda sem listagem
+
+        Bases nunca listadas são esperadas por até timeout (em paralelo);
+        as que não responderem aparecem em pending.
+        """
+        now = time.monotonic() if now is None else now
+        waiting = []
+        with self._lock:
+            for base_path in self.base_paths:
+                cached = self._listings.get(base_path)
+                if cached is None or now - cached[1] >= self.refresh_interval:
+                    done = self._start_refresh(base_path)
+                    if cached is None:
+                        waiting.append(done)
+
+        deadline = time.monotonic() + self.timeout
+        for done in waiting:
+            done.wait(max(0.0, deadline - time.monotonic()))
+
+        entries, pending = [], []
+        with self._lock:
+            for base_path in self.base_paths:
+                cached = self._listings.get(base_path)
+                if cached is None:
+                    pending.append(base_path)
+                else:
+                    entries.extend(cached[0])
+        return entries, pending
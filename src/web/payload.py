@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - HTTP Payloads
+Serialização rápida, validadores (ETag/Last-Modified) e compressão das
+respostas JSON da interface web
+
+orjson e brotli são opcionais: sem eles, json da biblioteca padrão e gzip.
+"""
+
+import gzip
+import json
+from datetime import datetime, timezone
+from typing import Any, Optional
+
+from flask import Response, request
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+
+# Respostas menores que isso não compensam a compressão
+MIN_COMPRESS_SIZE = 1024
+GZIP_LEVEL = 6
+BROTLI_QUALITY = 5
+
+
+def dumps(data: Any) -> bytes:
+    """Serializa para JSON em UTF-8 (orjson se disponível)"""
+    if orjson is not None:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(data, ensure_ascii=False, default=str).encode('utf-8')
+
+
+def loads(body: bytes) -> Any:
+    """Lê JSON gravado por dumps"""
+    if orjson is not None:
+        return orjson.loads(body)
+    return json.loads(body)
+
+
+def gzip_body(body: bytes) -> Optional[bytes]:
+    """Versão gzip do corpo, ou None se for pequeno demais para valer a pena"""
+    if len(body) < MIN_COMPRESS_SIZE:
+        return None
+    return gzip.compress(body, compresslevel=GZIP_LEVEL, mtime=0)
+
+
+def _accepts(encoding: str) -> bool:
+    return request.accept_encodings[encoding] > 0
+
+
+def json_response(body: bytes, status: int = 200, etag: Optional[str] = None,
+                  last_modified: Optional[float] = None, gzipped: Optional[bytes] = None,
+                  max_age: int = 0) -> Response:
+    """
+    Resposta JSON com validadores e corpo comprimido conforme Accept-Encoding
+
+    Com etag, um If-None-Match igual (também em POST) recebe 304 sem
+    corpo. gzipped é a versão gzip já pronta (ex: guardada no cache);
+    sem ela o gzip é feito na hora.
+    """
+    if etag is not None:
+        if request.if_none_match.contains_weak(etag):
+            return _not_modified(etag, last_modified, max_age)
+        if (last_modified is not None and not request.if_none_match
+                and request.if_modified_since is not None
+                and int(last_modified) <= request.if_modified_since.timestamp()):
+            return _not_modified(etag, last_modified, max_age)
+
+    encoding = None
+    if len(body) >= MIN_COMPRESS_SIZE:
+        if brotli is not None and _accepts('br'):
+            body, encoding = brotli.compress(body, quality=BROTLI_QUALITY), 'br'
+        elif _accepts('gzip'):
+            body, encoding = gzipped or gzip_body(body), 'gzip'
+
+    response = Response(body, status=status, mimetype='application/json')
+    if encoding:
+        response.headers['Content-Encoding'] = encoding
+    response.vary.add('Accept-Encoding')
+    _set_validators(response, etag, last_modified, max_age)
+    return response
+
+
+def _not_modified(etag: str, last_modified: Optional[float], max_age: int) -> Response:
+    response = Response(status=304)
+    response.vary.add('Accept-Encoding')
+    _set_validators(response, etag, last_modified, max_age)
+    return response
+
+
+def _set_validators(response: Response, etag: Optional[str], last_modified: Optional[float],
+                    max_age: int):
+    if etag is None:
+        return
+    # Fraca: a mesma ETag vale para as versões gzip, br e sem compressão
+    response.set_etag(etag, weak=True)
+    if last_modified is not None:
+        response.last_modified = datetime.fromtimestamp(int(last_modified), timezone.utc)
+    # O navegador guarda a resposta e revalida com If-None-Match
+    response.cache_control.private = True
+    response.cache_control.max_age = max_age
+    response.cache_control.must_revalidate = True
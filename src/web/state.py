@@ -0,0 +1,151 @@
+#!/usr/bin/env python3
+"""
+Disk Usage Analyzer - Shared State
+Cache de análises e estado das varreduras compartilhados entre workers
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import NamedTuple, Optional
+
+
+SCHEMA_VERSION = 2
+
+# O cache guarda o corpo da resposta já serializado (e a versão gzip), para
+# servir sem reprocessar; cada gravação ganha um snapshot novo (AUTOINCREMENT
+# nunca reutiliza ids), que vira a ETag. jobs marca a varredura em andamento
+# de cada chave, para que outro worker espere por ela em vez de repeti-la.
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache (
+    snapshot INTEGER PRIMARY KEY AUTOINCREMENT,
+    key TEXT NOT NULL UNIQUE,
+    body BLOB NOT NULL,
+    body_gzip BLOB,
+    created_at REAL NOT NULL,
+    expires_at REAL NOT NULL
+);
+CREATE TABLE IF NOT EXISTS jobs (
+    key TEXT PRIMARY KEY,
+    owner TEXT NOT NULL,
+    started_at REAL NOT NULL
+);
+"""
+
+
+class CachedBody(NamedTuple):
+    """Resposta em cache"""
+    snapshot: int
+    body: bytes
+    body_gzip: Optional[bytes]
+    created_at: float
+
+
+def default_state_path() -> Path:
+    """Banco de estado padrão ($XDG_CACHE_HOME/disk-analyzer/web-state.db)"""
+    cache_home = os.environ.get('XDG_CACHE_HOME') or os.path.join(Path.home(), '.cache')
+    return Path(cache_home) / 'disk-analyzer' / 'web-state.db'
+
+
+class SharedState:
+    """
+    Cache e jobs em SQLite (WAL), visíveis para todos os workers
+
+    Processos do gunicorn e threads do waitress abrem o mesmo arquivo;
+    cada thread usa a sua própria conexão.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, job_timeout: float = 3600):
+        self.db_path = str(db_path or default_state_path())
+        self.job_timeout = job_timeout
+        self.owner = str(os.getpid())
+        Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        conn = self.conn
+        if conn.execute("PRAGMA user_version").fetchone()[0] < SCHEMA_VERSION:
+            # É só cache: versões antigas são descartadas
+            conn.executescript("BEGIN IMMEDIATE; DROP TABLE IF EXISTS cache;" + _SCHEMA
+                               + f"PRAGMA user_version={SCHEMA_VERSION}; COMMIT;")
+
+    @property
+    def conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key: str, now: Optional[float] = None) -> Optional[CachedBody]:
+        """Resposta em cache para a chave, se ainda válida"""
+        now = time.time() if now is None else now
+        row = self.conn.execute(
+            "SELECT snapshot, body, body_gzip, created_at FROM cache "
+            "WHERE key = ? AND expires_at > ?",
+            (key, now)).fetchone()
+        if row is None:
+            return None
+        return CachedBody(*row)
+
+    def put(self, key: str, body: bytes, ttl: float, body_gzip: Optional[bytes] = None,
+            now: Optional[float] = None) -> CachedBody:
+        """Grava a resposta; o snapshot muda a cada gravação"""
+        now = time.time() if now is None else now
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM cache WHERE expires_at <= ?", (now,))
+            snapshot = conn.execute(
+                "INSERT OR REPLACE INTO cache (key, body, body_gzip, created_at, expires_at) "
+                "VALUES (?, ?, ?, ?, ?)", (key, body, body_gzip, now, now + ttl)).lastrowid
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return CachedBody(snapshot, body, body_gzip, now)
+
+    def claim(self, key: str, now: Optional[float] = None) -> bool:
+        """
+        Reserva a varredura da chave para este worker
+
+        Retorna False se outro worker já a está executando. Reservas mais
+        antigas que job_timeout (worker morto) são retomadas.
+        """
+        now = time.time() if now is None else now
+        conn = self.conn
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            conn.execute("DELETE FROM jobs WHERE key = ? AND started_at < ?",
+                         (key, now - self.job_timeout))
+            claimed = conn.execute("INSERT OR IGNORE INTO jobs VALUES (?, ?, ?)",
+                                   (key, self.owner, now)).rowcount == 1
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+        return claimed
+
+    def release(self, key: str):
+        """Libera a reserva (com ou sem resultado gravado)"""
+        self.conn.execute("DELETE FROM jobs WHERE key = ?", (key,))
+
+    def running(self, key: str) -> bool:
+        return self.conn.execute("SELECT 1 FROM jobs WHERE key = ?", (key,)).fetchone() is not None
+
+    def wait(self, key: str, timeout: float, poll: float = 0.2) -> Optional[CachedBody]:
+        """Espera o worker que reservou a chave gravar o resultado"""
+        deadline = time.monotonic() + timeout
+        while True:
+            cached = self.get(key)
+            if cached is not None or not self.running(key) or time.monotonic() >= deadline:
+                return cached
+            time.sleep(poll)
+
+    def close(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
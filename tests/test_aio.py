@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Testes para a API assíncrona do analisador
+"""
+
+import unittest
+import asyncio
+import tempfile
+import os
+import sys
+import shutil
+import threading
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer, ScanCancelled
+from analyzer.metrics import ScanMetrics
+
+
+class TestAsyncAnalyzer(unittest.TestCase):
+    """Testes para analyze_directory_async e iter_directory_async"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for d in range(4):
+            sub = os.path.join(self.temp_dir, f"dir{d}", "nested")
+            os.makedirs(sub)
+            for f in range(3):
+                with open(os.path.join(sub, f"file{f}.txt"), 'w') as fh:
+                    fh.write("x" * (d * 10 + f))
+        with open(os.path.join(self.temp_dir, "root.py"), 'w') as fh:
+            fh.write("print('ok')")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_sync(self):
+        """Resultado assíncrono deve ser igual ao síncrono"""
+        sync_analyzer = DiskUsageAnalyzer()
+        expected = sync_analyzer.analyze_directory(self.temp_dir)
+
+        async_analyzer = DiskUsageAnalyzer(metrics=ScanMetrics())
+        stats = asyncio.run(async_analyzer.analyze_directory_async(self.temp_dir, max_in_flight=2))
+
+        self.assertEqual(stats.total_size, expected.total_size)
+        self.assertEqual(stats.file_count, expected.file_count)
+        self.assertEqual(stats.dir_count, expected.dir_count)
+        self.assertEqual(stats.file_types, expected.file_types)
+        self.assertEqual([c.path for c in stats.children], [c.path for c in expected.children])
+        self.assertEqual(async_analyzer.total_files_scanned, sync_analyzer.total_files_scanned)
+        self.assertEqual(async_analyzer.metrics.counters['directories'], 8)
+
+    def test_progress_from_subtrees(self):
+        """Subárvores dos filhos atualizam o progresso do pai"""
+        expected = []
+        stats = DiskUsageAnalyzer(progress_callback=expected.append,
+                                  progress_interval_ms=0).analyze_directory(self.temp_dir)
+
+        reports = []
+        analyzer = DiskUsageAnalyzer(progress_callback=reports.append, progress_interval_ms=0)
+        asyncio.run(analyzer.analyze_directory_async(self.temp_dir, max_in_flight=2))
+
+        self.assertEqual(len(reports), len(expected))
+        self.assertIn(os.path.join(self.temp_dir, "dir3", "nested"),
+                      [report.current_path for report in reports])
+        final = reports[-1]
+        self.assertEqual((final.entries, final.bytes, final.dirs_done, final.dirs_queued),
+                         (expected[-1].entries, expected[-1].bytes, stats.dir_count + 1, 0))
+        self.assertEqual(final.current_path, self.temp_dir)
+
+    def test_iterator_yields_subtrees_then_root(self):
+        """Iterador deve emitir as subárvores e por último a raiz"""
+        async def collect():
+            return [s async for s in DiskUsageAnalyzer().iter_directory_async(self.temp_dir)]
+
+        items = asyncio.run(collect())
+
+        self.assertEqual(len(items), 5)
+        self.assertEqual(items[-1].path, self.temp_dir)
+        self.assertEqual(sorted(s.path for s in items[:-1]),
+                         sorted(os.path.join(self.temp_dir, f"dir{d}") for d in range(4)))
+
+    def test_event_loop_stays_responsive(self):
+        """Outras coroutines devem rodar durante a análise"""
+        async def run():
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    ticks += 1
+                    await asyncio.sleep(0)
+
+            task = asyncio.ensure_future(ticker())
+            await DiskUsageAnalyzer().analyze_directory_async(self.temp_dir)
+            task.cancel()
+            return ticks
+
+        self.assertGreater(asyncio.run(run()), 0)
+
+    def test_cancellation(self):
+        """Cancelar a task deve interromper a varredura"""
+        async def run():
+            analyzer = DiskUsageAnalyzer()
+            release = threading.Event()
+            original = analyzer._spawn
+
+            def slow_spawn():
+                child = original()
+                read = child._read_directory
+
+                def blocked(*args):
+                    release.wait(5)
+                    return read(*args)
+
+                child._read_directory = blocked
+                return child
+
+            analyzer._spawn = slow_spawn
+            task = asyncio.ensure_future(analyzer.analyze_directory_async(self.temp_dir))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+            release.set()
+
+        asyncio.run(run())
+
+    def test_sync_cancel(self):
+        """cancel() deve interromper a análise síncrona"""
+        analyzer = DiskUsageAnalyzer()
+        analyzer.cancel()
+        with self.assertRaises(ScanCancelled):
+            analyzer.analyze_directory(self.temp_dir)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
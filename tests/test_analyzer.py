@@ -174,6 +174,86 @@ class TestDiskUsageAnalyzer(unittest.TestCase):
         for field in required_fields:
             self.assertIn(field, summary)
     
+    def test_progress_callback(self):
+        """Testar callback de progresso"""
+        self.create_test_files()
+        
+        reports = []
+        analyzer = DiskUsageAnalyzer(include_hidden=True,
+                                     progress_callback=reports.append,
+                                     progress_interval_ms=0)
+        stats = analyzer.analyze_directory(self.temp_dir)
+        
+        # Um relatório por diretório mais o relatório final forçado
+        self.assertEqual(len(reports), stats.dir_count + 2)
+        final = reports[-1]
+        self.assertEqual(final.entries, 7)
+        self.assertEqual(final.dirs_queued, 0)
+        self.assertEqual(final.dirs_done, stats.dir_count + 1)
+        self.assertEqual(final.current_path, self.temp_dir)
+    
+    def test_progress_throttled(self):
+        """Testar limitação de frequência do progresso"""
+        self.create_test_files()
+        
+        reports = []
+        analyzer = DiskUsageAnalyzer(progress_callback=reports.append,
+                                     progress_interval_ms=60000)
+        analyzer.analyze_directory(self.temp_dir)
+        
+        # Primeiro relatório e relatório final
+        self.assertEqual(len(reports), 2)
+    
+    def test_symlinks_not_followed(self):
+        """Links simbólicos são entradas próprias e não são percorridos"""
+        self.create_test_files()
+        os.symlink(os.path.join(self.temp_dir, "dir1"), os.path.join(self.temp_dir, "link_dir"))
+        os.symlink(os.path.join(self.temp_dir, "file1.txt"), os.path.join(self.temp_dir, "link_file"))
+        
+        stats = self.analyzer.analyze_directory(self.temp_dir)
+        
+        self.assertEqual(stats.file_count, 4)
+        self.assertEqual(stats.dir_count, 3)
+        self.assertEqual(stats.symlink_count, 2)
+        self.assertNotIn('symlink', stats.file_types)
+    
+    def test_follow_symlinks_without_repeats(self):
+        """Seguindo links, cada diretório é percorrido uma única vez"""
+        self.create_test_files()
+        os.symlink(os.path.join(self.temp_dir, "dir1"), os.path.join(self.temp_dir, "dir2", "link_dir1"))
+        # Ciclo: subdir1 aponta para a raiz
+        os.symlink(self.temp_dir, os.path.join(self.temp_dir, "dir1", "subdir1", "loop"))
+        os.symlink("/caminho/inexistente", os.path.join(self.temp_dir, "broken"))
+        
+        analyzer = DiskUsageAnalyzer(max_depth=50, include_hidden=True, follow_symlinks=True)
+        stats = analyzer.analyze_directory(self.temp_dir)
+        
+        self.assertEqual(stats.file_count, 4)
+        self.assertEqual(stats.symlink_count, 1)
+        self.assertEqual(len(analyzer.errors), 0)
+    
+    def test_sparse_files(self):
+        """Arquivos esparsos devem registrar o espaço alocado"""
+        from analyzer.core import measure_data_size
+        
+        sparse_path = os.path.join(self.temp_dir, "disk.img")
+        with open(sparse_path, 'wb') as f:
+            f.seek(64 * 1024 * 1024)
+            f.write(b'x' * 4096)
+        with open(os.path.join(self.temp_dir, "dense.bin"), 'wb') as f:
+            f.write(os.urandom(1024 * 1024))
+        
+        if os.stat(sparse_path).st_blocks * 512 >= 64 * 1024 * 1024:
+            self.skipTest("Sistema de arquivos sem suporte a arquivos esparsos")
+        
+        analyzer = DiskUsageAnalyzer(use_allocated_size=True)
+        stats = analyzer.analyze_directory(self.temp_dir)
+        
+        self.assertEqual(stats.sparse_count, 1)
+        self.assertLess(stats.allocated_size, stats.total_size)
+        self.assertEqual(stats.largest_file.name, "dense.bin")
+        self.assertLessEqual(measure_data_size(sparse_path), 64 * 1024)
+    
     def test_find_large_files(self):
         """Testar busca por arquivos grandes"""
         self.create_test_files()
@@ -181,9 +261,65 @@ class TestDiskUsageAnalyzer(unittest.TestCase):
         stats = self.analyzer.analyze_directory(self.temp_dir)
         large_files = self.analyzer.find_large_files(stats, threshold=1)  # 1 byte
         
-        # Deve encontrar arquivos
+        # Deve encontrar arquivos, sem repetir o maior de cada ancestral
         self.assertIsInstance(large_files, list)
         self.assertGreaterEqual(len(large_files), 0)
+        paths = [f.path for f in large_files]
+        self.assertEqual(len(paths), len(set(paths)))
+
+    def test_age_and_owner_breakdowns(self):
+        """Testar bytes por faixa de idade e por dono, agregados até a raiz"""
+        import time
+        from analyzer.core import age_breakdown, owner_breakdown
+
+        self.create_test_files()
+        now = time.time()
+        old_path = os.path.join(self.temp_dir, "dir1", "subdir1", "file3.log")
+        os.utime(old_path, (now - 400 * 86400, now - 400 * 86400))
+        old_size = os.path.getsize(old_path)
+
+        analyzer = DiskUsageAnalyzer(breakdowns=True, reference_time=now)
+        stats = analyzer.analyze_directory(self.temp_dir)
+
+        self.assertEqual(sum(stats.age_sizes), stats.total_size)
+        ages = {entry['label']: entry['bytes'] for entry in age_breakdown(stats)}
+        self.assertEqual(ages['1-2 anos'], old_size)
+        self.assertEqual(ages['< 30 dias'], stats.total_size - old_size)
+        self.assertEqual(owner_breakdown(stats)[0]['uid'], os.getuid())
+        self.assertEqual(owner_breakdown(stats)[0]['bytes'], stats.total_size)
+
+        dir1 = next(child for child in stats.children if child.path.endswith("dir1"))
+        self.assertEqual(dir1.age_sizes[4], old_size)
+
+        # Análise em lote com raiz aninhada: a subárvore entra uma única vez
+        results = DiskUsageAnalyzer(breakdowns=True, reference_time=now).analyze_roots(
+            [self.temp_dir, os.path.join(self.temp_dir, "dir1")])
+        self.assertEqual(list(results[self.temp_dir].age_sizes), list(stats.age_sizes))
+
+        # Sem breakdowns, nada é calculado
+        self.assertIsNone(self.analyzer.analyze_directory(self.temp_dir).age_sizes)
+
+    def test_file_type_sizes(self):
+        """Testar bytes por extensão, iguais na varredura sequencial, em lote e async"""
+        import asyncio
+
+        self.create_test_files()
+        stats = self.analyzer.analyze_directory(self.temp_dir)
+
+        expected = {}
+        for dirpath, _, filenames in os.walk(self.temp_dir):
+            for name in filenames:
+                ext = os.path.splitext(name)[1].lower() or 'no_extension'
+                expected[ext] = expected.get(ext, 0) + os.path.getsize(os.path.join(dirpath, name))
+        self.assertEqual(stats.file_type_sizes, expected)
+        self.assertEqual(set(stats.file_types), set(stats.file_type_sizes))
+        self.assertEqual(sum(stats.file_type_sizes.values()), stats.total_size)
+        self.assertEqual(self.analyzer.get_summary(stats)['file_type_sizes'], expected)
+
+        results = DiskUsageAnalyzer().analyze_roots([self.temp_dir, os.path.join(self.temp_dir, "dir1")])
+        self.assertEqual(results[self.temp_dir].file_type_sizes, expected)
+        async_stats = asyncio.run(DiskUsageAnalyzer().analyze_directory_async(self.temp_dir))
+        self.assertEqual(async_stats.file_type_sizes, expected)
 
 
 class TestFileInfo(unittest.TestCase):
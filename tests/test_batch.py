@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+Testes para a análise de várias raízes
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+
+
+class TestAnalyzeRoots(unittest.TestCase):
+    """Testes para DiskUsageAnalyzer.analyze_roots"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        files = [
+            ("home/user/notes.txt", 100),
+            ("home/user/docs/report.pdf", 2000),
+            ("home/readme.md", 10),
+            ("var/log/syslog", 500),
+        ]
+        for file_path, size in files:
+            full_path = os.path.join(self.temp_dir, file_path)
+            os.makedirs(os.path.dirname(full_path), exist_ok=True)
+            with open(full_path, 'w') as f:
+                f.write("x" * size)
+
+        self.home = os.path.join(self.temp_dir, "home")
+        self.user = os.path.join(self.home, "user")
+        self.var = os.path.join(self.temp_dir, "var")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_matches_single_root_analysis(self):
+        """Cada raiz deve ter os mesmos totais da análise individual"""
+        results = DiskUsageAnalyzer().analyze_roots([self.home, self.var], max_workers=2)
+
+        self.assertEqual(list(results), [self.home, self.var])
+        for path, stats in results.items():
+            expected = DiskUsageAnalyzer().analyze_directory(path)
+            self.assertEqual(stats.total_size, expected.total_size)
+            self.assertEqual(stats.file_count, expected.file_count)
+            self.assertEqual(stats.dir_count, expected.dir_count)
+            self.assertEqual(stats.file_types, expected.file_types)
+
+    def test_progress_from_all_roots(self):
+        """O progresso soma as subárvores de todas as raízes"""
+        reports = []
+        analyzer = DiskUsageAnalyzer(progress_callback=reports.append, progress_interval_ms=0)
+        results = analyzer.analyze_roots([self.home, self.var], max_workers=2)
+
+        final = reports[-1]
+        self.assertIn(os.path.join(self.user, "docs"), [report.current_path for report in reports])
+        self.assertEqual(final.bytes, analyzer.total_size_scanned)
+        self.assertEqual(final.dirs_done, sum(stats.dir_count + 1 for stats in results.values()))
+        self.assertEqual(final.dirs_queued, 0)
+        # home: user, readme.md, notes.txt, docs, report.pdf; var: log, syslog
+        self.assertEqual(final.entries, 7)
+
+    def test_nested_root_scanned_once(self):
+        """Raiz aninhada deve ser analisada uma vez e enxertada na externa"""
+        analyzer = DiskUsageAnalyzer()
+        results = analyzer.analyze_roots([self.home, self.user])
+
+        home = results[self.home]
+        self.assertEqual(home.total_size, 2110)
+        self.assertEqual(home.file_count, 3)
+        self.assertEqual(home.dir_count, 2)
+        self.assertIs(home.children[0], results[self.user])
+        self.assertEqual(results[self.user].total_size, 2100)
+
+        # home: user, readme.md; user: notes.txt, docs; docs: report.pdf
+        self.assertEqual(analyzer.total_files_scanned, 5)
+
+    def test_duplicate_roots(self):
+        """O mesmo diretório por caminhos diferentes é analisado uma vez"""
+        link = os.path.join(self.temp_dir, "var-link")
+        os.symlink(self.var, link)
+
+        analyzer = DiskUsageAnalyzer()
+        results = analyzer.analyze_roots([self.var, link])
+
+        self.assertIs(results[self.var], results[link])
+        self.assertEqual(analyzer.total_files_scanned, 2)
+
+    def test_missing_root(self):
+        """Raiz inexistente deve gerar FileNotFoundError"""
+        with self.assertRaises(FileNotFoundError):
+            DiskUsageAnalyzer().analyze_roots([self.home, "/diretorio/inexistente"])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
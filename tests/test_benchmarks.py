@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Testes para o gerador de árvores sintéticas dos benchmarks
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar benchmarks e src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "benchmarks"))
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from synthetic_tree import SHAPES, generate_tree
+from analyzer.core import DiskUsageAnalyzer
+
+
+class TestSyntheticTree(unittest.TestCase):
+    """Testes para generate_tree"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reproducible(self):
+        """Mesma semente deve gerar a mesma árvore"""
+        first = generate_tree('wide-shallow', os.path.join(self.temp_dir, 'a'), seed=7, scale=0.05)
+        second = generate_tree('wide-shallow', os.path.join(self.temp_dir, 'b'), seed=7, scale=0.05)
+
+        self.assertEqual(first.files, second.files)
+        self.assertEqual(first.apparent_bytes, second.apparent_bytes)
+
+    def test_all_shapes_scan(self):
+        """Todas as árvores devem ser analisáveis"""
+        for shape in SHAPES:
+            root = os.path.join(self.temp_dir, shape)
+            manifest = generate_tree(shape, root, scale=0.01)
+
+            analyzer = DiskUsageAnalyzer(max_depth=100, include_hidden=True)
+            stats = analyzer.analyze_directory(root)
+
+            self.assertEqual(stats.file_count, manifest.files + manifest.links, shape)
+            if not manifest.links:
+                self.assertEqual(stats.total_size, manifest.apparent_bytes, shape)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
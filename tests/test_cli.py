@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Testes para a interface de linha de comando
+"""
+
+import unittest
+import tempfile
+import json
+import os
+import sys
+import shutil
+import subprocess
+from pathlib import Path
+
+SRC_DIR = Path(__file__).parent.parent / "src"
+
+# Adicionar src ao path
+sys.path.insert(0, str(SRC_DIR))
+
+from click.testing import CliRunner
+from cli.main import analyze, parse_size
+
+
+class TestCLI(unittest.TestCase):
+    """Testes para o comando disk-analyzer"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, "sub"))
+        with open(os.path.join(self.temp_dir, "sub", "big.bin"), 'wb') as f:
+            f.write(b'x' * 4096)
+        with open(os.path.join(self.temp_dir, "small.txt"), 'w') as f:
+            f.write("x")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_parse_size(self):
+        """Testar conversão de tamanhos"""
+        self.assertEqual(parse_size('0'), 0)
+        self.assertEqual(parse_size('1KB'), 1024)
+        self.assertEqual(parse_size('1.5 MB'), int(1.5 * 1024 ** 2))
+
+    def test_json_output(self):
+        """--json deve imprimir apenas o resumo em JSON"""
+        result = CliRunner().invoke(analyze, [self.temp_dir, '--json', '--large-files', '1KB'])
+
+        self.assertEqual(result.exit_code, 0, result.output)
+        summary = json.loads(result.output)
+        self.assertEqual(summary['file_count'], 2)
+        self.assertEqual(summary['large_files'][0]['size'], 4096)
+
+    def test_quiet_does_not_load_rich(self):
+        """O caminho --quiet não deve importar o rich"""
+        code = (
+            "import sys\n"
+            f"sys.argv = ['disk-analyzer', {self.temp_dir!r}, '--quiet', '--large-files', '1KB']\n"
+            "from cli.main import analyze\n"
+            "try:\n"
+            "    analyze()\n"
+            "except SystemExit:\n"
+            "    pass\n"
+            "print('rich' in sys.modules, 'humanize' in sys.modules)"
+        )
+        env = dict(os.environ, PYTHONPATH=str(SRC_DIR))
+        result = subprocess.run([sys.executable, '-c', code], env=env,
+                                capture_output=True, text=True, check=True)
+        lines = result.stdout.strip().splitlines()
+
+        self.assertTrue(lines[0].startswith("4096\t"))
+        self.assertEqual(lines[-1], "False False")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
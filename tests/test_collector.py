@@ -0,0 +1,138 @@
+#!/usr/bin/env python3
+"""
+Testes para o agente e o collector da frota
+"""
+
+import unittest
+import tempfile
+import gzip
+import os
+import sys
+import shutil
+import threading
+from pathlib import Path
+from unittest import mock
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.serialization import read_jsonl
+from cli.agent import build_snapshot, send_snapshot
+from web.app import app, fleet_indexes
+
+
+class TestCollector(unittest.TestCase):
+    """Testes para a ingestão de snapshots em web.app"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        os.makedirs(os.path.join(self.root, "logs"))
+        with open(os.path.join(self.root, "logs", "app.log"), 'w') as f:
+            f.write("x" * 2000)
+        with open(os.path.join(self.root, "big.bin"), 'w') as f:
+            f.write("x" * 5000)
+
+        app.config['TESTING'] = True
+        app.config['COLLECTOR_DIR'] = os.path.join(self.temp_dir, "fleet")
+        app.config['COLLECTOR_TOKEN'] = None
+        self.client = app.test_client()
+
+    def tearDown(self):
+        fleet_indexes.clear()
+        app.config['COLLECTOR_DIR'] = None
+        app.config['COLLECTOR_TOKEN'] = None
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def snapshot(self, host: str = "web01") -> bytes:
+        analyzer = DiskUsageAnalyzer()
+        results = analyzer.analyze_roots([self.root])
+        return build_snapshot(analyzer, results, host, large_file_threshold=1000)
+
+    def test_ingest_and_dashboard(self):
+        """Snapshot recebido aparece na frota e serve o painel do host"""
+        response = self.client.post('/api/ingest?host=web01', data=self.snapshot())
+        self.assertEqual(response.status_code, 202)
+        self.assertEqual(response.get_json()['roots'], [self.root])
+
+        fleet = self.client.get('/api/fleet').get_json()
+        self.assertEqual(fleet['host_count'], 1)
+        self.assertEqual(fleet['hosts'][0]['host'], "web01")
+        self.assertEqual(fleet['total_size'], 7000)
+
+        response = self.client.get('/api/fleet/web01')
+        dashboard = response.get_json()
+        revalidated = self.client.get('/api/fleet/web01', headers={'If-None-Match': response.headers['ETag']})
+        self.assertEqual(revalidated.status_code, 304)
+        self.assertEqual(dashboard['tree_data'][0]['size'], 7000)
+        self.assertEqual(dashboard['summary']['host'], "web01")
+        self.assertEqual([f['name'] for f in dashboard['large_files']], ["big.bin", "app.log"])
+
+        # /api/analyze com host serve o mesmo painel sem varrer localmente
+        analyzed = self.client.post('/api/analyze', json={'host': 'web01', 'path': self.root}).get_json()
+        self.assertEqual(analyzed['tree_data'], dashboard['tree_data'])
+
+    def test_errors_per_root(self):
+        """Cada raiz do snapshot leva só os próprios erros"""
+        other = os.path.join(self.temp_dir, "other")
+        for name in ("locked1", "locked2", "open"):
+            os.makedirs(os.path.join(other, name))
+        list_directory = DiskUsageAnalyzer._list_directory
+
+        def listing(analyzer, dir_path):
+            if dir_path.name.startswith("locked"):
+                raise PermissionError(13, "Permission denied", str(dir_path))
+            return list_directory(analyzer, dir_path)
+
+        analyzer = DiskUsageAnalyzer()
+        with mock.patch.object(DiskUsageAnalyzer, '_list_directory', listing):
+            results = analyzer.analyze_roots([self.root, other])
+        snapshot = build_snapshot(analyzer, results, "web01", large_file_threshold=1000)
+
+        headers = {header['root']: header['summary']
+                   for header, _ in read_jsonl(gzip.decompress(snapshot).decode().splitlines())}
+        self.assertEqual(headers[self.root]['errors']['total'], 0)
+        self.assertEqual(headers[self.root]['errors_count'], 0)
+        self.assertEqual(headers[other]['errors']['total'], 2)
+        self.assertEqual(headers[other]['errors_count'], 2)
+        self.assertEqual(len(analyzer.errors), 2)
+
+    def test_rejects_invalid_snapshots(self):
+        """Corpo inválido, host inválido e token errado não alteram a frota"""
+        self.assertEqual(self.client.post('/api/ingest?host=web01', data=b"lixo").status_code, 400)
+        not_jsonl = gzip.compress(b'{"a": 1}\n')
+        self.assertEqual(self.client.post('/api/ingest?host=web01', data=not_jsonl).status_code, 400)
+        self.assertEqual(self.client.post('/api/ingest?host=../etc', data=self.snapshot()).status_code, 400)
+
+        app.config['COLLECTOR_TOKEN'] = 'segredo'
+        response = self.client.post('/api/ingest?host=web01', data=self.snapshot(),
+                                    headers={'X-Agent-Token': 'errado'})
+        self.assertEqual(response.status_code, 401)
+
+        self.assertEqual(self.client.get('/api/fleet').get_json()['host_count'], 0)
+        self.assertEqual(os.listdir(app.config['COLLECTOR_DIR']), [])
+        self.assertEqual(self.client.get('/api/fleet/web01').status_code, 404)
+
+    def test_agent_over_loopback(self):
+        """O agente envia por HTTP para um collector em 127.0.0.1"""
+        from werkzeug.serving import make_server
+
+        app.config['COLLECTOR_TOKEN'] = 'segredo'
+        server = make_server('127.0.0.1', 0, app)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            reply = send_snapshot(f"http://127.0.0.1:{server.server_port}", "db01",
+                                  self.snapshot("db01"), token='segredo')
+        finally:
+            server.shutdown()
+            thread.join()
+
+        self.assertEqual(reply, {'host': 'db01', 'roots': [self.root]})
+        fleet = self.client.get('/api/fleet').get_json()
+        self.assertEqual([h['host'] for h in fleet['hosts']], ["db01"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+Testes para a comparação entre varreduras
+"""
+
+import unittest
+import tempfile
+import io
+import os
+import sys
+import shutil
+import sqlite3
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.diff import JsonlReader, HistoryReader, diff_trees, open_tree
+from analyzer.history import ScanHistory
+from analyzer.serialization import write_jsonl
+
+
+class TestDiff(unittest.TestCase):
+    """Testes para diff_trees e os leitores de varreduras"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        for name, size in [("logs/app.log", 100), ("logs/old/a.log", 50),
+                           ("data/db.bin", 1000), ("data-archive/x.tar", 10),
+                           ("cache/tmp.bin", 500)]:
+            self.write(name, size)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name: str, size: int):
+        path = os.path.join(self.root, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w') as f:
+            f.write("x" * size)
+
+    def snapshot(self) -> str:
+        stats = DiskUsageAnalyzer().analyze_directory(self.root)
+        buffer = io.StringIO()
+        write_jsonl(stats, buffer)
+        return buffer.getvalue()
+
+    def change_tree(self):
+        self.write("logs/app.log", 5000)
+        shutil.rmtree(os.path.join(self.root, "cache"))
+        self.write("new/big.bin", 800)
+
+    def test_lockstep_diff(self):
+        """Adicionados, removidos e alterados, sem descer em subárvores iguais"""
+        before = self.snapshot()
+        self.change_tree()
+        after = self.snapshot()
+
+        old = JsonlReader(io.StringIO(before))
+        new = JsonlReader(io.StringIO(after))
+        changes = {(os.path.relpath(c.path, self.root), c.status, c.delta)
+                   for c in diff_trees(old, new)}
+
+        self.assertEqual(changes, {
+            ('.', 'grown', 5200),
+            ('logs', 'grown', 4900),
+            ('cache', 'removed', -500),
+            ('new', 'added', 800),
+        })
+
+    def test_identical_subtrees_skipped(self):
+        """Subárvores com os mesmos totais não são decodificadas"""
+        before = self.snapshot()
+        self.write("data/db.bin", 2000)
+        after = self.snapshot()
+
+        decoded = []
+
+        class CountingReader(JsonlReader):
+            def _read(self):
+                node = super()._read()
+                if node is not None:
+                    decoded.append(node.path)
+                return node
+
+        changes = list(diff_trees(CountingReader(io.StringIO(before)),
+                                  CountingReader(io.StringIO(after))))
+
+        self.assertEqual([c.status for c in changes], ['grown', 'grown'])
+        self.assertNotIn(os.path.join(self.root, "logs", "old"), decoded)
+
+    def test_threshold(self):
+        """Mudanças abaixo do limite são omitidas"""
+        before = self.snapshot()
+        self.change_tree()
+        after = self.snapshot()
+
+        changes = list(diff_trees(JsonlReader(io.StringIO(before)),
+                                  JsonlReader(io.StringIO(after)), threshold=1000))
+
+        self.assertEqual(sorted(c.status for c in changes), ['grown', 'grown'])
+
+    def test_counts_only_change_skipped(self):
+        """Mesmo tamanho com contagens diferentes não gera mudança de 0 bytes"""
+        before = self.snapshot()
+        self.write("logs/empty.log", 0)
+        after = self.snapshot()
+
+        self.assertEqual(list(diff_trees(JsonlReader(io.StringIO(before)),
+                                         JsonlReader(io.StringIO(after)))), [])
+
+    def test_multiple_roots(self):
+        """Export com várias raízes: sem root é erro; com root, só aquela raiz é comparada"""
+        other = os.path.join(self.temp_dir, "other")
+        os.makedirs(os.path.join(other, "sub"))
+
+        def snapshot():
+            buffer = io.StringIO()
+            for path in (self.root, other):
+                write_jsonl(DiskUsageAnalyzer().analyze_directory(path), buffer)
+            return buffer.getvalue()
+
+        before = snapshot()
+        with open(os.path.join(other, "sub", "grown.bin"), 'w') as f:
+            f.write("x" * 700)
+        after = snapshot()
+
+        with self.assertRaises(ValueError):
+            list(diff_trees(JsonlReader(io.StringIO(before)), JsonlReader(io.StringIO(after))))
+
+        changes = {(os.path.relpath(c.path, other), c.status, c.delta)
+                   for c in diff_trees(JsonlReader(io.StringIO(before), root=other),
+                                       JsonlReader(io.StringIO(after), root=other))}
+        self.assertEqual(changes, {('.', 'grown', 700), ('sub', 'grown', 700)})
+
+        self.assertEqual(list(diff_trees(JsonlReader(io.StringIO(before), root=self.root),
+                                         JsonlReader(io.StringIO(after), root=self.root))), [])
+        with self.assertRaises(ValueError):
+            JsonlReader(io.StringIO(before), root=os.path.join(self.temp_dir, "missing"))
+
+    def test_history_scans(self):
+        """Varreduras do histórico são lidas na mesma ordem do jsonl"""
+        with ScanHistory(os.path.join(self.temp_dir, "history.db")) as store:
+            first = store.record(DiskUsageAnalyzer().analyze_directory(self.root))
+            self.change_tree()
+            second = store.record(DiskUsageAnalyzer().analyze_directory(self.root))
+
+            changes = {(os.path.relpath(c.path, self.root), c.status)
+                       for c in diff_trees(HistoryReader(store, first), HistoryReader(store, second))}
+
+        self.assertEqual(changes, {('.', 'grown'), ('logs', 'grown'),
+                                   ('cache', 'removed'), ('new', 'added')})
+
+        # open_tree abre o histórico e close() o fecha
+        reader = open_tree(f"scan:{first}", os.path.join(self.temp_dir, "history.db"))
+        self.assertIsNotNone(reader.next())
+        reader.close()
+        with self.assertRaises(sqlite3.ProgrammingError):
+            reader.store.conn.execute("SELECT 1")
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
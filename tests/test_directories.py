@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+Testes para as sugestões de diretórios da interface web
+"""
+
+import importlib
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import threading
+import time
+from pathlib import Path
+from unittest import mock
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.history import ScanHistory
+import web.directories as directories
+from web.directories import DirectorySuggestions
+
+# web/__init__.py reexporta o objeto app com o mesmo nome do módulo
+web_app = importlib.import_module('web.app')
+
+
+class TestDirectorySuggestions(unittest.TestCase):
+    """Testes para DirectorySuggestions"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.fast = os.path.join(self.temp_dir, "fast")
+        self.slow = os.path.join(self.temp_dir, "slow")
+        for name in ("a", "b"):
+            os.makedirs(os.path.join(self.fast, name))
+            os.makedirs(os.path.join(self.slow, name))
+        with open(os.path.join(self.fast, "file.txt"), 'w') as f:
+            f.write("x")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_hung_base_does_not_block(self):
+        """Uma base travada fica pendente sem atrasar as outras"""
+        release = threading.Event()
+        calls = []
+        original = directories.list_subdirectories
+
+        def listing(base_path):
+            calls.append(base_path)
+            if base_path == self.slow:
+                release.wait(10)
+            return original(base_path)
+
+        suggestions = DirectorySuggestions([self.slow, self.fast], timeout=0.2)
+        with mock.patch.object(directories, 'list_subdirectories', listing):
+            started = time.monotonic()
+            entries, pending = suggestions.listing()
+            self.assertLess(time.monotonic() - started, 2)
+            self.assertEqual([e['path'] for e in entries],
+                             [os.path.join(self.fast, "a"), os.path.join(self.fast, "b")])
+            self.assertEqual(pending, [self.slow])
+
+            # A listagem travada não é repetida enquanto não voltar
+            suggestions.listing()
+            self.assertEqual(calls.count(self.slow), 1)
+
+            release.set()
+            for _ in range(100):
+                entries, pending = suggestions.listing()
+                if not pending:
+                    break
+                time.sleep(0.02)
+        self.assertEqual(pending, [])
+        self.assertEqual(len(entries), 4)
+
+    def test_stale_listing_served_while_refreshing(self):
+        """Depois do intervalo a lista é atualizada em segundo plano"""
+        suggestions = DirectorySuggestions([self.fast], refresh_interval=60)
+        entries, _ = suggestions.listing()
+        self.assertEqual(len(entries), 2)
+
+        os.makedirs(os.path.join(self.fast, "c"))
+        self.assertEqual(len(suggestions.listing()[0]), 2)
+
+        # Serve a lista em cache (ou a nova, se já tiver chegado) sem esperar
+        entries, _ = suggestions.listing(now=time.monotonic() + 120)
+        self.assertIn(len(entries), (2, 3))
+        for _ in range(100):
+            if len(suggestions.listing()[0]) == 3:
+                break
+            time.sleep(0.02)
+        self.assertEqual(len(suggestions.listing()[0]), 3)
+
+    def test_size_hints_from_history(self):
+        """/api/directories traz o tamanho da última varredura gravada"""
+        db_path = os.path.join(self.temp_dir, "history.db")
+        stats = DiskUsageAnalyzer().analyze_directory(self.fast)
+        with ScanHistory(db_path) as store:
+            store.record(stats)
+
+        web_app.app.config['HISTORY_DB'] = db_path
+        try:
+            with mock.patch.object(web_app, 'directory_suggestions', DirectorySuggestions([self.fast])):
+                data = web_app.app.test_client().get('/api/directories').get_json()
+        finally:
+            web_app.app.config['HISTORY_DB'] = None
+
+        self.assertEqual(data['pending'], [])
+        self.assertEqual([entry.get('size') for entry in data['directories']], [0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Testes para a coleta de erros da varredura
+"""
+
+import unittest
+import errno
+import sys
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.errors import ErrorLog, ScanError
+
+
+def permission_error(path):
+    return PermissionError(errno.EACCES, 'Permission denied', path)
+
+
+class TestErrorLog(unittest.TestCase):
+    """Testes para ErrorLog"""
+
+    def setUp(self):
+        self.log = ErrorLog(sample_size=5, seed=1)
+        self.log.set_root('/srv')
+
+    def test_sample_is_bounded(self):
+        """Amostra não deve crescer além do limite"""
+        for i in range(1000):
+            self.log.record('stat', f'/srv/data/file{i}', permission_error(f'/srv/data/file{i}'))
+
+        self.assertEqual(len(self.log), 1000)
+        self.assertEqual(len(self.log.sample), 5)
+        self.assertEqual(self.log.by_errno, {errno.EACCES: 1000})
+
+    def test_group_by_subtree(self):
+        """Erros devem ser agrupados pelo subdiretório de primeiro nível"""
+        self.log.record('stat', '/srv/a/x/y', permission_error('/srv/a/x/y'))
+        self.log.record('stat', '/srv/a/z', permission_error('/srv/a/z'))
+        self.log.record('listdir', '/srv/b', permission_error('/srv/b'))
+
+        self.assertEqual(self.log.top_subtrees(), [('/srv/a', 2), ('/srv/b', 1)])
+        self.assertEqual(self.log.top_errnos(), [('EACCES', 3)])
+
+    def test_lazy_formatting(self):
+        """Mensagens devem manter o formato anterior"""
+        self.log.record('listdir', '/srv/b', permission_error('/srv/b'))
+        self.log.record('hash', '/srv/c', ValueError('falhou'))
+
+        self.assertIsInstance(self.log.sample[0], ScanError)
+        self.assertEqual(self.log[0], "Sem permissão para acessar /srv/b: [Errno 13] Permission denied")
+        self.assertEqual(self.log[:2][1], "Erro calculando hash para /srv/c: falhou")
+        self.assertEqual(list(self.log), self.log[:2])
+
+    def test_merge(self):
+        """Merge deve somar contagens e respeitar o limite da amostra"""
+        other = ErrorLog(sample_size=5)
+        other.set_root('/srv')
+        for i in range(8):
+            other.record('stat', f'/srv/x/{i}', permission_error(f'/srv/x/{i}'))
+        self.log.record('stat', '/srv/y', FileNotFoundError(errno.ENOENT, 'No such file'))
+
+        self.log.merge(other)
+
+        self.assertEqual(len(self.log), 9)
+        self.assertEqual(len(self.log.sample), 5)
+        self.assertEqual(self.log.by_subtree['/srv/x'], 8)
+        self.assertEqual(dict(self.log.top_errnos()), {'EACCES': 8, 'ENOENT': 1})
+
+    def test_to_dict(self):
+        """Resumo serializável"""
+        self.log.record('stat', '/srv/a', permission_error('/srv/a'))
+        data = self.log.to_dict()
+
+        self.assertEqual(data['total'], 1)
+        self.assertEqual(data['by_errno'], {'EACCES': 1})
+        self.assertEqual(len(data['sample']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Testes para fast_listing: listagem com os.scandir e soma direta de arquivos
+"""
+
+import unittest
+import tempfile
+import asyncio
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer, file_type_of
+from analyzer.serialization import serialize_stats
+
+
+class TestFastListing(unittest.TestCase):
+    """fast_listing deve produzir exatamente o resultado de analyze_directory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        spool = os.path.join(self.temp_dir, "spool")
+        os.makedirs(os.path.join(spool, "tie"))
+        names = ["msg.eml", "a.b.TXT", "noext", "trailing.", ".hidden", "..odd", "é.dat"]
+        for i in range(300):
+            name = f"{i}-{names[i % len(names)]}"
+            with open(os.path.join(spool, name), 'w') as f:
+                f.write("x" * ((i * 7919) % 5000))
+        # Empates no maior arquivo: subdiretório e arquivos com o mesmo tamanho
+        for directory in (spool, os.path.join(spool, "tie")):
+            for name in ("big1", "big2"):
+                with open(os.path.join(directory, name), 'w') as f:
+                    f.write("y" * 9000)
+        os.makedirs(os.path.join(self.temp_dir, "sparse"))
+        with open(os.path.join(self.temp_dir, "sparse", "disk.img"), 'wb') as f:
+            f.truncate(1 << 20)
+        os.symlink(os.path.join(spool, "big1"), os.path.join(spool, "link"))
+        os.symlink(os.path.join(spool, "missing"), os.path.join(spool, "broken"))
+        os.symlink(os.path.join(spool, "tie"), os.path.join(self.temp_dir, "dirlink"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def scan(self, **kwargs):
+        analyzer = DiskUsageAnalyzer(reference_time=1.7e9, **kwargs)
+        stats = analyzer.analyze_directory(self.temp_dir)
+        summary = analyzer.get_summary(stats)
+        summary.pop('metrics')
+        return serialize_stats(stats), summary
+
+    def test_same_output(self):
+        """Mesma árvore e mesmo resumo para várias combinações de opções"""
+        options = [
+            {},
+            {'include_hidden': True},
+            {'include_hidden': True, 'follow_symlinks': True},
+            {'min_size': 3000, 'use_allocated_size': True},
+            {'breakdowns': True, 'include_hidden': True},
+            {'exclude_patterns': ['*.eml', 'tie']},
+            {'file_index': True},
+            {'stat_backend': 'threads', 'include_hidden': True},
+        ]
+        for kwargs in options:
+            with self.subTest(**kwargs):
+                self.assertEqual(self.scan(fast_listing=True, **kwargs), self.scan(**kwargs))
+
+    def test_concurrent_scans(self):
+        """Lote e async com fast_listing têm o mesmo resultado"""
+        expected = serialize_stats(DiskUsageAnalyzer().analyze_directory(self.temp_dir))
+        results = DiskUsageAnalyzer(fast_listing=True).analyze_roots(
+            [self.temp_dir, os.path.join(self.temp_dir, "spool", "tie")])
+        self.assertEqual(serialize_stats(results[self.temp_dir]), expected)
+        stats = asyncio.run(DiskUsageAnalyzer(fast_listing=True).analyze_directory_async(self.temp_dir))
+        self.assertEqual(serialize_stats(stats), expected)
+
+    def test_list_entries(self):
+        """Mesmos nomes e ordem de os.listdir, com o inode do lstat"""
+        spool = os.path.join(self.temp_dir, "spool")
+        entries = DiskUsageAnalyzer()._list_entries(spool)
+        self.assertEqual([name for name, _ in entries], os.listdir(spool))
+        for name, inode in entries:
+            self.assertEqual(inode, os.lstat(os.path.join(spool, name)).st_ino)
+
+        with self.assertRaises(FileNotFoundError):
+            DiskUsageAnalyzer()._list_entries(os.path.join(self.temp_dir, "gone"))
+
+    def test_one_file_info_per_directory(self):
+        """Tamanhos crescentes na listagem: só o maior vira FileInfo"""
+        analyzer = DiskUsageAnalyzer(fast_listing=True)
+        made = []
+        make_file_info = analyzer._make_file_info
+
+        def record(path, stat_info, is_symlink):
+            made.append(path.name)
+            return make_file_info(path, stat_info, is_symlink)
+
+        analyzer._make_file_info = record
+        growing = os.path.join(self.temp_dir, "growing")
+        os.makedirs(growing)
+        for i in range(20):
+            with open(os.path.join(growing, f"f{i}"), 'w') as f:
+                f.write("z" * i)
+        # Em ordem de listagem, cada arquivo maior que os anteriores
+        for size, name in enumerate(os.listdir(growing)):
+            os.truncate(os.path.join(growing, name), size)
+
+        stats = analyzer.analyze_directory(growing)
+        self.assertEqual(made, [stats.largest_file.name])
+        self.assertEqual(stats.largest_file.size, 19)
+
+    def test_file_type_of(self):
+        """Mesma extensão que Path.suffix"""
+        for name in ["a.txt", "A.TXT", "archive.tar.gz", "noext", ".bashrc", "trailing.", "..", "..odd"]:
+            suffix = Path(name).suffix.lower()
+            self.assertEqual(file_type_of(name), suffix or 'no_extension', name)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,158 @@
+#!/usr/bin/env python3
+"""
+Testes para o índice por arquivo e disk-analyzer-query
+"""
+
+import unittest
+import tempfile
+import json
+import os
+import sys
+import shutil
+import time
+from pathlib import Path
+from unittest import mock
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from click.testing import CliRunner
+
+from analyzer.attributes import DAY
+from analyzer.core import DiskUsageAnalyzer
+from analyzer import fileindex
+from analyzer.fileindex import FileIndex
+from cli.query import query
+
+
+class TestFileIndex(unittest.TestCase):
+    """Testes para FileIndex e a consulta pela linha de comando"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        self.now = time.time()
+        # (caminho, tamanho, idade em dias)
+        self.files = [
+            ("logs/app.log", 5000, 400),
+            ("logs/old.log", 3000, 800),
+            ("logs/new.log", 100, 1),
+            ("data/big.bin", 9000, 10),
+            ("data/deep/archive.tar", 7000, 500),
+            ("README", 50, 2),
+        ]
+        for relative, size, age in self.files:
+            path = os.path.join(self.root, relative)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'w') as f:
+                f.write("x" * size)
+            mtime = self.now - age * DAY
+            os.utime(path, (mtime, mtime))
+        self.index_path = os.path.join(self.temp_dir, "files.duidx")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def scan(self) -> FileIndex:
+        analyzer = DiskUsageAnalyzer(file_index=True)
+        analyzer.analyze_directory(self.root)
+        return analyzer.file_index
+
+    def test_capture_and_round_trip(self):
+        """O índice tem um registro por arquivo e sobrevive a save/load"""
+        index = self.scan()
+        self.assertEqual(len(index), len(self.files))
+        index.save(self.index_path, root=self.root)
+
+        with FileIndex.load(self.index_path) as loaded:
+            self.assertEqual(len(loaded), len(self.files))
+            self.assertEqual(loaded.root, self.root)
+            paths = sorted(loaded.file_path(row) for row in range(len(loaded)))
+            self.assertEqual(paths, sorted(os.path.join(self.root, f[0]) for f in self.files))
+            self.assertEqual(loaded.total_size(range(len(loaded))), sum(f[1] for f in self.files))
+
+    def test_concurrent_scan_merges_indexes(self):
+        """Analisadores filhos (lote e async) incorporam seus índices no pai"""
+        analyzer = DiskUsageAnalyzer(file_index=True)
+        analyzer.analyze_roots([self.root, os.path.join(self.root, "logs")])
+        self.assertEqual(len(analyzer.file_index), len(self.files))
+
+        import asyncio
+        analyzer = DiskUsageAnalyzer(file_index=True)
+        asyncio.run(analyzer.analyze_directory_async(self.root))
+        index = analyzer.file_index
+        self.assertEqual(len(index), len(self.files))
+        rows = index.select(extensions=['.log'])
+        self.assertEqual(sorted(os.path.basename(index.file_path(row)) for row in rows),
+                         ['app.log', 'new.log', 'old.log'])
+
+    def test_select_and_group(self):
+        """Filtros por tamanho, idade, extensão e subárvore; agrupamentos"""
+        index = self.scan()
+
+        rows = index.select(min_size=2000, older_than=365 * DAY, now=self.now)
+        self.assertEqual([item['path'] for item in index.top_files(rows)],
+                         [os.path.join(self.root, "data/deep/archive.tar"),
+                          os.path.join(self.root, "logs/app.log"),
+                          os.path.join(self.root, "logs/old.log")])
+
+        rows = index.select(under=os.path.join(self.root, "data"))
+        self.assertEqual(index.total_size(rows), 16000)
+        self.assertEqual(len(index.select(under=os.path.join(self.root, "dat"))), 0)
+        self.assertEqual(len(index.select(owners=[os.getuid() + 1])), 0)
+
+        by_ext = index.group_by(index.select(), 'ext')
+        self.assertEqual(by_ext[0], {'key': '.bin', 'count': 1, 'bytes': 9000})
+        self.assertEqual(by_ext[1], {'key': '.log', 'count': 3, 'bytes': 8100})
+
+        by_age = index.group_by(index.select(), 'age', now=self.now)
+        self.assertEqual([(group['key'], group['count']) for group in by_age],
+                         [('< 30 dias', 3), ('1-2 anos', 2), ('> 2 anos', 1)])
+
+        by_owner = index.group_by(index.select(), 'owner')
+        self.assertEqual(len(by_owner), 1)
+        self.assertEqual(by_owner[0]['bytes'], sum(f[1] for f in self.files))
+
+        with self.assertRaises(ValueError):
+            index.group_by(index.select(), 'color')
+
+    @unittest.skipUnless(fileindex.np is not None, "numpy não instalado")
+    def test_numpy_matches_pure_python(self):
+        """Consultas vetorizadas dão o mesmo resultado que as em Python puro"""
+        self.scan().save(self.index_path, root=self.root)
+
+        def run_queries():
+            results = []
+            for index in (self.scan(), FileIndex.load(self.index_path)):
+                rows = index.select(min_size=100, older_than=5 * DAY, now=self.now)
+                results.append([int(row) for row in rows])
+                results.append(index.top_files(index.select(), limit=3))
+                results.append(index.total_size(rows))
+                for by in ('owner', 'ext', 'age', 'dir'):
+                    results.append(index.group_by(index.select(), by, now=self.now))
+                index.close()
+            return results
+
+        vectorized = run_queries()
+        with mock.patch.object(fileindex, 'np', None):
+            self.assertEqual(vectorized, run_queries())
+
+    def test_query_cli(self):
+        """disk-analyzer-query filtra e agrupa o índice gravado"""
+        self.scan().save(self.index_path, root=self.root)
+        result = CliRunner().invoke(query, [self.index_path, '--older-than', '1y', '--ext', 'log',
+                                            '--group-by', 'dir', '--json'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        data = json.loads(result.output)
+        self.assertEqual(data['indexed_files'], len(self.files))
+        self.assertEqual(data['matched_files'], 2)
+        self.assertEqual(data['results'], [
+            {'key': os.path.join(self.root, "logs"), 'count': 2, 'bytes': 8000}])
+
+        result = CliRunner().invoke(query, [self.index_path, '--min-size', '1KB'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('big.bin', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
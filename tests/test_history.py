@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Testes para o histórico de varreduras
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.history import ScanHistory
+
+DAY = 86400.0
+
+
+class TestScanHistory(unittest.TestCase):
+    """Testes para ScanHistory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        os.makedirs(os.path.join(self.root, "logs"))
+        os.makedirs(os.path.join(self.root, "data"))
+        self.write("logs/app.log", 100)
+        self.write("data/db.bin", 1000)
+        self.store = ScanHistory(os.path.join(self.temp_dir, "history.db"))
+        self.now = 1_700_000_000.0
+
+    def tearDown(self):
+        self.store.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def write(self, name: str, size: int):
+        with open(os.path.join(self.root, name), 'w') as f:
+            f.write("x" * size)
+
+    def record(self, days_ago: float) -> int:
+        stats = DiskUsageAnalyzer().analyze_directory(self.root)
+        return self.store.record(stats, started_at=self.now - days_ago * DAY)
+
+    def test_growth(self):
+        """Diretórios que mais cresceram na janela, com taxa diária"""
+        self.record(days_ago=10)
+        self.record(days_ago=6)
+        self.write("logs/app.log", 5000)
+        os.makedirs(os.path.join(self.root, "new"))
+        self.write("new/cache.bin", 300)
+        self.record(days_ago=1)
+
+        rows = self.store.growth(days=7, root=self.root, now=self.now)
+
+        self.assertEqual([r['path'] for r in rows],
+                         [self.root, os.path.join(self.root, "logs"), os.path.join(self.root, "new")])
+        logs = rows[1]
+        self.assertEqual(logs['start_size'], 100)
+        self.assertEqual(logs['growth'], 4900)
+        self.assertAlmostEqual(logs['bytes_per_day'], 4900 / 5)
+        self.assertEqual(rows[2]['start_size'], 0)
+
+        # Janela com uma única varredura não tem crescimento
+        self.assertEqual(self.store.growth(days=2, root=self.root, now=self.now), [])
+
+    def test_size_history(self):
+        """Série de tamanhos de um diretório"""
+        self.record(days_ago=3)
+        self.write("data/db.bin", 2000)
+        self.record(days_ago=2)
+
+        series = self.store.size_history(os.path.join(self.root, "data"))
+
+        self.assertEqual([row['total_size'] for row in series], [1000, 2000])
+        self.assertEqual(self.store.size_history("/nao/gravado"), [])
+
+    def test_paths_interned(self):
+        """Cada caminho é gravado uma vez, independente do número de varreduras"""
+        for days_ago in (3, 2, 1):
+            self.record(days_ago)
+
+        paths = self.store.conn.execute("SELECT COUNT(*) FROM paths").fetchone()[0]
+        samples = self.store.conn.execute("SELECT COUNT(*) FROM samples").fetchone()[0]
+        self.assertEqual(paths, 3)
+        self.assertEqual(samples, 9)
+        self.assertEqual(len(self.store.scans()), 3)
+
+    def test_prune(self):
+        """prune remove varreduras antigas e caminhos órfãos"""
+        self.record(days_ago=100)
+        os.makedirs(os.path.join(self.root, "tmp"))
+        self.record(days_ago=1)
+        shutil.rmtree(os.path.join(self.root, "logs"))
+        self.record(days_ago=0)
+
+        self.assertEqual(self.store.prune(keep_days=30, now=self.now), 1)
+        self.assertEqual(len(self.store.scans()), 2)
+        self.assertEqual(len(self.store.size_history(os.path.join(self.root, "logs"))), 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,84 @@
+#!/usr/bin/env python3
+"""
+Testes para a instrumentação da varredura
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.metrics import ScanMetrics, PHASES
+
+
+class TestScanMetrics(unittest.TestCase):
+    """Testes para ScanMetrics integrado ao DiskUsageAnalyzer"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.temp_dir, "dir1", "sub"))
+        for name in ("a.txt", "b.tmp", "dir1/c.py", "dir1/sub/d.md"):
+            with open(os.path.join(self.temp_dir, name), 'w') as f:
+                f.write("conteúdo")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_counters(self):
+        """Contadores devem refletir a árvore analisada"""
+        metrics = ScanMetrics()
+        analyzer = DiskUsageAnalyzer(exclude_patterns=['*.tmp'], metrics=metrics)
+        analyzer.analyze_directory(self.temp_dir)
+
+        self.assertEqual(metrics.counters['directories'], 3)
+        self.assertEqual(metrics.counters['excluded'], 1)
+        self.assertEqual(metrics.counters['entries'], 6)
+        self.assertEqual(metrics.phase_calls['stat'], 5)
+        self.assertGreater(metrics.counters['syscalls'], 0)
+        self.assertGreater(metrics.scan_seconds, 0)
+        for phase in PHASES:
+            self.assertGreaterEqual(metrics.phase_seconds[phase], 0)
+
+    def test_slowest_directories(self):
+        """Diretórios mais lentos devem ser limitados e ordenados"""
+        metrics = ScanMetrics(slowest_limit=2)
+        DiskUsageAnalyzer(metrics=metrics).analyze_directory(self.temp_dir)
+
+        slowest = metrics.slowest_directories
+        self.assertEqual(len(slowest), 2)
+        self.assertGreaterEqual(slowest[0][1], slowest[1][1])
+
+    def test_callback(self):
+        """Callback deve receber eventos de diretório e de fim de varredura"""
+        events = []
+        metrics = ScanMetrics(callback=lambda event, data: events.append(event))
+        DiskUsageAnalyzer(metrics=metrics).analyze_directory(self.temp_dir)
+
+        self.assertEqual(events.count('directory'), 3)
+        self.assertEqual(events[-1], 'scan_complete')
+
+    def test_prometheus_export(self):
+        """Exportação Prometheus deve conter fases e contadores"""
+        metrics = ScanMetrics()
+        DiskUsageAnalyzer(metrics=metrics).analyze_directory(self.temp_dir)
+        text = metrics.to_prometheus()
+
+        self.assertIn('disk_analyzer_phase_seconds{phase="stat"}', text)
+        self.assertIn('disk_analyzer_directories_total 3', text)
+        self.assertTrue(text.endswith("\n"))
+
+    def test_summary_without_metrics(self):
+        """Sem instrumentação o resumo não deve trazer métricas"""
+        analyzer = DiskUsageAnalyzer()
+        stats = analyzer.analyze_directory(self.temp_dir)
+        self.assertIsNone(analyzer.get_summary(stats)['metrics'])
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Testes para o tratamento de montagens
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from pathlib import Path
+from unittest import mock
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.mounts import MountInfo, read_mount_table
+
+
+class TestMountBoundaries(unittest.TestCase):
+    """Testes para one_file_system, skip_fs_types e mount_usage"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.mount_dir = os.path.join(self.temp_dir, "mnt")
+        os.makedirs(os.path.join(self.mount_dir, "deep"))
+        with open(os.path.join(self.mount_dir, "deep", "data.bin"), 'w') as f:
+            f.write("x" * 100)
+        with open(os.path.join(self.temp_dir, "local.txt"), 'w') as f:
+            f.write("x" * 10)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def make_analyzer(self, fs_type: str = 'ext4', **kwargs) -> DiskUsageAnalyzer:
+        """Analisador que enxerga mount_dir como outro sistema de arquivos"""
+        analyzer = DiskUsageAnalyzer(**kwargs)
+        real_mount = os.path.realpath(self.mount_dir)
+        analyzer._mount_table = {
+            real_mount: MountInfo('/dev/fake', real_mount, fs_type, 'rw')
+        }
+        get_file_info = analyzer.get_file_info
+
+        def fake_device(path):
+            info = get_file_info(path)
+            if info and os.path.realpath(info.path).startswith(real_mount):
+                info.device += 1
+            return info
+
+        analyzer.get_file_info = fake_device
+        return analyzer
+
+    def test_crosses_mounts_by_default(self):
+        """Sem opções, montagens comuns são percorridas"""
+        analyzer = self.make_analyzer()
+        stats = analyzer.analyze_directory(self.temp_dir)
+
+        self.assertEqual(stats.total_size, 110)
+        self.assertEqual(analyzer.skipped_mounts, [])
+
+    def test_one_file_system(self):
+        """one_file_system não deve descer em outro st_dev"""
+        analyzer = self.make_analyzer(one_file_system=True)
+        stats = analyzer.analyze_directory(self.temp_dir)
+
+        self.assertEqual(stats.total_size, 10)
+        self.assertEqual(stats.dir_count, 1)
+        self.assertEqual(analyzer.skipped_mounts, [self.mount_dir])
+
+    def test_skips_pseudo_filesystems(self):
+        """Pseudo sistemas de arquivos são ignorados por padrão"""
+        analyzer = self.make_analyzer(fs_type='proc')
+        stats = analyzer.analyze_directory(self.temp_dir)
+        self.assertEqual(stats.total_size, 10)
+        self.assertEqual(analyzer.skipped_mounts, [self.mount_dir])
+
+        analyzer = self.make_analyzer(fs_type='proc', skip_fs_types=[])
+        self.assertEqual(analyzer.analyze_directory(self.temp_dir).total_size, 110)
+
+    def test_mount_usage(self):
+        """mount_usage deve usar statvfs em vez de percorrer a montagem"""
+        analyzer = self.make_analyzer(mount_usage=True)
+        with mock.patch('analyzer.core.filesystem_usage', return_value=(5000, 42)) as usage:
+            stats = analyzer.analyze_directory(self.temp_dir)
+
+        usage.assert_called_once_with(os.path.realpath(self.mount_dir))
+        self.assertEqual(stats.total_size, 5010)
+        self.assertEqual(stats.file_count, 43)
+        self.assertEqual(stats.children[0].path, self.mount_dir)
+        self.assertEqual(stats.children[0].children, [])
+
+    def test_read_mount_table(self):
+        """Tabela de montagens deve decodificar os escapes octais"""
+        mounts_file = os.path.join(self.temp_dir, "mounts")
+        with open(mounts_file, 'w') as f:
+            f.write("proc /proc proc rw,nosuid 0 0\n")
+            f.write("/dev/sdb1 /mnt/my\\040disk ext4 rw,relatime 0 0\n")
+
+        table = read_mount_table(mounts_file)
+
+        self.assertEqual(table['/proc'].fs_type, 'proc')
+        self.assertEqual(table['/mnt/my disk'].source, '/dev/sdb1')
+        self.assertEqual(read_mount_table(os.path.join(self.temp_dir, "missing")), {})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
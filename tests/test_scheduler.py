@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Testes para o escalonamento por dispositivo e o stat em ordem de inode
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.scheduler import ADJUST_EVERY, DeviceScheduler, DeviceState
+from analyzer.serialization import serialize_stats
+
+# st_dev sem dispositivo de bloco no sysfs: limite inicial 2
+DEVICE_A = os.makedev(4095, 1)
+DEVICE_B = os.makedev(4095, 2)
+
+
+class TestDeviceState(unittest.TestCase):
+    """Ajuste do limite pela latência observada"""
+
+    def test_stable_latency_grows_limit(self):
+        """Latência estável: o limite sobe até max_limit"""
+        state = DeviceState(device=DEVICE_A, limit=1.0, max_limit=4)
+        for _ in range(ADJUST_EVERY * 10):
+            state.observe(0.001)
+        self.assertEqual(state.limit, 4.0)
+
+    def test_rising_latency_shrinks_limit(self):
+        """Latência subindo: o limite cai, nunca abaixo de 1"""
+        state = DeviceState(device=DEVICE_A, limit=4.0, max_limit=4)
+        for _ in range(ADJUST_EVERY * 4):
+            state.observe(0.001)
+        # Fila do disco crescendo: cada operação fica várias vezes mais lenta
+        for _ in range(ADJUST_EVERY * 2):
+            state.observe(0.010)
+        self.assertLessEqual(state.limit, 3.0)
+        self.assertGreaterEqual(state.limit, 1.0)
+
+
+class TestDeviceScheduler(unittest.TestCase):
+    """Concorrência limitada por dispositivo, dispositivos em paralelo"""
+
+    def test_per_device_limit(self):
+        """Cada dispositivo respeita o limite e os dois rodam ao mesmo tempo"""
+        lock = threading.Lock()
+        running = {DEVICE_A: 0, DEVICE_B: 0}
+        peaks = {DEVICE_A: 0, DEVICE_B: 0, 'total': 0}
+
+        def task(device):
+            with lock:
+                running[device] += 1
+                peaks[device] = max(peaks[device], running[device])
+                peaks['total'] = max(peaks['total'], sum(running.values()))
+            time.sleep(0.02)
+            with lock:
+                running[device] -= 1
+            return device
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            scheduler = DeviceScheduler(pool, 4)
+            futures = [scheduler.submit(device, task, device)
+                       for device in [DEVICE_A] * 6 + [DEVICE_B] * 6]
+            self.assertEqual([future.result() for future in futures], [DEVICE_A] * 6 + [DEVICE_B] * 6)
+
+        self.assertEqual(scheduler.limits(), {DEVICE_A: 2, DEVICE_B: 2})
+        self.assertLessEqual(peaks[DEVICE_A], 2)
+        self.assertLessEqual(peaks[DEVICE_B], 2)
+        self.assertGreater(peaks['total'], 2)
+
+    def test_exceptions_reach_future(self):
+        """Exceções da tarefa chegam ao Future e a fila continua"""
+        def fail():
+            raise PermissionError("negado")
+
+        with ThreadPoolExecutor(max_workers=2) as pool:
+            scheduler = DeviceScheduler(pool, 2)
+            future = scheduler.submit(DEVICE_A, fail)
+            with self.assertRaises(PermissionError):
+                future.result()
+            self.assertEqual(scheduler.submit(DEVICE_A, len, "abc").result(), 3)
+
+
+class TestInodeOrder(unittest.TestCase):
+    """stat em ordem de inode sem mudar o resultado"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for i in range(200):
+            with open(os.path.join(self.temp_dir, f"f{(i * 37) % 200}.dat"), 'w') as f:
+                f.write("x" * i)
+        os.makedirs(os.path.join(self.temp_dir, "sub"))
+        with open(os.path.join(self.temp_dir, "sub", "inner.txt"), 'w') as f:
+            f.write("inner")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_same_output_and_order(self):
+        """Mesma árvore da varredura padrão; cada lote de stat ordenado por inode"""
+        expected = serialize_stats(DiskUsageAnalyzer().analyze_directory(self.temp_dir))
+
+        analyzer = DiskUsageAnalyzer(inode_order=True)
+        self.assertTrue(analyzer.fast_listing)
+        stat_names = analyzer._stat_names
+        batches = []
+
+        def record(dir_path, names):
+            batches.append([os.lstat(os.path.join(dir_path, name)).st_ino for name in names])
+            return stat_names(dir_path, names)
+
+        analyzer._stat_names = record
+        self.assertEqual(serialize_stats(analyzer.analyze_directory(self.temp_dir)), expected)
+        self.assertTrue(batches)
+        for inodes in batches:
+            self.assertEqual(inodes, sorted(inodes))
+
+        results = DiskUsageAnalyzer(inode_order=True).analyze_roots([self.temp_dir])
+        self.assertEqual(serialize_stats(results[self.temp_dir]), expected)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Testes para o snapshot binário aberto com mmap
+"""
+
+import unittest
+import tempfile
+import json
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from click.testing import CliRunner
+
+from analyzer import snapshot as snapshot_module
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.snapshot import Snapshot, write_snapshot
+from cli.main import analyze
+from web import app
+
+
+class TestSnapshot(unittest.TestCase):
+    """Testes para write_snapshot, Snapshot e as rotas que o usam"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        for a in range(3):
+            for b in range(a + 1):
+                directory = os.path.join(self.root, f"d{a}", f"s{b}")
+                os.makedirs(directory)
+                with open(os.path.join(directory, f"f{a}{b}.dat"), 'w') as f:
+                    f.write("x" * (1000 * (a + 1) + b))
+        self.snapshot_dir = os.path.join(self.temp_dir, "snapshots")
+        os.makedirs(self.snapshot_dir)
+        self.snapshot_path = os.path.join(self.snapshot_dir, "root.dusnap")
+
+        self.analyzer = DiskUsageAnalyzer()
+        self.stats = self.analyzer.analyze_directory(self.root)
+        self.summary = self.analyzer.get_summary(self.stats)
+
+    def tearDown(self):
+        app.config['SNAPSHOT_DIR'] = None
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def assertSameTree(self, expected, actual):
+        self.assertEqual(expected.path, actual.path)
+        self.assertEqual(expected.total_size, actual.total_size)
+        self.assertEqual(expected.allocated_size, actual.allocated_size)
+        self.assertEqual(expected.file_count, actual.file_count)
+        self.assertEqual(expected.dir_count, actual.dir_count)
+        self.assertEqual(expected.largest_file.path, actual.largest_file.path)
+        self.assertEqual(expected.largest_file.size, actual.largest_file.size)
+        self.assertEqual(len(expected.children), len(actual.children))
+        ordered = sorted(expected.children, key=lambda child: child.total_size, reverse=True)
+        for expected_child, actual_child in zip(ordered, actual.children):
+            self.assertSameTree(expected_child, actual_child)
+
+    def test_round_trip(self):
+        """A árvore relida do snapshot tem os mesmos totais, filhos do maior para o menor"""
+        count = write_snapshot(self.stats, self.snapshot_path, self.summary, "agora")
+        self.assertEqual(count, 1 + 3 + 6)
+
+        with Snapshot(self.snapshot_path) as snapshot:
+            self.assertEqual(snapshot.node_count, count)
+            self.assertEqual(snapshot.root, self.root)
+            self.assertEqual(snapshot.timestamp, "agora")
+            self.assertEqual(snapshot.summary['file_count'], 6)
+
+            stats = snapshot.stats()
+            self.assertSameTree(self.stats, stats)
+            self.assertEqual(stats.file_types, {'.dat': 6})
+            self.assertEqual([Path(child.path).name for child in stats.children], ['d2', 'd1', 'd0'])
+            self.assertEqual(stats.children[-1].path, os.path.join(self.root, 'd0'))
+            self.assertEqual(len(stats.children[:2]), 2)
+            self.assertFalse(stats.largest_file.is_sparse)
+
+            index = snapshot.children(snapshot.children(0)[0])[0]
+            self.assertEqual(os.path.dirname(snapshot.node_path(index)), os.path.join(self.root, 'd2'))
+
+            largest = snapshot.largest_files(2000)
+            self.assertEqual([file_info.name for file_info in largest],
+                             ['f22.dat', 'f21.dat', 'f20.dat', 'f11.dat', 'f10.dat'])
+
+    def test_breakdowns_round_trip(self):
+        """Faixas de idade e bytes por dono de cada nó sobrevivem ao snapshot"""
+        analyzer = DiskUsageAnalyzer(breakdowns=True)
+        expected = analyzer.analyze_directory(self.root)
+        write_snapshot(expected, self.snapshot_path, analyzer.get_summary(expected), "agora")
+
+        def breakdowns(stats):
+            yield stats.path, list(stats.age_sizes), stats.owner_sizes
+            for child in stats.children:
+                yield from breakdowns(child)
+
+        with Snapshot(self.snapshot_path) as snapshot:
+            stats = snapshot.stats()
+            self.assertEqual(sorted(breakdowns(stats)), sorted(breakdowns(expected)))
+            child = stats.children[0]
+            self.assertEqual(child.owner_sizes, {os.getuid(): child.total_size})
+
+        # Sem breakdowns na varredura, os nós continuam sem eles
+        write_snapshot(self.stats, self.snapshot_path, self.summary, "agora")
+        with Snapshot(self.snapshot_path) as snapshot:
+            self.assertIsNone(snapshot.stats().age_sizes)
+            self.assertIsNone(snapshot.stats().children[0].owner_sizes)
+
+    def test_reads_version_1(self):
+        """Snapshots da versão 1 (registros sem breakdowns) continuam legíveis"""
+        count = write_snapshot(self.stats, self.snapshot_path, self.summary, "agora")
+        with open(self.snapshot_path, 'rb') as f:
+            data = f.read()
+        header = list(snapshot_module.HEADER.unpack_from(data, 0))
+        nodes_offset, strings_offset = header[5], header[6]
+        records = snapshot_module.NODE.iter_unpack(data[nodes_offset:strings_offset])
+        old_nodes = b''.join(snapshot_module.NODE_V1.pack(*record[:15]) for record in records)
+        header[1] = 1
+        header[6] = nodes_offset + count * snapshot_module.NODE_V1.size
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(snapshot_module.HEADER.pack(*header))
+            f.write(data[snapshot_module.HEADER.size:nodes_offset])
+            f.write(old_nodes)
+            f.write(data[strings_offset:])
+
+        with Snapshot(self.snapshot_path) as snapshot:
+            self.assertSameTree(self.stats, snapshot.stats())
+            self.assertIsNone(snapshot.stats().age_sizes)
+            self.assertEqual(len(snapshot.largest_files(2000)), 5)
+
+    def test_file_type_matches_scan(self):
+        """Arquivos sem extensão têm o mesmo tipo que na varredura"""
+        self.assertEqual(Snapshot._file_info('/srv/README', 1, 0.0).file_type, 'no_extension')
+        self.assertEqual(Snapshot._file_info('/srv/a.TAR', 1, 0.0).file_type, '.tar')
+
+    def test_invalid_file(self):
+        """Arquivos que não são snapshots geram ValueError"""
+        with open(self.snapshot_path, 'wb') as f:
+            f.write(b'x' * 200)
+        with self.assertRaises(ValueError):
+            Snapshot(self.snapshot_path)
+
+    def test_cli_export_and_open(self):
+        """--export snapshot grava o arquivo e --open-snapshot o mostra sem varrer"""
+        runner = CliRunner()
+        result = runner.invoke(analyze, [self.root, '--quiet', '--export', 'snapshot',
+                                         '--output', self.snapshot_path])
+        self.assertEqual(result.exit_code, 0, result.output)
+
+        shutil.rmtree(self.root)
+        result = runner.invoke(analyze, ['--open-snapshot', self.snapshot_path, '--json',
+                                         '--large-files', '2KB'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        summary = json.loads(result.output.splitlines()[-1])
+        self.assertEqual(summary['path'], self.root)
+        self.assertEqual(summary['total_size'], self.stats.total_size)
+        self.assertEqual([Path(item['path']).name for item in summary['large_files']],
+                         ['f22.dat', 'f21.dat', 'f20.dat'])
+
+        result = runner.invoke(analyze, ['--open-snapshot', self.snapshot_path])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('d2', result.output)
+
+    def test_web_serves_snapshot(self):
+        """/api/analyze?snapshot= monta o painel do arquivo, com ETag e 304"""
+        write_snapshot(self.stats, self.snapshot_path, self.summary, "agora")
+        app.config['TESTING'] = True
+        app.config['SNAPSHOT_DIR'] = self.snapshot_dir
+        client = app.test_client()
+
+        listing = client.get('/api/snapshots').get_json()
+        self.assertEqual([item['name'] for item in listing], ['root.dusnap'])
+
+        response = client.get('/api/analyze?snapshot=root.dusnap')
+        self.assertEqual(response.status_code, 200)
+        data = response.get_json()
+        self.assertEqual(data['summary']['total_size'], self.stats.total_size)
+        self.assertEqual([child['name'] for child in data['tree_data'][0]['children']],
+                         ['d2', 'd1', 'd0'])
+        self.assertEqual(data['large_files'][0]['name'], 'f22.dat')
+
+        etag = response.headers['ETag']
+        response = client.get('/api/analyze?snapshot=root.dusnap', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+
+        self.assertEqual(client.get('/api/analyze?snapshot=../root.dusnap').status_code, 400)
+        self.assertEqual(client.get('/api/analyze?snapshot=outro.dusnap').status_code, 404)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+Testes para o limite de memória com descarregamento para o disco
+"""
+
+import unittest
+import tempfile
+import io
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.serialization import serialize_stats, write_jsonl
+from analyzer.spill import SpilledChildren
+
+
+class TestSpill(unittest.TestCase):
+    """Testes para memory_limit e SpillStore"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        for a in range(4):
+            for b in range(3):
+                directory = os.path.join(self.root, f"d{a}", f"s{b}", "leaf")
+                os.makedirs(directory)
+                for ext, size in (("log", 10 * (a + 1)), ("bin", 100 * (b + 1))):
+                    with open(os.path.join(directory, f"f.{ext}"), 'w') as f:
+                        f.write("x" * size)
+        self.spill_dir = os.path.join(self.temp_dir, "spill")
+        os.makedirs(self.spill_dir)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def limited(self) -> DiskUsageAnalyzer:
+        return DiskUsageAnalyzer(memory_limit=1, chunk_size=2, spill_dir=self.spill_dir)
+
+    def test_same_result_as_in_memory(self):
+        """A árvore com subárvores em disco é igual à da varredura em memória"""
+        expected = DiskUsageAnalyzer().analyze_directory(self.root)
+        analyzer = self.limited()
+        stats = analyzer.analyze_directory(self.root)
+
+        self.assertIsInstance(stats.children, SpilledChildren)
+        self.assertGreater(analyzer.get_summary(stats)['spilled_directories'], 0)
+        self.assertEqual(serialize_stats(stats), serialize_stats(expected))
+
+        # Exportação e maiores arquivos percorrem os filhos relidos do disco
+        exported, spilled = io.StringIO(), io.StringIO()
+        write_jsonl(expected, exported, timestamp='t')
+        write_jsonl(stats, spilled, timestamp='t')
+        self.assertEqual(spilled.getvalue(), exported.getvalue())
+        self.assertEqual([f.path for f in analyzer.find_large_files(stats, 100)],
+                         [f.path for f in DiskUsageAnalyzer().find_large_files(expected, 100)])
+
+    def test_children_order_and_cleanup(self):
+        """Filhos relidos mantêm a ordem; o arquivo temporário some no close"""
+        analyzer = self.limited()
+        stats = analyzer.analyze_directory(self.root)
+        expected = DiskUsageAnalyzer().analyze_directory(self.root)
+
+        self.assertEqual(len(stats.children), len(expected.children))
+        self.assertEqual([c.path for c in stats.children], [c.path for c in expected.children])
+        self.assertEqual(stats.children[-1].path, expected.children[-1].path)
+        self.assertEqual(len(os.listdir(self.spill_dir)), 1)
+
+        analyzer._spill.close()
+        self.assertEqual(os.listdir(self.spill_dir), [])
+
+    def test_jsonl_reads_each_spilled_node_twice_at_most(self):
+        """write_jsonl conta e grava relendo cada filho descarregado uma vez por passada"""
+        analyzer = self.limited()
+        stats = analyzer.analyze_directory(self.root)
+        store = analyzer._spill
+        loads = []
+        original = store.load_children
+
+        def counting(node_id):
+            loads.append(node_id)
+            return original(node_id)
+
+        store.load_children = counting
+        buffer = io.StringIO()
+        write_jsonl(stats, buffer)
+        self.assertTrue(loads)
+        self.assertLessEqual(max(loads.count(node_id) for node_id in loads), 2)
+
+        expected = io.StringIO()
+        write_jsonl(DiskUsageAnalyzer().analyze_directory(self.root), expected)
+        self.assertEqual(buffer.getvalue(), expected.getvalue())
+
+    def test_index_reads_one_child(self):
+        """Acesso por índice relê só o filho pedido"""
+        analyzer = self.limited()
+        stats = analyzer.analyze_directory(self.root)
+        expected = [c.path for c in stats.children]
+        analyzer._spill.load_children = None
+
+        self.assertEqual([stats.children[i].path for i in range(len(stats.children))], expected)
+        self.assertEqual(stats.children[-1].path, expected[-1])
+        with self.assertRaises(IndexError):
+            stats.children[len(expected)]
+
+    def test_nested_roots_with_memory_limit(self):
+        """Marcadores de raízes aninhadas ficam em memória e são enxertados"""
+        inner = os.path.join(self.root, "d1")
+        results = self.limited().analyze_roots([self.root, inner], max_workers=2)
+        expected = DiskUsageAnalyzer().analyze_directory(self.root)
+
+        self.assertEqual(serialize_stats(results[self.root]), serialize_stats(expected))
+        self.assertEqual(results[inner].total_size,
+                         DiskUsageAnalyzer().analyze_directory(inner).total_size)
+
+    def test_file_index_counts_against_limit(self):
+        """A memória do FileIndex entra no orçamento (e não é liberada ao descarregar)"""
+        analyzer = DiskUsageAnalyzer(memory_limit=1 << 30, spill_dir=self.spill_dir)
+        analyzer.analyze_directory(self.root)
+        self.assertEqual(analyzer._spill.pinned, 0)
+        # Limite logo acima da árvore inteira: sem índice nada vai para o disco
+        limit = analyzer._spill.retained + 1
+
+        analyzer = DiskUsageAnalyzer(memory_limit=limit, spill_dir=self.spill_dir)
+        self.assertEqual(analyzer.get_summary(analyzer.analyze_directory(self.root))['spilled_directories'], 0)
+
+        analyzer = DiskUsageAnalyzer(memory_limit=limit, spill_dir=self.spill_dir, file_index=True)
+        stats = analyzer.analyze_directory(self.root)
+        self.assertGreater(analyzer._spill.pinned, 24 * 64)
+        self.assertGreater(analyzer.get_summary(stats)['spilled_directories'], 0)
+        self.assertEqual(len(analyzer.file_index), 24)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Testes para os backends de stat em lote (statx via io_uring ou threads)
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+from pathlib import Path
+from unittest import mock
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from click.testing import CliRunner
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.serialization import serialize_stats
+from analyzer.statx import StatxResult, ThreadedStat, create_stat_backend
+from cli.main import analyze
+
+
+class TestStatBackends(unittest.TestCase):
+    """Os backends em lote devem produzir exatamente a mesma árvore"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        wide = os.path.join(self.temp_dir, "wide")
+        os.makedirs(os.path.join(wide, "nested"))
+        # Mais itens que min_batch e que uma onda pequena
+        for i in range(150):
+            with open(os.path.join(wide, f"file{i}.{'log' if i % 3 else 'bin'}"), 'w') as f:
+                f.write("x" * (i * 37))
+        with open(os.path.join(wide, "nested", "deep.txt"), 'w') as f:
+            f.write("deep")
+        with open(os.path.join(self.temp_dir, ".hidden"), 'w') as f:
+            f.write("hidden")
+        os.symlink(os.path.join(wide, "file1.log"), os.path.join(wide, "link.log"))
+        os.symlink(os.path.join(wide, "missing"), os.path.join(wide, "broken"))
+        os.symlink(os.path.join(wide, "nested"), os.path.join(self.temp_dir, "dirlink"))
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def backends(self):
+        names = ['threads']
+        try:
+            create_stat_backend('uring').close()
+            names.append('uring')
+        except OSError:
+            pass
+        return names
+
+    def scan(self, **kwargs):
+        analyzer = DiskUsageAnalyzer(include_hidden=True, file_index=True, **kwargs)
+        stats = analyzer.analyze_directory(self.temp_dir)
+        index = analyzer.file_index
+        files = sorted(index.top_files(index.select(), len(index)), key=lambda item: item['path'])
+        return serialize_stats(stats), files, len(analyzer.errors)
+
+    def test_same_output_as_lstat(self):
+        """Mesmos DirectoryStats e mesmos atributos por arquivo"""
+        for follow in (False, True):
+            expected = self.scan(follow_symlinks=follow)
+            for backend in self.backends():
+                with self.subTest(backend=backend, follow_symlinks=follow):
+                    self.assertEqual(self.scan(stat_backend=backend, follow_symlinks=follow), expected)
+
+    def test_concurrent_scans_share_backend(self):
+        """Análise em lote com o backend compartilhado entre threads"""
+        paths = [self.temp_dir, os.path.join(self.temp_dir, "wide")]
+        expected = serialize_stats(DiskUsageAnalyzer().analyze_roots(paths)[self.temp_dir])
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                results = DiskUsageAnalyzer(stat_backend=backend).analyze_roots(paths)
+                self.assertEqual(serialize_stats(results[self.temp_dir]), expected)
+
+    def test_results_match_lstat(self):
+        """Campos do statx iguais aos de os.lstat; erros viram OSError"""
+        wide = os.path.join(self.temp_dir, "wide")
+        names = sorted(os.listdir(wide)) + ["gone"]
+        for backend in [ThreadedStat(workers=3, chunk_size=16)] + \
+                [create_stat_backend(name) for name in self.backends() if name != 'threads']:
+            with self.subTest(backend=backend.name):
+                results = backend.stat_many(wide, names)
+                self.assertEqual(len(results), len(names))
+                for name, result in zip(names[:-1], results):
+                    expected = os.lstat(os.path.join(wide, name))
+                    for field in StatxResult._fields:
+                        self.assertEqual(getattr(result, field), getattr(expected, field), (name, field))
+                self.assertIsInstance(results[-1], FileNotFoundError)
+                backend.close()
+
+    def test_statx_uses_threads(self):
+        """'statx' escolhe o pool de threads; io_uring só com 'uring'"""
+        self.assertEqual(DiskUsageAnalyzer(stat_backend='statx')._stat_batch.name, 'threads')
+
+    def test_backend_closed_after_scan(self):
+        """Pool e anéis liberados ao fim de cada varredura; o analisador segue utilizável"""
+        for backend in self.backends():
+            with self.subTest(backend=backend):
+                analyzer = DiskUsageAnalyzer(stat_backend=backend)
+                expected = serialize_stats(analyzer.analyze_directory(self.temp_dir))
+                batch = analyzer._stat_batch
+                if backend == 'uring':
+                    self.assertEqual(batch._rings, [])
+                else:
+                    self.assertIsNone(batch._executor)
+                self.assertEqual(serialize_stats(analyzer.analyze_directory(self.temp_dir)), expected)
+                analyzer.analyze_roots([self.temp_dir])
+                self.assertEqual(getattr(batch, '_rings', []), [])
+                self.assertIsNone(getattr(batch, '_executor', None))
+
+        wide = os.path.join(self.temp_dir, "wide")
+        with DiskUsageAnalyzer(stat_backend='threads') as analyzer:
+            analyzer._stat_names(wide, os.listdir(wide))
+            self.assertIsNotNone(analyzer._stat_batch._executor)
+        self.assertIsNone(analyzer._stat_batch._executor)
+
+    def test_unknown_backend(self):
+        """Nome inválido é rejeitado"""
+        with self.assertRaises(ValueError):
+            DiskUsageAnalyzer(stat_backend='aio')
+
+    def test_cli_reports_only_backend_errors(self):
+        """Só a falha do io_uring vira erro de --stat-backend; as do spill não"""
+        runner = CliRunner()
+        unavailable = OSError(38, "io_uring desativado")
+        with mock.patch('analyzer.statx.IoUringStat', side_effect=unavailable):
+            result = runner.invoke(analyze, [self.temp_dir, '--quiet', '--stat-backend', 'uring'])
+        self.assertEqual(result.exit_code, 2)
+        self.assertIn('io_uring indisponível', result.output)
+
+        no_space = OSError(28, "sem espaço")
+        with mock.patch('analyzer.spill.tempfile.mkstemp', side_effect=no_space):
+            result = runner.invoke(analyze, [self.temp_dir, '--quiet', '--memory-limit', '1KB'])
+        self.assertIs(result.exception, no_space)
+        self.assertNotIn('io_uring', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
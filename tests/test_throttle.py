@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Testes para o modo gentil: token buckets, recuo por latência e prioridades
+"""
+
+import unittest
+import tempfile
+import os
+import sys
+import shutil
+import threading
+import time
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from analyzer.scheduler import ADJUST_EVERY
+from analyzer.serialization import serialize_stats
+from analyzer.throttle import (MIN_FACTOR, SAMPLE_OPERATIONS, Throttle, TokenBucket,
+                               io_priority_available, set_io_priority)
+
+
+class FakeClock:
+    """Relógio manual: sleep só avança o tempo"""
+
+    def __init__(self):
+        self.now = 100.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class TestTokenBucket(unittest.TestCase):
+    """Taxa e capacidade do balde"""
+
+    def test_rate_and_debt(self):
+        """Capacidade livre, depois esperas na taxa configurada"""
+        clock = FakeClock()
+        bucket = TokenBucket(100, clock=clock, sleep=clock.sleep)
+        self.assertEqual(bucket.acquire(100), 0.0)
+        self.assertAlmostEqual(bucket.acquire(50), 0.5)
+        # Pedido maior que a capacidade só espera mais
+        self.assertAlmostEqual(bucket.acquire(300), 3.0)
+        clock.now += 10
+        self.assertEqual(bucket.acquire(100), 0.0)
+        self.assertAlmostEqual(sum(clock.slept), 3.5)
+
+    def test_set_rate(self):
+        """Nova taxa vale para os próximos pedidos"""
+        clock = FakeClock()
+        bucket = TokenBucket(100, clock=clock, sleep=clock.sleep)
+        bucket.acquire(100)
+        bucket.set_rate(10)
+        self.assertAlmostEqual(bucket.acquire(10), 1.0)
+
+    def test_invalid_rate(self):
+        """Taxa precisa ser positiva"""
+        with self.assertRaises(ValueError):
+            TokenBucket(0)
+
+
+class TestBackoff(unittest.TestCase):
+    """Taxas reduzidas quando a latência sobe, recuperadas quando normaliza"""
+
+    def feed(self, throttle, latency, adjustments):
+        for _ in range(ADJUST_EVERY * adjustments):
+            throttle.observe(latency * SAMPLE_OPERATIONS, SAMPLE_OPERATIONS)
+
+    def test_backoff_and_recovery(self):
+        """Latência 10x maior reduz as duas taxas; estável, voltam ao configurado"""
+        clock = FakeClock()
+        throttle = Throttle(stat_rate=1000, hash_rate=1 << 20, clock=clock, sleep=clock.sleep)
+        self.feed(throttle, 0.0001, 4)
+        self.assertEqual(throttle.factor, 1.0)
+
+        self.feed(throttle, 0.001, 2)
+        self.assertLess(throttle.factor, 0.8)
+        self.assertGreaterEqual(throttle.factor, MIN_FACTOR)
+        self.assertGreater(throttle.backoffs, 0)
+        self.assertAlmostEqual(throttle.stat_bucket.rate, 1000 * throttle.factor)
+        self.assertAlmostEqual(throttle.hash_bucket.rate, (1 << 20) * throttle.factor)
+
+        self.feed(throttle, 0.0001, 40)
+        self.assertEqual(throttle.factor, 1.0)
+        self.assertEqual(throttle.stat_bucket.rate, 1000)
+
+    def test_backoff_disabled(self):
+        """backoff=False mantém as taxas"""
+        throttle = Throttle(stat_rate=1000, backoff=False)
+        self.feed(throttle, 0.0001, 4)
+        self.feed(throttle, 0.01, 4)
+        self.assertEqual(throttle.factor, 1.0)
+
+
+class CountingThrottle(Throttle):
+    """Throttle que só conta tokens, sem esperar"""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.stats = 0
+        self.hashed_bytes = 0
+        self.count_lock = threading.Lock()
+
+    def stat(self, operations=1):
+        with self.count_lock:
+            self.stats += operations
+
+    def hashed(self, size):
+        with self.count_lock:
+            self.hashed_bytes += size
+
+
+class TestThrottledScan(unittest.TestCase):
+    """Varredura limitada com o mesmo resultado e os tokens contados"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for sub in ("a", "b", os.path.join("b", "c")):
+            os.makedirs(os.path.join(self.temp_dir, sub), exist_ok=True)
+        self.total = 0
+        for i in range(120):
+            directory = ("a", "b", os.path.join("b", "c"))[i % 3]
+            with open(os.path.join(self.temp_dir, directory, f"f{i}.dat"), 'w') as f:
+                f.write("x" * (i * 13 + 1))
+            self.total += i * 13 + 1
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_same_output_and_tokens(self):
+        """Cada listagem e cada stat consome um token, em todos os caminhos"""
+        expected = serialize_stats(DiskUsageAnalyzer().analyze_directory(self.temp_dir))
+        # 4 listagens + 3 diretórios + 120 arquivos
+        operations = 4 + 3 + 120
+        for kwargs in ({}, {'fast_listing': True}, {'stat_backend': 'threads'}):
+            with self.subTest(**kwargs):
+                throttle = CountingThrottle(stat_rate=50)
+                analyzer = DiskUsageAnalyzer(throttle=throttle, **kwargs)
+                self.assertEqual(serialize_stats(analyzer.analyze_directory(self.temp_dir)), expected)
+                self.assertEqual(throttle.stats, operations)
+                self.assertIsNotNone(analyzer.get_summary(analyzer.analyze_directory(self.temp_dir))['throttle'])
+
+        throttle = CountingThrottle(stat_rate=50)
+        results = DiskUsageAnalyzer(throttle=throttle).analyze_roots([self.temp_dir])
+        self.assertEqual(serialize_stats(results[self.temp_dir]), expected)
+        self.assertEqual(throttle.stats, operations)
+
+    def test_followed_links_charged_once(self):
+        """Stat individual dentro de um lote (links seguidos, fallback) não paga de novo"""
+        for i in range(5):
+            os.symlink(os.path.join(self.temp_dir, "b", f"f{i * 3 + 1}.dat"),
+                       os.path.join(self.temp_dir, "a", f"link{i}"))
+        expected = serialize_stats(DiskUsageAnalyzer(follow_symlinks=True).analyze_directory(self.temp_dir))
+        operations = 4 + 3 + 120 + 5
+        for kwargs in ({}, {'fast_listing': True}, {'stat_backend': 'threads'}):
+            with self.subTest(**kwargs):
+                throttle = CountingThrottle(stat_rate=50)
+                analyzer = DiskUsageAnalyzer(follow_symlinks=True, throttle=throttle, **kwargs)
+                self.assertEqual(serialize_stats(analyzer.analyze_directory(self.temp_dir)), expected)
+                self.assertEqual(throttle.stats, operations)
+
+        def unavailable(dir_path, names):
+            raise OSError("anel indisponível")
+
+        throttle = CountingThrottle(stat_rate=50)
+        analyzer = DiskUsageAnalyzer(stat_backend='threads', throttle=throttle)
+        analyzer._stat_batch.stat_many = unavailable
+        analyzer.analyze_directory(self.temp_dir)
+        self.assertEqual(throttle.stats, operations)
+
+    def test_hash_tokens(self):
+        """Bytes lidos no hash passam pelo balde de hash"""
+        throttle = CountingThrottle(hash_rate=1 << 20)
+        DiskUsageAnalyzer(calculate_hashes=True, throttle=throttle).analyze_directory(self.temp_dir)
+        self.assertEqual(throttle.hashed_bytes, self.total)
+
+    def test_rate_is_respected(self):
+        """Com o relógio real, a varredura leva o tempo da taxa configurada"""
+        throttle = Throttle(stat_rate=1000, backoff=False)
+        DiskUsageAnalyzer(throttle=throttle).analyze_directory(self.temp_dir)
+        DiskUsageAnalyzer(throttle=throttle).analyze_directory(self.temp_dir)
+        # 2 x 127 operações, capacidade de 1000: nenhuma espera
+        self.assertEqual(throttle.waited, 0.0)
+
+        # Balde vazio: 127 operações levam ao menos 127 ms
+        throttle = Throttle(stat_rate=1000, backoff=False)
+        throttle.stat_bucket.acquire(1000)
+        started = time.monotonic()
+        DiskUsageAnalyzer(throttle=throttle).analyze_directory(self.temp_dir)
+        self.assertGreaterEqual(time.monotonic() - started, 0.12)
+        self.assertGreater(throttle.waited, 0.0)
+
+
+class TestPriorities(unittest.TestCase):
+    """ioprio_set via ctypes"""
+
+    def test_unknown_class(self):
+        """Classe desconhecida é rejeitada"""
+        with self.assertRaises(ValueError):
+            set_io_priority('urgent')
+
+    @unittest.skipUnless(io_priority_available(), "ioprio_set indisponível")
+    def test_idle_class(self):
+        """idle e best-effort não exigem privilégios (thread própria)"""
+        errors = []
+
+        def apply():
+            try:
+                set_io_priority('best-effort', 7)
+                set_io_priority('idle')
+            except OSError as e:
+                errors.append(e)
+
+        thread = threading.Thread(target=apply)
+        thread.start()
+        thread.join()
+        self.assertEqual(errors, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
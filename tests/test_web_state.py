@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Testes para o estado compartilhado entre workers da interface web
+"""
+
+import unittest
+import tempfile
+import gzip
+import json
+import os
+import sys
+import shutil
+from pathlib import Path
+
+# Adicionar src ao path
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from analyzer.core import DiskUsageAnalyzer
+from web.app import app, get_large_files_data, shared_states
+from web.state import SharedState
+
+
+class TestSharedState(unittest.TestCase):
+    """Testes para SharedState"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.db_path = os.path.join(self.temp_dir, "state.db")
+        # Duas instâncias no mesmo banco fazem o papel de dois workers
+        self.worker_a = SharedState(self.db_path)
+        self.worker_b = SharedState(self.db_path)
+        self.worker_b.owner = "outro"
+
+    def tearDown(self):
+        self.worker_a.close()
+        self.worker_b.close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cache_shared_and_expires(self):
+        """Valor gravado por um worker é lido pelo outro até expirar"""
+        first = self.worker_a.put("k", b'{"size": 1}', ttl=60, now=1000)
+        self.assertEqual(self.worker_b.get("k", now=1030), first)
+        self.assertEqual(first.body, b'{"size": 1}')
+        self.assertIsNone(self.worker_b.get("k", now=1061))
+
+        # Cada gravação gera um snapshot novo
+        second = self.worker_b.put("k", b'{"size": 2}', ttl=60, now=1100)
+        self.assertGreater(second.snapshot, first.snapshot)
+        self.assertEqual(self.worker_a.get("k", now=1100).body, b'{"size": 2}')
+
+    def test_claim_is_exclusive(self):
+        """Só um worker varre cada chave; reservas abandonadas expiram"""
+        self.assertTrue(self.worker_a.claim("k", now=1000))
+        self.assertFalse(self.worker_b.claim("k", now=1001))
+        self.assertTrue(self.worker_b.running("k"))
+
+        self.worker_b.job_timeout = 10
+        self.assertTrue(self.worker_b.claim("k", now=1020))
+
+        self.worker_b.release("k")
+        self.assertFalse(self.worker_a.running("k"))
+        self.assertIsNone(self.worker_a.wait("k", timeout=1))
+
+
+class TestAnalyzeCache(unittest.TestCase):
+    """Testes para o cache de /api/analyze"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "root")
+        os.makedirs(self.root)
+        with open(os.path.join(self.root, "a.bin"), 'w') as f:
+            f.write("x" * 1000)
+        app.config['TESTING'] = True
+        app.config['STATE_DB'] = os.path.join(self.temp_dir, "state.db")
+        self.client = app.test_client()
+
+    def tearDown(self):
+        for state in shared_states.values():
+            state.close()
+        shared_states.clear()
+        app.config['STATE_DB'] = None
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_result_shared_across_workers(self):
+        """Outro worker (novo SharedState) usa o resultado em cache"""
+        first = self.client.post('/api/analyze', json={'path': self.root}).get_json()
+        self.assertEqual(first['summary']['total_size'], 1000)
+
+        with open(os.path.join(self.root, "b.bin"), 'w') as f:
+            f.write("x" * 500)
+        shared_states.clear()
+
+        second = self.client.post('/api/analyze', json={'path': self.root}).get_json()
+        self.assertEqual(second['summary']['total_size'], 1000)
+
+        # Nenhuma varredura fica marcada como em andamento
+        state = SharedState(app.config['STATE_DB'])
+        self.assertEqual(state.conn.execute("SELECT count(*) FROM jobs").fetchone()[0], 0)
+        state.close()
+
+    def test_etag_and_compression(self):
+        """Snapshot em cache vira ETag; revalidação recebe 304 sem corpo"""
+        # Resposta grande o bastante para ser comprimida
+        for i in range(20):
+            os.makedirs(os.path.join(self.root, f"dir{i:02d}"))
+        url = f'/api/analyze?path={self.root}&include_hidden=false'
+        response = self.client.get(url, headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        etag = response.headers['ETag']
+        self.assertTrue(etag.startswith('W/"snapshot-'))
+        self.assertEqual(json.loads(gzip.decompress(response.data))['summary']['total_size'], 1000)
+
+        again = self.client.get(url, headers={'If-None-Match': etag})
+        self.assertEqual(again.status_code, 304)
+        self.assertEqual(again.data, b'')
+
+        # POST com o mesmo If-None-Match também é revalidado
+        posted = self.client.post('/api/analyze', json={'path': self.root},
+                                  headers={'If-None-Match': etag})
+        self.assertEqual(posted.status_code, 304)
+
+        plain = self.client.get(url, headers={'Accept-Encoding': 'identity'})
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(plain.headers['ETag'], etag)
+        self.assertEqual(plain.get_json()['summary']['total_size'], 1000)
+
+    def test_large_files_listed_once(self):
+        """O maior arquivo de um diretório não se repete em cada ancestral"""
+        deep = os.path.join(self.root, "x", "y")
+        os.makedirs(deep)
+        with open(os.path.join(deep, "big.bin"), 'w') as f:
+            f.write("x" * 5000)
+        stats = DiskUsageAnalyzer().analyze_directory(self.root)
+
+        large_files = get_large_files_data(stats, 100)
+        self.assertEqual([item['name'] for item in large_files], ['big.bin'])
+
+
+if __name__ == '__main__':
+    unittest.main()